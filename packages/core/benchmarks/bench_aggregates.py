@@ -0,0 +1,56 @@
+"""
+Measures the cost of category aggregate queries as the number of counted
+records grows, and the overhead the counters add to each create.
+
+Queries read counters and bucket rings, so their latency should stay flat
+whatever the number of records.
+
+Run from the repository root:
+
+    uv run python packages/core/benchmarks/bench_aggregates.py
+"""
+import time
+import timeit
+
+from core.classifications.domain.models import Category, ClassificationCategory, Classification
+from core.classifications.infrastructure.aggregates import CategoryAggregates
+
+SIZES = (10_000, 100_000, 1_000_000)
+CLASSIFICATIONS_PER_CALL = 4
+QUERIES = 2_000
+
+
+def main() -> None:
+    categories = list(Category)
+    print(f"{'records':>9} {'record_created (us)':>20} {'totals (us)':>12} {'by call (us)':>13} {'5m (us)':>8} {'1d (us)':>8}")
+    for size in SIZES:
+        # Spread the records over the last day, one every 86_400 / size seconds.
+        now = [time.time() - 86_400]
+        aggregates = CategoryAggregates(clock=lambda: now[0])
+        classifications = [
+            Classification(
+                id=index + 1,
+                call_id=f"call_{index // CLASSIFICATIONS_PER_CALL}",
+                classification_category=ClassificationCategory(category=categories[index % len(categories)]),
+            )
+            for index in range(size)
+        ]
+        start = time.perf_counter()
+        for classification in classifications:
+            now[0] += 86_400 / size
+            aggregates.record_created(classification)
+        create_seconds = (time.perf_counter() - start) / size
+
+        def per_query(query) -> float:
+            return min(timeit.repeat(query, number=QUERIES, repeat=3)) / QUERIES * 1e6
+
+        print(
+            f"{size:>9} {create_seconds * 1e6:>20.2f} {per_query(aggregates.totals):>12.2f}"
+            f" {per_query(lambda: aggregates.counts_by_call('call_7')):>13.2f}"
+            f" {per_query(lambda: aggregates.window_counts('5m')):>8.2f}"
+            f" {per_query(lambda: aggregates.window_counts('1d')):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Measures `find_by_call_id` latency as the repositories grow, and the SQLite
+repository's write throughput.
+
+Each call ID has a handful of classifications, so a lookup returns the same
+amount of data at every size. With the `call_id` index, the cost per lookup
+should stay flat instead of growing with the number of stored records.
+Writes are measured one transaction per `create`, one per `create_many`
+batch, and through the write-behind buffer, whose `create` returns before
+the batch is stored.
+
+Run from the repository root:
+
+    uv run python packages/core/benchmarks/bench_repositories.py
+"""
+import os
+import random
+import tempfile
+import time
+import timeit
+
+from core.classifications.domain.models import Category, ClassificationCategory, ClassificationCreate
+from core.classifications.infrastructure.buffering import WriteBehindClassificationRepository
+from core.classifications.infrastructure.repositories import (
+    InMemoryClassificationRepository,
+    SQLiteClassificationRepository,
+)
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+SQLITE_SIZES = (1_000, 10_000, 100_000)
+CLASSIFICATIONS_PER_CALL = 4
+LOOKUPS = 10_000
+SINGLE_WRITES = 2_000
+BATCH_SIZE = 500
+
+
+def creates(size: int) -> list[ClassificationCreate]:
+    category = ClassificationCategory(category=Category.COMMERCIAL)
+    return [
+        ClassificationCreate(call_id=f"call_{index // CLASSIFICATIONS_PER_CALL}", classification_category=category)
+        for index in range(size)
+    ]
+
+
+def build_repository(size: int) -> InMemoryClassificationRepository:
+    repo = InMemoryClassificationRepository()
+    for data in creates(size):
+        repo.create(data)
+    return repo
+
+
+def lookup_seconds(repo, size: int, rng: random.Random) -> float:
+    call_ids = [f"call_{rng.randrange(size // CLASSIFICATIONS_PER_CALL)}" for _ in range(LOOKUPS)]
+    lookups = iter(call_ids * 5)
+    return min(
+        timeit.repeat(lambda: repo.find_by_call_id(next(lookups)), number=LOOKUPS // 5, repeat=5)
+    ) / (LOOKUPS // 5)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print("in-memory")
+    print(f"{'records':>9} {'find_by_call_id (us)':>21}")
+    for size in SIZES:
+        repo = build_repository(size)
+        print(f"{size:>9} {lookup_seconds(repo, size, rng) * 1e6:>21.2f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("sqlite")
+        print(f"{'records':>9} {'find_by_call_id (us)':>21}")
+        for size in SQLITE_SIZES:
+            repo = SQLiteClassificationRepository(os.path.join(directory, f"lookups_{size}.db"))
+            data = creates(size)
+            for start in range(0, size, BATCH_SIZE):
+                repo.create_many(data[start:start + BATCH_SIZE])
+            print(f"{size:>9} {lookup_seconds(repo, size, rng) * 1e6:>21.2f}")
+            repo.close()
+
+        repo = SQLiteClassificationRepository(os.path.join(directory, "writes.db"))
+        data = creates(SINGLE_WRITES)
+        start = time.perf_counter()
+        for item in data:
+            repo.create(item)
+        single = SINGLE_WRITES / (time.perf_counter() - start)
+        data = creates(100_000)
+        start = time.perf_counter()
+        for offset in range(0, len(data), BATCH_SIZE):
+            repo.create_many(data[offset:offset + BATCH_SIZE])
+        batched = len(data) / (time.perf_counter() - start)
+        print(f"create: {single:,.0f} rows/s, create_many({BATCH_SIZE}): {batched:,.0f} rows/s")
+
+        buffered = WriteBehindClassificationRepository(repository=repo, max_batch_size=BATCH_SIZE)
+        data = creates(100_000)
+        start = time.perf_counter()
+        for item in data:
+            buffered.create(item)
+        accepted = len(data) / (time.perf_counter() - start)
+        buffered.close()
+        stored = len(data) / (time.perf_counter() - start)
+        repo.close()
+        print(f"write-behind create: {accepted:,.0f} rows/s accepted, {stored:,.0f} rows/s stored")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures the memory each stored classification costs in the in-memory
+repositories, and the latency of reads on the columnar one.
+
+Every record gets its own `ClassificationCategory`, as it would coming from
+the LLM classifier, and each call ID has a handful of classifications.
+Memory is the growth of traced allocations while the repository is filled,
+so it covers everything the repository retains: objects, strings, dicts and
+numpy arrays.
+
+Run from the repository root:
+
+    uv run python packages/core/benchmarks/bench_repository_memory.py
+"""
+import gc
+import random
+import timeit
+import tracemalloc
+
+from core.classifications.domain.models import Category, ClassificationCategory, ClassificationCreate
+from core.classifications.infrastructure.repositories import (
+    ColumnarClassificationRepository,
+    InMemoryClassificationRepository,
+)
+
+RECORDS = 1_000_000
+CLASSIFICATIONS_PER_CALL = 4
+LOOKUPS = 10_000
+
+
+def fill(repo, size: int) -> None:
+    categories = list(Category)
+    for index in range(size):
+        repo.create(
+            ClassificationCreate(
+                call_id=f"call_{index // CLASSIFICATIONS_PER_CALL}",
+                classification_category=ClassificationCategory(category=categories[index % len(categories)]),
+            )
+        )
+
+
+def bytes_per_record(factory, size: int) -> tuple[object, float]:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    repo = factory()
+    fill(repo, size)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return repo, (after - before) / size
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'repository':<12} {'bytes/record':>13} {'get_by_id (us)':>15} {'find_by_call_id (us)':>21}")
+    for name, factory in (
+        ("in-memory", InMemoryClassificationRepository),
+        ("columnar", ColumnarClassificationRepository),
+    ):
+        repo, per_record = bytes_per_record(factory, RECORDS)
+        ids = iter([rng.randrange(1, RECORDS + 1) for _ in range(LOOKUPS)])
+        get_seconds = min(timeit.repeat(lambda: repo.get_by_id(next(ids)), number=LOOKUPS // 5, repeat=5))
+        call_ids = iter([f"call_{rng.randrange(RECORDS // CLASSIFICATIONS_PER_CALL)}" for _ in range(LOOKUPS)])
+        find_seconds = min(timeit.repeat(lambda: repo.find_by_call_id(next(call_ids)), number=LOOKUPS // 5, repeat=5))
+        print(
+            f"{name:<12} {per_record:>13.1f} {get_seconds / (LOOKUPS // 5) * 1e6:>15.2f}"
+            f" {find_seconds / (LOOKUPS // 5) * 1e6:>21.2f}"
+        )
+        if isinstance(repo, ColumnarClassificationRepository):
+            count_seconds = min(timeit.repeat(repo.count_by_category, number=10, repeat=3)) / 10
+            print(f"columnar count_by_category over {RECORDS:,} records: {count_seconds * 1e3:.2f} ms")
+        del repo
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures `VectorIndex` lookup latency and LSH recall against an exact scan.
+
+The index is filled with random unit vectors, and each query is a stored
+vector perturbed to a cosine similarity of about `SIMILARITY`, i.e. a
+near-duplicate the semantic cache should find.
+
+Run from the repository root:
+
+    uv run python packages/core/benchmarks/bench_semantic_cache.py
+"""
+import tempfile
+import time
+
+import numpy as np
+
+from core.classifications.infrastructure.semantic import VectorIndex
+
+DIM = 256
+SIZES = (10_000, 100_000, 1_000_000)
+QUERIES = 200
+SIMILARITY = 0.95
+CHUNK = 100_000
+
+
+def unit(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def near_duplicates(rng: np.random.Generator, vectors: np.ndarray) -> np.ndarray:
+    noise = unit(rng.standard_normal(vectors.shape).astype(np.float32))
+    noise -= (noise * vectors).sum(axis=1, keepdims=True) * vectors
+    noise = unit(noise)
+    return unit(SIMILARITY * vectors + np.sqrt(1 - SIMILARITY ** 2) * noise).astype(np.float32)
+
+
+def time_per_query(search, queries: np.ndarray) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'entries':>9} {'lsh (ms)':>9} {'exact (ms)':>11} {'recall':>7}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            index = VectorIndex(dim=DIM, path=f"{directory}/index", capacity=size)
+            targets = rng.choice(size, QUERIES, replace=False)
+            stored = np.empty((QUERIES, DIM), dtype=np.float32)
+            for start in range(0, size, CHUNK):
+                chunk = unit(rng.standard_normal((min(CHUNK, size - start), DIM)).astype(np.float32))
+                index.add(chunk, np.arange(start, start + len(chunk)) % 2)
+                in_chunk = (targets >= start) & (targets < start + len(chunk))
+                stored[in_chunk] = chunk[targets[in_chunk] - start]
+            queries = near_duplicates(rng, stored)
+
+            lsh = time_per_query(index.search, queries)
+            exact = time_per_query(index.search_exact, queries[:20])
+            found = sum(index.search(query)[1] >= SIMILARITY - 0.01 for query in queries)
+            print(f"{size:>9} {lsh * 1e3:>9.3f} {exact * 1e3:>11.3f} {found / QUERIES:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Builds the infrastructure shared by the composition roots.
+
+The repository and the classifier gateway stacks are assembled from
+`Settings` in one place, so every root (the local entry point, the EAGI
+view) wires the same decorators in the same order. The roots keep what is
+specific to them: their handlers and pipelines.
+"""
+import atexit
+from typing import Optional
+
+from core.classifications.domain.models import Category
+from core.classifications.domain.ports import ClassificationRepository, LLMClassifier
+from core.classifications.infrastructure.aggregates import AggregatingClassificationRepository
+from core.classifications.infrastructure.buffering import WriteBehindClassificationRepository
+from core.classifications.infrastructure.caches import (
+    CachedClassifierGateway,
+    SingleFlightClassifierGateway,
+    SQLiteClassificationCache,
+)
+from core.classifications.infrastructure.cascades import CascadingClassifierGateway
+from core.classifications.infrastructure.gateways import AsyncOpenAIClassifierGateway, OpenAIClassifierGateway
+from core.classifications.infrastructure.hedging import HedgedClassifierGateway
+from core.classifications.infrastructure.preclassifiers import PreClassifierGateway, SoftmaxTextModel
+from core.classifications.infrastructure.repositories import (
+    ColumnarClassificationRepository,
+    InMemoryClassificationRepository,
+    SQLiteClassificationRepository,
+)
+from core.classifications.infrastructure.resilience import RateLimitedClassifierGateway, RateLimiter
+from core.classifications.infrastructure.semantic import HashingEmbedder, SemanticCacheGateway, VectorIndex
+from core.config.settings import Settings
+
+
+def build_classification_repository(settings: Settings) -> ClassificationRepository:
+    """
+    Builds the classification repository: SQLite, columnar or in-memory
+    storage, optionally behind write-behind buffering and aggregates.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        ClassificationRepository: The outermost repository.
+    """
+    repository_settings = settings.classification_repository
+    if repository_settings.path:
+        classification_repo = SQLiteClassificationRepository(repository_settings.path)
+        # Registered before the write-behind's own hook, so it runs after the last flush.
+        atexit.register(classification_repo.close)
+    elif repository_settings.columnar:
+        classification_repo = ColumnarClassificationRepository()
+    else:
+        classification_repo = InMemoryClassificationRepository()
+    if repository_settings.write_behind:
+        classification_repo = WriteBehindClassificationRepository(
+            repository=classification_repo,
+            max_batch_size=repository_settings.write_behind_batch_size,
+            flush_interval=repository_settings.write_behind_flush_seconds,
+            max_pending=repository_settings.write_behind_max_pending,
+        )
+    if repository_settings.aggregates:
+        # Stored records are counted on the first read of the aggregates, not
+        # at startup, and towards the totals and per-call counts only.
+        classification_repo = AggregatingClassificationRepository(
+            repository=classification_repo, rebuild_on_first_read=True
+        )
+    return classification_repo
+
+
+def build_rate_limiter(settings: Settings) -> RateLimiter:
+    """Builds the OpenAI rate limiter, to be shared by every gateway since the quotas are per API key."""
+    return RateLimiter(
+        requests_per_minute=settings.openai_api.requests_per_minute,
+        tokens_per_minute=settings.openai_api.tokens_per_minute,
+    )
+
+
+def build_preclassifier_model(settings: Settings) -> Optional[SoftmaxTextModel]:
+    """Loads the local pre-classifier model, or returns None if none is configured."""
+    if not settings.preclassifier.model_path:
+        return None
+    return SoftmaxTextModel.load(settings.preclassifier.model_path, label_type=Category)
+
+
+def build_classification_cache_store(settings: Settings) -> Optional[SQLiteClassificationCache]:
+    """Opens the durable classification cache shared by every gateway, or returns None if none is configured."""
+    if not settings.classification_cache.path:
+        return None
+    cache_store = SQLiteClassificationCache(settings.classification_cache.path)
+    atexit.register(cache_store.close)
+    return cache_store
+
+
+def build_classifier_gateway(
+    settings: Settings,
+    rate_limiter: RateLimiter,
+    preclassifier_model: Optional[SoftmaxTextModel] = None,
+    cache_store: Optional[SQLiteClassificationCache] = None,
+) -> LLMClassifier:
+    """
+    Builds the synchronous classifier stack, from the outermost decorator in:
+    pre-classifier, exact cache, semantic cache, single-flight, hedging,
+    rate limiting, then the OpenAI gateway or a cascade of two.
+
+    Args:
+        settings (Settings): The application settings.
+        rate_limiter (RateLimiter): The limiter shared with the other gateways.
+        preclassifier_model (Optional[SoftmaxTextModel]): The local model that
+            answers confident cases, if any.
+        cache_store (Optional[SQLiteClassificationCache]): The durable store
+            behind the exact cache, shared with the other gateways, if any.
+
+    Returns:
+        LLMClassifier: The outermost gateway.
+    """
+    openai_settings = settings.openai_api
+    gateway = OpenAIClassifierGateway(api_key=openai_settings.api_key, model=openai_settings.model)
+    if openai_settings.cascade_model:
+        gateway = CascadingClassifierGateway(
+            tiers=[
+                OpenAIClassifierGateway(
+                    api_key=openai_settings.api_key,
+                    model=openai_settings.cascade_model,
+                    client=gateway.client,
+                ),
+                gateway,
+            ],
+            thresholds=openai_settings.cascade_threshold,
+        )
+    gateway = _build_resilience(settings, gateway, rate_limiter)
+    gateway = SingleFlightClassifierGateway(classifier=gateway)
+    if settings.semantic_cache.enabled:
+        # Paraphrases of already classified texts reuse their label.
+        gateway = SemanticCacheGateway(
+            classifier=gateway,
+            embedder=HashingEmbedder(dim=settings.semantic_cache.dim),
+            index=VectorIndex(dim=settings.semantic_cache.dim, path=settings.semantic_cache.path),
+            label_type=Category,
+            threshold=settings.semantic_cache.threshold,
+        )
+    gateway = _build_cache(settings, gateway, cache_store)
+    return _build_preclassifier(settings, gateway, preclassifier_model)
+
+
+def build_async_classifier_gateway(
+    settings: Settings,
+    rate_limiter: RateLimiter,
+    preclassifier_model: Optional[SoftmaxTextModel] = None,
+    cache_store: Optional[SQLiteClassificationCache] = None,
+) -> LLMClassifier:
+    """
+    Builds the asyncio classifier stack: pre-classifier, exact cache,
+    single-flight, hedging, rate limiting, then the async OpenAI gateway or
+    a cascade of two.
+
+    The semantic cache is left out: its index is memory-mapped at one path
+    and written by the synchronous stack, and a second index on the same
+    files would overwrite its entries.
+
+    Args:
+        settings (Settings): The application settings.
+        rate_limiter (RateLimiter): The limiter shared with the other gateways.
+        preclassifier_model (Optional[SoftmaxTextModel]): The local model that
+            answers confident cases, if any.
+        cache_store (Optional[SQLiteClassificationCache]): The durable store
+            behind the exact cache, shared with the other gateways, if any.
+
+    Returns:
+        LLMClassifier: The outermost gateway.
+    """
+    openai_settings = settings.openai_api
+    gateway = AsyncOpenAIClassifierGateway(
+        api_key=openai_settings.api_key,
+        model=openai_settings.model,
+        timeout=openai_settings.timeout_seconds,
+        max_concurrency=openai_settings.max_concurrency,
+        max_connections=openai_settings.max_connections,
+        max_keepalive_connections=openai_settings.max_keepalive_connections,
+        keepalive_expiry=openai_settings.keepalive_expiry_seconds,
+    )
+    if openai_settings.cascade_model:
+        gateway = CascadingClassifierGateway(
+            tiers=[
+                AsyncOpenAIClassifierGateway(
+                    api_key=openai_settings.api_key,
+                    model=openai_settings.cascade_model,
+                    client=gateway.client,
+                    timeout=openai_settings.timeout_seconds,
+                    max_concurrency=openai_settings.max_concurrency,
+                ),
+                gateway,
+            ],
+            thresholds=openai_settings.cascade_threshold,
+        )
+    gateway = _build_resilience(settings, gateway, rate_limiter)
+    gateway = SingleFlightClassifierGateway(classifier=gateway)
+    gateway = _build_cache(settings, gateway, cache_store)
+    return _build_preclassifier(settings, gateway, preclassifier_model)
+
+
+def _build_resilience(settings: Settings, gateway: LLMClassifier, rate_limiter: RateLimiter) -> LLMClassifier:
+    gateway = RateLimitedClassifierGateway(
+        classifier=gateway,
+        rate_limiter=rate_limiter,
+        max_retries=settings.openai_api.max_retries,
+    )
+    if settings.openai_api.hedge_requests:
+        gateway = HedgedClassifierGateway(
+            classifier=gateway,
+            percentile=settings.openai_api.hedge_percentile,
+            max_hedge_rate=settings.openai_api.max_hedge_rate,
+        )
+        atexit.register(gateway.close)
+    return gateway
+
+
+def _build_cache(
+    settings: Settings,
+    gateway: LLMClassifier,
+    cache_store: Optional[SQLiteClassificationCache],
+) -> LLMClassifier:
+    return CachedClassifierGateway(
+        classifier=gateway,
+        max_size=settings.classification_cache.max_size,
+        ttl=settings.classification_cache.ttl_seconds,
+        store=cache_store,
+    )
+
+
+def _build_preclassifier(
+    settings: Settings,
+    gateway: LLMClassifier,
+    preclassifier_model: Optional[SoftmaxTextModel],
+) -> LLMClassifier:
+    if preclassifier_model is None:
+        return gateway
+    # Confident cases are answered by a local model and never reach the LLM stack.
+    return PreClassifierGateway(
+        classifier=gateway,
+        model=preclassifier_model,
+        threshold=settings.preclassifier.threshold,
+    )
@@ -5,20 +5,32 @@ This script instantiates all necessary components (repositories, handlers, etc.)
 and assembles them into the final, unified Chain of Responsibility pipeline.
 It also defines the `lambda_handler`, which is the entry point for AWS Lambda.
 """
+import logging
 from functools import partial
 from typing import Any, Dict
 
 # 1. Import plummy components
 from plummy.handlers import StepHandler, Handler
 from plummy.adapters import FunctionalProcessor
+from plummy.metrics import registry
 
 # 2. Import configuration and concrete infrastructure
-from core.classifications.infrastructure.gateways import OpenAIClassifierGateway
-from core.classifications.infrastructure.repositories import InMemoryClassificationRepository
+from core.application.bootstrap import (
+    build_classification_cache_store,
+    build_classification_repository,
+    build_classifier_gateway,
+    build_preclassifier_model,
+    build_rate_limiter,
+)
+from core.config.logging_config import configure_logging
 from core.config.settings import settings
 
 # 3. Import handler builders from each domain's application layer
-from core.classifications.application.services import create_classification_service
+from core.classifications.application.services import (
+    compact_transcript_service,
+    create_classification_service,
+    create_classifications_service,
+)
 
 # 4. Import cross-domain application services
 
@@ -27,14 +39,24 @@ from core.classifications.application.services import create_classification_serv
 # --- Composition Root: Instantiate all dependencies ---
 # ==============================================================================
 
+configure_logging(level=settings.log_level, use_queue=settings.log_queue)
+logger = logging.getLogger(__name__)
+
 # In a real application, the db_session would be created and managed here,
 # often using a dependency injection container or a session factory.
 # For this example, we'll use 'None' as a placeholder.
 db_session = None
 
 # Instantiate all concrete adapters
-classification_repo = InMemoryClassificationRepository()
-openai_classifier_gateway = OpenAIClassifierGateway(api_key=settings.openai_api.api_key)
+classification_repo = build_classification_repository(settings)
+# Shared by every gateway, since the quotas are per API key.
+openai_rate_limiter = build_rate_limiter(settings)
+preclassifier_model = build_preclassifier_model(settings)
+# Shared by every gateway, so results cached by one are hits for the others.
+classification_cache_store = build_classification_cache_store(settings)
+openai_classifier_gateway = build_classifier_gateway(
+    settings, openai_rate_limiter, preclassifier_model, classification_cache_store
+)
 # ==============================================================================
 # --- Build all handler instances ---
 # ==============================================================================
@@ -42,26 +64,50 @@ openai_classifier_gateway = OpenAIClassifierGateway(api_key=settings.openai_api.
 def can_handle_create_classification(event: Dict[str, Any]) -> bool:
     return event.get("type") == "newcall"
 
+compact_transcript_processor = FunctionalProcessor(
+    can_handle=can_handle_create_classification,
+    process=partial(compact_transcript_service, max_tokens=settings.compaction.max_tokens),
+)
+
+compact_transcript_handler = StepHandler(
+    processor=compact_transcript_processor,
+    name="compact_transcript",
+    metrics=registry,
+)
+
 create_classification_func = partial(
     create_classification_service,
     classification_repo=classification_repo,
     llm_classifier=openai_classifier_gateway
     )
 
+create_classifications_func = partial(
+    create_classifications_service,
+    classification_repo=classification_repo,
+    llm_classifier=openai_classifier_gateway,
+)
+
 create_classification_processor = FunctionalProcessor(
     can_handle=can_handle_create_classification,
-    process=create_classification_func
+    process=create_classification_func,
+    process_many=create_classifications_func,
 )
 
 create_classification_handler=StepHandler(
-    processor=create_classification_processor
+    processor=create_classification_processor,
+    name="create_classification",
+    metrics=registry,
 )
 
 # ==============================================================================
 # --- Assemble the final, unified pipeline ---
 # ==============================================================================
 
+# Compaction is opt-in: it drops content the classifier would otherwise see.
 pipeline_start: Handler = create_classification_handler
+if settings.compaction.max_tokens is not None:
+    compact_transcript_handler.set_next(create_classification_handler)
+    pipeline_start = compact_transcript_handler
 
 
 # ==============================================================================
@@ -75,7 +121,7 @@ def app() -> None:
         "text": "Customer called to inquire about pricing for bulk orders."
     }
 
-    print(f"Received event: {event}")
+    logger.info("Received event", extra={"event": event})
     
     # Run the pipeline with the incoming event data
     result = pipeline_start.handle(event)
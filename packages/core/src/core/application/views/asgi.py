@@ -1,8 +1,17 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from plummy.metrics import PROMETHEUS_CONTENT_TYPE, registry
 
 app = FastAPI()
 
 
 @app.get("/")
 async def root():
-    return {"message": "Hello World"}
\ No newline at end of file
+    return {"message": "Hello World"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Exposes the pipeline step metrics in Prometheus text format."""
+    return PlainTextResponse(registry.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
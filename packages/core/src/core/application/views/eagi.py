@@ -1,18 +1,42 @@
 from functools import partial
 
-from core.classifications.application.services import create_classification_service
-from core.classifications.infrastructure.gateways import OpenAIClassifierGateway
-from core.classifications.infrastructure.repositories import InMemoryClassificationRepository
-from core.config import settings
-from plummy.adapters import FunctionalProcessor
-from plummy.handlers import Handler, StepHandler
+from core.application.bootstrap import (
+    build_async_classifier_gateway,
+    build_classification_cache_store,
+    build_classification_repository,
+    build_classifier_gateway,
+    build_preclassifier_model,
+    build_rate_limiter,
+)
+from core.classifications.application.services import (
+    acreate_classification_service,
+    compact_transcript_service,
+    create_classification_service,
+    create_classifications_service,
+)
+from core.config.logging_config import configure_logging
+from core.config.settings import settings
+from plummy.adapters import AsyncFunctionalProcessor, FunctionalProcessor
+from plummy.handlers import AsyncHandler, AsyncStepHandler, Handler, StepHandler
+from plummy.metrics import registry
 
 # –-------------------------------------------------------------------------------
 # --- Composition Root: Instantiate all dependencies ---
 # –-------------------------------------------------------------------------------
 
-classification_repo = InMemoryClassificationRepository()
-openai_classifier_gateway = OpenAIClassifierGateway(api_key=settings.openai_api.api_key)
+configure_logging(level=settings.log_level, use_queue=settings.log_queue)
+classification_repo = build_classification_repository(settings)
+# Shared by every gateway, since the quotas are per API key.
+openai_rate_limiter = build_rate_limiter(settings)
+preclassifier_model = build_preclassifier_model(settings)
+# Shared by every gateway, so results cached by one are hits for the others.
+classification_cache_store = build_classification_cache_store(settings)
+openai_classifier_gateway = build_classifier_gateway(
+    settings, openai_rate_limiter, preclassifier_model, classification_cache_store
+)
+async_openai_classifier_gateway = build_async_classifier_gateway(
+    settings, openai_rate_limiter, preclassifier_model, classification_cache_store
+)
 
 # –-------------------------------------------------------------------------------
 # --- Define validators ---
@@ -34,19 +58,42 @@ def can_handle_newcall_event(event):
 # --- Build services ---
 # –-------------------------------------------------------------------------------
 
+compact_transcript_func = partial(
+    compact_transcript_service,
+    max_tokens=settings.compaction.max_tokens,
+    )
+
 create_classification_func = partial(
     create_classification_service,
     classification_repo=classification_repo,
     llm_classifier=openai_classifier_gateway
     )
 
+create_classifications_func = partial(
+    create_classifications_service,
+    classification_repo=classification_repo,
+    llm_classifier=openai_classifier_gateway,
+)
+
+acreate_classification_func = partial(
+    acreate_classification_service,
+    classification_repo=classification_repo,
+    llm_classifier=async_openai_classifier_gateway
+    )
+
 # –-------------------------------------------------------------------------------
 # --- Make it "Processable" ---
 # –-------------------------------------------------------------------------------
 
+compact_transcript_processor = FunctionalProcessor(
+    can_handle=can_handle_newcall_event,
+    process=compact_transcript_func
+)
+
 create_classification_processor = FunctionalProcessor(
     can_handle=can_handle_newcall_event,
-    process=create_classification_func
+    process=create_classification_func,
+    process_many=create_classifications_func,
 )
 
 # –-------------------------------------------------------------------------------
@@ -54,7 +101,36 @@ create_classification_processor = FunctionalProcessor(
 # –-------------------------------------------------------------------------------
 
 create_classification_handler=StepHandler(
-    processor=create_classification_processor
+    processor=create_classification_processor,
+    name="create_classification",
+    metrics=registry,
+)
+
+compact_transcript_handler = StepHandler(
+    processor=compact_transcript_processor,
+    name="compact_transcript",
+    metrics=registry,
+)
+# Compaction is opt-in: it drops content the classifier would otherwise see.
+pipeline_start: Handler = create_classification_handler
+if settings.compaction.max_tokens is not None:
+    compact_transcript_handler.set_next(create_classification_handler)
+    pipeline_start = compact_transcript_handler
+
+# –-------------------------------------------------------------------------------
+# --- Async pipeline: many events in flight on one event loop ---
+# –-------------------------------------------------------------------------------
+
+async_create_classification_handler = AsyncStepHandler(
+    processor=AsyncFunctionalProcessor(
+        can_handle=can_handle_newcall_event,
+        process=acreate_classification_func,
+    )
 )
 
-pipeline_start: Handler = create_classification_handler
\ No newline at end of file
+async_pipeline_start: AsyncHandler = async_create_classification_handler
+if settings.compaction.max_tokens is not None:
+    async_compact_transcript_handler = AsyncStepHandler(processor=compact_transcript_processor)
+    async_compact_transcript_handler.set_next(async_create_classification_handler)
+    async_pipeline_start = async_compact_transcript_handler
+
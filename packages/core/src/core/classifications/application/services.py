@@ -1,7 +1,18 @@
-from typing import Any, Dict
+import asyncio
+import logging
+from typing import Any, Dict, List, Sequence
+from core.classifications.domain.compaction import compact_transcript
 from core.classifications.domain.models import ClassificationCreate
 from core.classifications.domain.ports import ClassificationRepository, LLMClassifier
-from core.classifications.domain.services import classify_text, create_classification
+from core.classifications.domain.services import (
+    aclassify_text,
+    classify_text,
+    classify_texts,
+    create_classification,
+    create_classifications,
+)
+
+logger = logging.getLogger(__name__)
     
 def can_handle_create_classification(event: Dict[str, Any]) -> bool:
     return event.get("type") == "newcall"
@@ -22,4 +33,72 @@ def create_classification_service(event: Dict[str, Any], classification_repo: Cl
         classification_category=classification_category
     )
     created_classification = create_classification(classification_data=classification_create, classification_repo=classification_repo)
-    return created_classification
\ No newline at end of file
+    return created_classification
+
+def create_classifications_service(events: Sequence[Dict[str, Any]], classification_repo: ClassificationRepository, llm_classifier: LLMClassifier) -> List[dict]:
+    """
+    Batch counterpart of `create_classification_service`.
+
+    Classifies all the events' texts with one `classify_many` call and stores
+    the results with one `create_many` call.
+
+    Returns:
+        The created classifications, in input order.
+    """
+    classification_categories = classify_texts(texts=[event["text"] for event in events], llm_classifier=llm_classifier)
+    classifications_create = [
+        ClassificationCreate(call_id="1", classification_category=classification_category)
+        for classification_category in classification_categories
+    ]
+    return create_classifications(classifications_data=classifications_create, classification_repo=classification_repo)
+
+async def acreate_classification_service(event: Dict[str, Any], classification_repo: ClassificationRepository, llm_classifier: LLMClassifier) -> dict:
+    """
+    Asynchronous counterpart of `create_classification_service`.
+
+    Awaits an asynchronous LLM classifier, so the event loop stays free while
+    the classification is in flight, then stores the result from a worker
+    thread, since the repository is blocking.
+
+    Returns:
+        A dictionary representing the classification result.
+    """
+    classification_category = await aclassify_text(text=event["text"], llm_classifier=llm_classifier)
+    classification_create = ClassificationCreate(
+        call_id="1",
+        classification_category=classification_category
+    )
+    created_classification = await asyncio.to_thread(
+        create_classification, classification_data=classification_create, classification_repo=classification_repo
+    )
+    return created_classification
+
+
+
+def compact_transcript_service(event: Dict[str, Any], max_tokens: int) -> Dict[str, Any]:
+    """
+    Service function to shrink an event's transcript before classification.
+
+    Returns a copy of the event whose `text` is compacted to `max_tokens`
+    estimated tokens, with the before/after token counts under `compaction`.
+    """
+    compacted = compact_transcript(event["text"], max_tokens=max_tokens)
+    reduction = compacted.original_tokens - compacted.compacted_tokens
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Compacted transcript",
+            extra={
+                "original_tokens": compacted.original_tokens,
+                "compacted_tokens": compacted.compacted_tokens,
+                "token_reduction": reduction,
+            },
+        )
+    return {
+        **event,
+        "text": compacted.text,
+        "compaction": {
+            "original_tokens": compacted.original_tokens,
+            "compacted_tokens": compacted.compacted_tokens,
+            "token_reduction": reduction,
+        },
+    }
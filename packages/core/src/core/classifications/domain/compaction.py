@@ -0,0 +1,130 @@
+"""
+Transcript compaction for the Classification domain.
+
+Call transcripts can run to tens of thousands of tokens, while the category
+is usually clear from a fraction of them. Compaction shrinks a transcript
+before it reaches the classifier:
+
+1. Whitespace is normalized and filler words ("um", "uh", ...) are removed,
+   keeping the punctuation that ends the sentence around them.
+2. Sentences repeated verbatim, such as IVR menus and hold messages, are
+   kept only once. Short ones ("Yes.", "No.") are kept, as their repeats
+   carry the conversation.
+3. If the result still exceeds the token budget, the head and tail of the
+   call are kept, and the rest of the budget goes to the middle sentences
+   with the most distinct content words, in their original order.
+"""
+import re
+from typing import List
+
+from .models import CompactedTranscript
+from .tokens import CHARS_PER_TOKEN, estimate_tokens
+
+_WHITESPACE = re.compile(r"\s+")
+_FILLER_WORD = r"\b(?:u+m+|u+h+|e+r+m+|h+m+|m+h*m+|a+h+)\b"
+# A filler that opens a sentence goes with its own punctuation ("Hmm."); any
+# other filler goes with the space before it and a trailing comma, so that
+# "said um." keeps its full stop.
+_FILLER = re.compile(
+    rf"(?:^|(?<=[.!?]))\s*{_FILLER_WORD}[,.!?]?|\s*{_FILLER_WORD},?", re.IGNORECASE
+)
+# A comma left right before a sentence end once a filler is gone ("ok, erm?").
+_DANGLING_COMMA = re.compile(r",(?=[.!?])")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its me my of on or so "
+    "that the their them they this to was we were will with you your".split()
+)
+
+
+def normalize_transcript(text: str) -> str:
+    """Removes filler words and collapses runs of whitespace."""
+    return _WHITESPACE.sub(" ", _DANGLING_COMMA.sub("", _FILLER.sub("", text))).strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits normalized text into sentences at terminal punctuation."""
+    return [sentence for sentence in _SENTENCE_END.split(text) if sentence]
+
+
+def drop_repeated_sentences(sentences: List[str], min_words: int = 4) -> List[str]:
+    """
+    Keeps the first occurrence of each sentence of at least `min_words`
+    words, ignoring case and punctuation. Shorter sentences are all kept.
+    """
+    seen = set()
+    unique = []
+    for sentence in sentences:
+        words = _WORD.findall(sentence.lower())
+        key = " ".join(words)
+        if len(words) >= min_words and key in seen:
+            continue
+        seen.add(key)
+        unique.append(sentence)
+    return unique
+
+
+def _signal(sentence: str) -> float:
+    """Scores a sentence by its share of distinct content words."""
+    words = _WORD.findall(sentence.lower())
+    content = {word for word in words if len(word) > 2 and word not in _STOPWORDS}
+    return len(content) / (len(words) or 1)
+
+
+def _take_within(sentences: List[str], budget: int) -> List[str]:
+    taken, used = [], 0
+    for sentence in sentences:
+        tokens = estimate_tokens(sentence) + 1
+        if used + tokens > budget:
+            break
+        taken.append(sentence)
+        used += tokens
+    return taken
+
+
+def compact_transcript(
+    text: str,
+    max_tokens: int,
+    head_share: float = 0.4,
+    tail_share: float = 0.2,
+) -> CompactedTranscript:
+    """
+    Compacts a transcript to at most `max_tokens` estimated tokens.
+
+    Args:
+        text (str): The raw transcript.
+        max_tokens (int): The token budget of the compacted text.
+        head_share (float): The share of the budget reserved for the opening.
+        tail_share (float): The share of the budget reserved for the closing.
+
+    Returns:
+        CompactedTranscript: The compacted text with before/after token counts.
+    """
+    sentences = drop_repeated_sentences(split_sentences(normalize_transcript(text)))
+    compacted = " ".join(sentences)
+    if estimate_tokens(compacted) > max_tokens:
+        compacted = " ".join(_fit_budget(sentences, max_tokens, head_share, tail_share))
+    return CompactedTranscript(
+        text=compacted,
+        original_tokens=estimate_tokens(text),
+        compacted_tokens=estimate_tokens(compacted),
+    )
+
+
+def _fit_budget(sentences: List[str], max_tokens: int, head_share: float, tail_share: float) -> List[str]:
+    head = _take_within(sentences, int(max_tokens * head_share))
+    tail = _take_within(sentences[len(head):][::-1], int(max_tokens * tail_share))[::-1]
+    if not head and not tail:
+        # A single sentence longer than the budget: keep its beginning.
+        return [sentences[0][: max_tokens * CHARS_PER_TOKEN]] if sentences else []
+
+    middle = sentences[len(head):len(sentences) - len(tail)]
+    budget = max_tokens - sum(estimate_tokens(sentence) + 1 for sentence in head + tail)
+    chosen = set()
+    for index in sorted(range(len(middle)), key=lambda index: _signal(middle[index]), reverse=True):
+        tokens = estimate_tokens(middle[index]) + 1
+        if tokens <= budget:
+            chosen.add(index)
+            budget -= tokens
+    return head + [middle[index] for index in sorted(chosen)] + tail
@@ -15,6 +15,11 @@ class Category(str, Enum):
 class ClassificationCategory(BaseModel):
     category: Category
 
+class CompactedTranscript(BaseModel):
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+
 class ClassificationBase(BaseModel):
     call_id: str
     classification_category: ClassificationCategory
@@ -5,7 +5,10 @@ These protocols specify the contracts that external components (like repositorie
 or gateways) must fulfill to be used by this domain's services. This adheres to the
 Dependency Inversion Principle, a key part of clean architecture.
 """
-from typing import Protocol, List
+import asyncio
+from typing import Iterator, Optional, Protocol, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel
 
 from plummy.protocols import CanClassify
 
@@ -27,9 +30,138 @@ class ClassificationRepository(
     def find_by_call_id(self, call_id: str) -> List[Classification]:
         """Finds all classifications associated with a specific call."""
         ...
-        
+
+    def find_page(
+        self,
+        after_id: int = 0,
+        limit: int = 1_000,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+    ) -> List[Classification]:
+        """
+        Finds up to `limit` classifications with an ID above `after_id`, in ID
+        order, optionally only those of one call and/or one category.
+
+        The last ID of a page is the keyset cursor of the next one, so pages
+        never skip or repeat records when others are created or deleted.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement find_page")
+
+    def iter_by(
+        self,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+        page_size: int = 1_000,
+        after_id: int = 0,
+    ) -> Iterator[Classification]:
+        """
+        Streams the classifications matching the filters in ID order.
+
+        Records are fetched lazily, `page_size` at a time, with `find_page`,
+        so memory stays bounded however large the store is. Pass the last ID
+        seen as `after_id` to resume an interrupted scan.
+
+        Raises:
+            ValueError: If `page_size` is less than 1.
+        """
+        # Checked here rather than in the generator, so that the call itself raises.
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        return self._iter_pages(call_id, category, page_size, after_id)
+
+    def _iter_pages(
+        self,
+        call_id: Optional[str],
+        category: Optional[Category],
+        page_size: int,
+        after_id: int,
+    ) -> Iterator[Classification]:
+        while True:
+            page = self.find_page(after_id=after_id, limit=page_size, call_id=call_id, category=category)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1].id
+
+    def iter_all(self, page_size: int = 1_000, after_id: int = 0) -> Iterator[Classification]:
+        """Streams every classification in ID order; see `iter_by`."""
+        return self.iter_by(page_size=page_size, after_id=after_id)
+
+
+class PreallocatingClassificationRepository(ClassificationRepository, Protocol):
+    """
+    A classification repository that can hand out IDs ahead of the writes,
+    so that records can be acknowledged before they are stored.
+    """
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserves `count` consecutive IDs that `create` will never assign."""
+        ...
+
+    def save_many(self, classifications: Sequence[Classification]) -> None:
+        """Stores classifications whose IDs were obtained from `reserve_ids`."""
+        ...
+
 class LLMClassifier(CanClassify[str, Category], Protocol):
     """
     A concrete adapter that implements the 'CanClassify' port
     using the OpenAI API.
-    """
\ No newline at end of file
+    """
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Classifies many texts, returning one result per text in input order.
+
+        Defaults to one `classify` call per text.
+        """
+        return [self.classify(text=text, category=category) for text in texts]
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """
+        The asyncio entry point of the classifier.
+
+        Defaults to running `classify` in a worker thread; natively
+        asynchronous adapters override it.
+        """
+        return await asyncio.to_thread(self.classify, text=text, category=category)
+
+
+def classify_many(classifier: LLMClassifier, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+    """
+    Calls `classifier.classify_many` if it has one, else `classify` per text.
+
+    The protocol's default only reaches classes that subclass it, so
+    decorators wrapping any classifier go through this helper.
+    """
+    bulk = getattr(classifier, "classify_many", None)
+    if bulk is not None:
+        return bulk(texts=texts, category=category)
+    return [classifier.classify(text=text, category=category) for text in texts]
+
+
+class ConfidenceLLMClassifier(LLMClassifier, Protocol):
+    """
+    An LLM classifier that can also report how confident it is in a result.
+    """
+
+    def classify_with_confidence(self, text: str, category: Type[BaseModel]) -> Tuple[BaseModel, float]:
+        """Classifies the text and returns the result with a confidence in [0, 1]."""
+        ...
+
+    def classify_many_with_confidence(
+        self, texts: Sequence[str], category: Type[BaseModel]
+    ) -> List[Tuple[BaseModel, float]]:
+        """
+        Classifies many texts, returning one result and confidence per text in input order.
+
+        Defaults to one `classify_with_confidence` call per text.
+        """
+        return [self.classify_with_confidence(text=text, category=category) for text in texts]
+
+    async def aclassify_with_confidence(self, text: str, category: Type[BaseModel]) -> Tuple[BaseModel, float]:
+        """
+        The asyncio counterpart of `classify_with_confidence`.
+
+        Defaults to running `classify_with_confidence` in a worker thread.
+        """
+        return await asyncio.to_thread(self.classify_with_confidence, text=text, category=category)
@@ -5,8 +5,15 @@ These functions are pure, stateless, and decoupled from any infrastructure conce
 They operate solely on domain models and depend on abstract ports for any
 external interactions (like data persistence or API calls).
 """
+import logging
+from typing import List, Sequence
+
+from plummy.protocols import create_many
+
 from .models import Category, Classification, ClassificationCreate, ClassificationCategory
-from .ports import ClassificationRepository, LLMClassifier
+from .ports import ClassificationRepository, LLMClassifier, classify_many
+
+logger = logging.getLogger(__name__)
 
 def classify_text(text: str, llm_classifier: LLMClassifier) -> Category:
     """
@@ -19,19 +26,64 @@ def classify_text(text: str, llm_classifier: LLMClassifier) -> Category:
     Returns:
         Classification: The classification result.
     """
-    print("DOMAIN SERVICE: Executing 'classify_text' logic...")
+    logger.debug("Executing 'classify_text' domain service")
     # Use a keyword argument for the response model
     classification_result = llm_classifier.classify(
         text=text, category=ClassificationCategory
     )
     return classification_result
 
+async def aclassify_text(text: str, llm_classifier: LLMClassifier) -> Category:
+    """
+    Classifies the given text using an asynchronous LLM classifier.
+
+    Args:
+        text (str): The text to classify.
+        llm_classifier (LLMClassifier): The LLM classifier to use.
+
+    Returns:
+        Classification: The classification result.
+    """
+    logger.debug("Executing 'aclassify_text' domain service")
+    return await llm_classifier.aclassify(text=text, category=ClassificationCategory)
+
+def classify_texts(texts: Sequence[str], llm_classifier: LLMClassifier) -> List[Category]:
+    """
+    Classifies many texts at once using the provided LLM classifier.
+
+    Args:
+        texts (Sequence[str]): The texts to classify.
+        llm_classifier (LLMClassifier): The LLM classifier to use.
+
+    Returns:
+        List[Category]: One classification result per text, in input order.
+    """
+    logger.debug("Executing 'classify_texts' domain service")
+    return classify_many(llm_classifier, texts=texts, category=ClassificationCategory)
+
 def create_classification(
     classification_data: ClassificationCreate,
     classification_repo: ClassificationRepository,
 ) -> Classification:
 
-    print("DOMAIN SERVICE: Executing 'create_classification' logic...")
+    logger.debug("Executing 'create_classification' domain service")
     created_classification = classification_repo.create(classification_data)
 
-    return created_classification
\ No newline at end of file
+    return created_classification
+
+def create_classifications(
+    classifications_data: Sequence[ClassificationCreate],
+    classification_repo: ClassificationRepository,
+) -> List[Classification]:
+    """
+    Stores many classifications with a single repository operation.
+
+    Args:
+        classifications_data (Sequence[ClassificationCreate]): The classifications to store.
+        classification_repo (ClassificationRepository): The repository to store them in.
+
+    Returns:
+        List[Classification]: The stored classifications, in input order.
+    """
+    logger.debug("Executing 'create_classifications' domain service")
+    return create_many(classification_repo, classifications_data)
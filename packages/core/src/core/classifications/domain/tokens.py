@@ -0,0 +1,25 @@
+"""
+Token accounting helpers for the Classification domain.
+
+LLM cost and latency are driven by token counts. These helpers give a cheap,
+dependency-free estimate that is good enough for budgeting (packing requests,
+rate limiting, truncation) without loading a tokenizer.
+"""
+
+# English text averages roughly four characters per token for OpenAI tokenizers.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count, at least 1 for non-empty text.
+    """
+    if not text:
+        return 0
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
@@ -0,0 +1,313 @@
+"""
+Incrementally maintained category counts for dashboards.
+
+`AggregatingClassificationRepository` wraps a repository and updates a
+`CategoryAggregates` on every create, update and delete. Dashboards then
+read counters instead of scanning records:
+
+- all-time counts per category,
+- counts per category for each call,
+- counts per category over sliding windows (by default the last 5 minutes,
+  hour and day), kept in rings of time buckets.
+
+Each query costs O(buckets) or less, whatever the number of records.
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.classifications.domain.models import Category, Classification, ClassificationCreate
+from core.classifications.domain.ports import ClassificationRepository
+from plummy.protocols import create_many, delete_many, get_many
+
+_CATEGORIES = tuple(Category)
+_CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+
+# Key: window name, Value: (window length, bucket length) in seconds
+DEFAULT_WINDOWS: Dict[str, Tuple[float, float]] = {
+    "5m": (300.0, 10.0),
+    "1h": (3_600.0, 60.0),
+    "1d": (86_400.0, 900.0),
+}
+
+
+def _as_dict(counts: np.ndarray) -> Dict[Category, int]:
+    return {category: int(counts[code]) for code, category in enumerate(_CATEGORIES)}
+
+
+def _grown(array: np.ndarray, size: int, fill) -> np.ndarray:
+    grown = np.full((max(size, 2 * len(array)),) + array.shape[1:], fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class BucketRing:
+    """
+    Per-category counts over a sliding window, in a ring of time buckets.
+
+    Bucket `n` covers `[n * bucket_seconds, (n + 1) * bucket_seconds)` and
+    lives in slot `n % size`. A slot still holding an older bucket is
+    cleared when it's reused, so old counts age out without a sweep. The
+    window covers the current bucket and the `size - 1` before it, so its
+    edge is accurate to one bucket.
+    """
+    def __init__(self, window_seconds: float, bucket_seconds: float):
+        if bucket_seconds <= 0 or window_seconds < bucket_seconds:
+            raise ValueError("A window must hold at least one bucket of positive length")
+        self.bucket_seconds = bucket_seconds
+        self.size = math.ceil(window_seconds / bucket_seconds)
+        self._buckets = np.full(self.size, -1, dtype=np.int64)
+        self._counts = np.zeros((self.size, len(_CATEGORIES)), dtype=np.int64)
+
+    def bucket_of(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self, bucket: int, code: int, delta: int, current: int) -> None:
+        """Adds `delta` to a category's count in a bucket, unless the bucket is outside the window."""
+        if not current - self.size < bucket <= current:
+            return
+        slot = bucket % self.size
+        if self._buckets[slot] != bucket:
+            self._buckets[slot] = bucket
+            self._counts[slot] = 0
+        self._counts[slot, code] += delta
+
+    def counts(self, current: int) -> np.ndarray:
+        """The per-category counts of the window ending in bucket `current`."""
+        live = (self._buckets > current - self.size) & (self._buckets <= current)
+        return self._counts[live].sum(axis=0)
+
+    def series(self, current: int) -> List[Tuple[float, Dict[Category, int]]]:
+        """The start time and per-category counts of every bucket in the window, oldest first."""
+        empty = np.zeros(len(_CATEGORIES), dtype=np.int64)
+        series = []
+        for bucket in range(current - self.size + 1, current + 1):
+            slot = bucket % self.size
+            counts = self._counts[slot] if self._buckets[slot] == bucket else empty
+            series.append((bucket * self.bucket_seconds, _as_dict(counts)))
+        return series
+
+
+class CategoryAggregates:
+    """
+    Category counters that are updated one record at a time.
+
+    For every counted record it keeps the category code, the call and the
+    time it was counted, in numpy arrays indexed by ID (13 bytes per ID).
+    Updates and deletes can then take back exactly what was counted, even
+    if the caller changed the stored object in place. Memory is bounded by
+    the largest ID, not the number of live records: IDs are never reused,
+    so deleted records keep their 13 bytes.
+
+    Records loaded with `seed` have no creation time, so they count towards
+    the totals and per-call counts but not the windows.
+    """
+    def __init__(
+        self,
+        windows: Mapping[str, Tuple[float, float]] = DEFAULT_WINDOWS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._rings = {name: BucketRing(*window) for name, window in windows.items()}
+        self._clock = clock
+        self._totals = np.zeros(len(_CATEGORIES), dtype=np.int64)
+        # Interned call IDs and their per-category counts, one row per call
+        self._call_codes_by_id: Dict[str, int] = {}
+        self._call_counts = np.zeros((1_024, len(_CATEGORIES)), dtype=np.int64)
+        # Indexed by classification ID: the category code (-1 if not counted),
+        # the call code and the creation time (NaN if unknown)
+        self._codes = np.full(1_024, -1, dtype=np.int8)
+        self._record_calls = np.zeros(1_024, dtype=np.int32)
+        self._created_at = np.full(1_024, np.nan, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    @property
+    def windows(self) -> List[str]:
+        return list(self._rings)
+
+    def record_created(self, classification: Classification) -> None:
+        """Counts a new classification in the totals, its call and the windows."""
+        with self._lock:
+            self._count(classification, self._clock())
+
+    def record_updated(self, classification: Classification) -> None:
+        """Moves an updated classification's counts to its new category and call."""
+        with self._lock:
+            created_at = self._uncount(classification.id)
+            self._count(classification, created_at)
+
+    def record_deleted(self, id: int) -> None:
+        """Takes a deleted classification out of every counter."""
+        with self._lock:
+            self._uncount(id)
+
+    def seed(self, classifications: Iterable[Classification]) -> None:
+        """
+        Counts already-stored classifications, e.g. from `iter_all`, outside
+        the windows. Records already counted are left as they are.
+        """
+        with self._lock:
+            for classification in classifications:
+                id = classification.id
+                if id < len(self._codes) and self._codes[id] != -1:
+                    continue
+                self._count(classification, math.nan)
+
+    def totals(self) -> Dict[Category, int]:
+        """All-time counts per category."""
+        with self._lock:
+            return _as_dict(self._totals)
+
+    def counts_by_call(self, call_id: str) -> Dict[Category, int]:
+        """Counts per category for one call."""
+        with self._lock:
+            code = self._call_codes_by_id.get(call_id)
+            if code is None:
+                return _as_dict(np.zeros(len(_CATEGORIES), dtype=np.int64))
+            return _as_dict(self._call_counts[code])
+
+    def window_counts(self, window: str) -> Dict[Category, int]:
+        """Counts per category of the records created within a window, e.g. "5m"."""
+        ring = self._rings[window]
+        with self._lock:
+            return _as_dict(ring.counts(ring.bucket_of(self._clock())))
+
+    def window_series(self, window: str) -> List[Tuple[float, Dict[Category, int]]]:
+        """Counts per category of every time bucket of a window, oldest first."""
+        ring = self._rings[window]
+        with self._lock:
+            return ring.series(ring.bucket_of(self._clock()))
+
+    def _count(self, classification: Classification, created_at: float) -> None:
+        id = classification.id
+        code = _CATEGORY_CODES[classification.classification_category.category]
+        call_code = self._intern(classification.call_id)
+        if id >= len(self._codes):
+            self._codes = _grown(self._codes, id + 1, -1)
+            self._record_calls = _grown(self._record_calls, id + 1, 0)
+            self._created_at = _grown(self._created_at, id + 1, np.nan)
+        self._codes[id] = code
+        self._record_calls[id] = call_code
+        self._created_at[id] = created_at
+        self._add(code, call_code, created_at, 1)
+
+    def _uncount(self, id: int) -> float:
+        """Takes back a record's counts and returns its creation time."""
+        if id >= len(self._codes) or self._codes[id] == -1:
+            return math.nan
+        created_at = float(self._created_at[id])
+        self._add(int(self._codes[id]), int(self._record_calls[id]), created_at, -1)
+        self._codes[id] = -1
+        return created_at
+
+    def _add(self, code: int, call_code: int, created_at: float, delta: int) -> None:
+        self._totals[code] += delta
+        self._call_counts[call_code, code] += delta
+        if not math.isnan(created_at):
+            now = self._clock()
+            for ring in self._rings.values():
+                ring.add(ring.bucket_of(created_at), code, delta, ring.bucket_of(now))
+
+    def _intern(self, call_id: str) -> int:
+        code = self._call_codes_by_id.get(call_id)
+        if code is None:
+            code = len(self._call_codes_by_id)
+            self._call_codes_by_id[call_id] = code
+            if code >= len(self._call_counts):
+                self._call_counts = _grown(self._call_counts, code + 1, 0)
+        return code
+
+
+class AggregatingClassificationRepository(ClassificationRepository):
+    """
+    An aggregating decorator that implements the 'ClassificationRepository' port.
+
+    Writes go to the wrapped repository first and are then counted in
+    `aggregates`, both under one lock, so that a delete can't run between
+    a create and its count. Reads go straight to the wrapped repository.
+
+    Records stored before the decorator was built are counted by `rebuild`,
+    a full scan. With `rebuild_on_first_read`, it runs on the first read of
+    `aggregates` instead of when the decorator is built.
+    """
+    def __init__(
+        self,
+        repository: ClassificationRepository,
+        aggregates: Optional[CategoryAggregates] = None,
+        rebuild_on_first_read: bool = False,
+    ):
+        self._repository = repository
+        self._aggregates = aggregates if aggregates is not None else CategoryAggregates()
+        self._needs_rebuild = rebuild_on_first_read
+        self._lock = threading.RLock()
+
+    @property
+    def aggregates(self) -> CategoryAggregates:
+        """The counters, seeded with the stored records first if a rebuild is pending."""
+        if self._needs_rebuild:
+            self.rebuild()
+        return self._aggregates
+
+    def rebuild(self, page_size: int = 1_000) -> None:
+        """
+        Seeds the aggregates with every record already stored, in one
+        streaming scan. Writes wait for the scan, so none is counted twice.
+        """
+        with self._lock:
+            self._needs_rebuild = False
+            self._aggregates.seed(self._repository.iter_all(page_size=page_size))
+
+    def get_by_id(self, id: int) -> Optional[Classification]:
+        return self._repository.get_by_id(id)
+
+    def get_many(self, ids: Sequence[int]) -> List[Classification]:
+        return get_many(self._repository, ids)
+
+    def create(self, data: ClassificationCreate) -> Classification:
+        """Creates the classification, then counts it."""
+        with self._lock:
+            classification = self._repository.create(data)
+            self._aggregates.record_created(classification)
+        return classification
+
+    def create_many(self, data: Sequence[ClassificationCreate]) -> List[Classification]:
+        """Creates the classifications, then counts them."""
+        with self._lock:
+            classifications = create_many(self._repository, data)
+            for classification in classifications:
+                self._aggregates.record_created(classification)
+        return classifications
+
+    def update(self, classification: Classification) -> Classification:
+        """Updates the classification, then moves its counts."""
+        with self._lock:
+            updated = self._repository.update(classification)
+            self._aggregates.record_updated(updated)
+        return updated
+
+    def delete(self, id: int) -> None:
+        """Deletes the classification, then takes back its counts."""
+        with self._lock:
+            self._repository.delete(id)
+            self._aggregates.record_deleted(id)
+
+    def delete_many(self, ids: Sequence[int]) -> None:
+        """Deletes the classifications, then takes back their counts."""
+        with self._lock:
+            delete_many(self._repository, ids)
+            for id in dict.fromkeys(ids):
+                self._aggregates.record_deleted(id)
+
+    def find_by_call_id(self, call_id: str) -> List[Classification]:
+        return self._repository.find_by_call_id(call_id)
+
+    def find_page(
+        self,
+        after_id: int = 0,
+        limit: int = 1_000,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+    ) -> List[Classification]:
+        return self._repository.find_page(after_id=after_id, limit=limit, call_id=call_id, category=category)
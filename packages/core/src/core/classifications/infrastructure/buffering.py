@@ -0,0 +1,295 @@
+"""
+Write-behind buffering in front of a classification repository.
+
+Storing a classification synchronously makes every pipeline event wait on
+persistence. `WriteBehindClassificationRepository` acknowledges a `create`
+as soon as the record has an ID and sits in a bounded in-process buffer. A
+background thread writes the buffer to the wrapped repository in batches,
+whenever a batch is full or `flush_interval` has passed since its first
+record.
+"""
+import atexit
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from core.classifications.domain.models import Category, Classification, ClassificationCreate
+from core.classifications.domain.ports import (
+    ClassificationRepository,
+    PreallocatingClassificationRepository,
+)
+from plummy.protocols import delete_many, get_many
+
+logger = logging.getLogger(__name__)
+
+# Queue markers: `_FLUSH` ends the current batch early, `_STOP` ends the writer.
+_FLUSH = object()
+_STOP = object()
+
+
+class WriteBehindClassificationRepository(ClassificationRepository):
+    """
+    A write-behind decorator that implements the 'ClassificationRepository' port.
+
+    - `create` and `create_many` take IDs from blocks reserved in the wrapped
+      repository, buffer the records and return at once. Once `max_pending`
+      records are pending, they block until the writer catches up.
+    - `get_by_id`, `get_many` and `find_by_call_id` also see buffered
+      records, so callers read their own writes.
+    - `update`, `delete`, `delete_many` and `find_page` (and so the
+      `iter_*` scans) flush the buffer first and then go straight to the
+      wrapped repository.
+    - `close`, which also runs at interpreter exit, writes everything still
+      buffered.
+
+    A failed batch is retried `max_retries` times, then logged and its
+    records counted once in `failed_writes`. They stay buffered, count
+    towards `max_pending`, are retried with the next batch or flush, and
+    make `flush` and `close` raise until they are written. Once the buffer
+    is full of them, `create` raises too instead of waiting for a writer
+    that has nothing left to retry them with. IDs reserved but unused when
+    the process stops are skipped, not reused.
+    """
+    def __init__(
+        self,
+        repository: PreallocatingClassificationRepository,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+        max_retries: int = 3,
+    ):
+        if max_batch_size < 1 or max_pending < 1:
+            raise ValueError("max_batch_size and max_pending must be at least 1")
+        self._repository = repository
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._max_pending = max_pending
+        self._queue: queue.Queue = queue.Queue()
+        # Key: classification ID, Value: a record accepted but not yet written
+        self._pending: Dict[int, Classification] = {}
+        # Key: call ID, Value: the IDs of its pending records, in insertion order
+        self._pending_by_call_id: Dict[str, Dict[int, None]] = {}
+        # Records whose batch failed; still pending, retried with the next batch
+        self._unwritten: List[Classification] = []
+        self._free_ids: Iterator[int] = iter(())
+        self._lock = threading.Lock()
+        # Notified whenever the writer drops records from `_pending` or gives up on a batch
+        self._written = threading.Condition(self._lock)
+        self._id_lock = threading.Lock()
+        # Held to check `_closed` and enqueue, so that nothing is queued behind `_STOP`
+        self._enqueue_lock = threading.Lock()
+        self._closed = False
+        self.batches_written = 0
+        self.written = 0
+        self.failed_writes = 0
+        self._writer = threading.Thread(target=self._run, name="classification-write-behind", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        """The number of records accepted but not yet written."""
+        with self._lock:
+            return len(self._pending)
+
+    def get_by_id(self, id: int) -> Optional[Classification]:
+        """Retrieve a classification by its ID, buffered or stored."""
+        with self._lock:
+            classification = self._pending.get(id)
+        if classification is not None:
+            return classification
+        return self._repository.get_by_id(id)
+
+    def get_many(self, ids: Sequence[int]) -> List[Classification]:
+        """Retrieve many classifications by ID, buffered or stored, in input order."""
+        with self._lock:
+            buffered = {id: self._pending[id] for id in ids if id in self._pending}
+        stored_ids = [id for id in dict.fromkeys(ids) if id not in buffered]
+        stored = dict(zip(stored_ids, get_many(self._repository, stored_ids))) if stored_ids else {}
+        return [buffered[id] if id in buffered else stored[id] for id in ids]
+
+    def create(self, data: ClassificationCreate) -> Classification:
+        """Accepts a new classification, which is written in the background."""
+        return self.create_many([data])[0]
+
+    def create_many(self, data: Sequence[ClassificationCreate]) -> List[Classification]:
+        """
+        Accepts many new classifications, in input order.
+
+        Raises:
+            RuntimeError: If the repository is closed, or the buffer is full
+                of records that could not be written.
+        """
+        with self._enqueue_lock:
+            if self._closed:
+                raise RuntimeError("The write-behind repository is closed")
+            classifications = [
+                Classification(id=id, call_id=item.call_id, classification_category=item.classification_category)
+                for id, item in zip(self._allocate_ids(len(data)), data)
+            ]
+            for classification in classifications:
+                # Blocks while the buffer is full; the writer doesn't need the enqueue lock.
+                with self._written:
+                    while len(self._pending) >= self._max_pending:
+                        if len(self._unwritten) == len(self._pending):
+                            raise RuntimeError(
+                                f"The write-behind buffer is full of {len(self._unwritten)} "
+                                "classifications that could not be written"
+                            )
+                        self._written.wait()
+                    self._pending[classification.id] = classification
+                    self._pending_by_call_id.setdefault(classification.call_id, {})[classification.id] = None
+                self._queue.put(classification)
+        return classifications
+
+    def update(self, classification: Classification) -> Classification:
+        """Flushes the buffer, then updates the classification."""
+        self.flush()
+        return self._repository.update(classification)
+
+    def delete(self, id: int) -> None:
+        """Flushes the buffer, then deletes the classification."""
+        self.flush()
+        self._repository.delete(id)
+
+    def delete_many(self, ids: Sequence[int]) -> None:
+        """Flushes the buffer, then deletes the classifications."""
+        self.flush()
+        delete_many(self._repository, ids)
+
+    def find_by_call_id(self, call_id: str) -> List[Classification]:
+        """Find all classifications for a specific call ID, buffered or stored."""
+        with self._lock:
+            buffered = [self._pending[id] for id in self._pending_by_call_id.get(call_id, ())]
+        try:
+            stored = self._repository.find_by_call_id(call_id)
+        except ValueError:
+            if not buffered:
+                raise
+            stored = []
+        # A record can be both stored and still pending while its batch completes.
+        merged = {classification.id: classification for classification in stored}
+        merged.update((classification.id, classification) for classification in buffered)
+        return sorted(merged.values(), key=lambda classification: classification.id)
+
+    def find_page(
+        self,
+        after_id: int = 0,
+        limit: int = 1_000,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+    ) -> List[Classification]:
+        """Flushes the buffer, then reads a page from the wrapped repository."""
+        self.flush()
+        return self._repository.find_page(after_id=after_id, limit=limit, call_id=call_id, category=category)
+
+    def flush(self) -> None:
+        """
+        Blocks until every record accepted so far is written.
+
+        Raises:
+            RuntimeError: If some records still can't be written.
+        """
+        with self._enqueue_lock:
+            if not self._closed:
+                self._queue.put(_FLUSH)
+        self._queue.join()
+        self._raise_if_unwritten()
+
+    def close(self) -> None:
+        """
+        Writes every buffered record and stops the background writer.
+
+        Raises:
+            RuntimeError: If some records couldn't be written; they are lost.
+        """
+        with self._enqueue_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+        atexit.unregister(self.close)
+        self._raise_if_unwritten()
+
+    def _raise_if_unwritten(self) -> None:
+        with self._lock:
+            unwritten = len(self._unwritten)
+        if unwritten:
+            raise RuntimeError(f"{unwritten} buffered classifications could not be written")
+
+    def _allocate_ids(self, count: int) -> List[int]:
+        with self._id_lock:
+            ids = list(itertools.islice(self._free_ids, count))
+            if len(ids) < count:
+                self._free_ids = iter(self._repository.reserve_ids(max(count - len(ids), self._max_batch_size)))
+                ids.extend(itertools.islice(self._free_ids, count - len(ids)))
+        return ids
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Classification] = []
+            markers = 0
+            item = self._queue.get()
+            deadline = time.monotonic() + self._flush_interval
+            while True:
+                if item is _STOP or item is _FLUSH:
+                    markers += 1
+                    stopping = item is _STOP
+                    break
+                batch.append(item)
+                if len(batch) >= self._max_batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            with self._lock:
+                retried, self._unwritten = self._unwritten, []
+            if retried or batch:
+                self._write(retried, batch)
+            for _ in range(len(batch) + markers):
+                self._queue.task_done()
+
+    def _write(self, retried: List[Classification], new: List[Classification]) -> None:
+        """
+        Writes previously failed and new records to the wrapped repository
+        in one batch, then drops them from the buffer; a batch that still
+        fails after the retries is kept for later.
+        """
+        batch = retried + new
+        for attempt in range(self._max_retries + 1):
+            try:
+                self._repository.save_many(batch)
+                written = True
+                break
+            except Exception:
+                written = False
+                if attempt == self._max_retries:
+                    logger.exception(
+                        "Failed to write buffered classifications",
+                        extra={"count": len(batch), "first_id": batch[0].id},
+                    )
+                else:
+                    time.sleep(min(self._flush_interval, 2 ** attempt * 0.1))
+        with self._written:
+            self._written.notify_all()
+            if not written:
+                self._unwritten.extend(batch)
+                self.failed_writes += len(new)
+                return
+            for classification in batch:
+                del self._pending[classification.id]
+                ids = self._pending_by_call_id[classification.call_id]
+                del ids[classification.id]
+                if not ids:
+                    del self._pending_by_call_id[classification.call_id]
+            self.batches_written += 1
+            self.written += len(batch)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Wrote buffered classifications", extra={"count": len(batch)})
@@ -0,0 +1,335 @@
+"""
+Caching adapters that sit in front of an `LLMClassifier`.
+
+Many transcripts repeat verbatim (IVR boilerplate, voicemail templates), so the
+result of a classification is cached under a content address: a hash of the
+model, the prompt templates, the output schema and the text. Any change to
+one of those produces a new key, so stale prompts or schemas are never served.
+
+The same key is used to coalesce identical requests that are still in flight,
+so a burst of equal texts costs a single upstream call.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from core.classifications.domain.ports import LLMClassifier, classify_many
+from core.classifications.infrastructure.prompts import USER_PROMPT_TEMPLATE, compile_prompt
+
+
+def classification_cache_key(model: Optional[str], category: Type[BaseModel], text: str) -> str:
+    """
+    Builds the content address of a classification request.
+
+    Args:
+        model (Optional[str]): The LLM model name, if the classifier has one.
+        category (Type[BaseModel]): The structured output model.
+        text (str): The text to classify.
+
+    Returns:
+        str: A hex SHA-256 digest.
+    """
+    prompt = compile_prompt(category)
+    payload = json.dumps(
+        [model, prompt.system_prompt, USER_PROMPT_TEMPLATE, prompt.schema_fingerprint, text],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteClassificationCache:
+    """
+    A durable key/value store for cached classifications, backed by SQLite.
+
+    Values are stored as the JSON dump of the output model together with a
+    wall-clock expiry, so entries survive restarts but still honour the TTL.
+    """
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS classification_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the stored JSON for a key, or None if missing or expired."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM classification_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                with self._connection:
+                    self._connection.execute("DELETE FROM classification_cache WHERE key = ?", (key,))
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        """Stores the JSON for a key, replacing any previous value."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO classification_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class CachedClassifierGateway(LLMClassifier):
+    """
+    A caching decorator that implements the 'LLMClassifier' port.
+
+    Results are kept in an in-process LRU bounded by `max_size` entries and an
+    optional TTL, and can be persisted to a `SQLiteClassificationCache` so they
+    survive restarts. Hit, miss and eviction counters are exposed as attributes.
+    """
+    def __init__(
+        self,
+        classifier: LLMClassifier,
+        max_size: int = 10_000,
+        ttl: Optional[float] = 3600.0,
+        store: Optional[SQLiteClassificationCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._classifier = classifier
+        self._max_size = max_size
+        self._ttl = ttl
+        self._store = store
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[Optional[float], BaseModel]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._classifier, "model", None)
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Returns the cached classification for the text, classifying it on a miss."""
+        key = classification_cache_key(self.model, category, text)
+        cached = self._lookup(key, category)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        result = self._classifier.classify(text=text, category=category)
+        self._remember(key, result)
+        return result.model_copy(deep=True)
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Returns the cached classifications of the texts and classifies the
+        misses with one `classify_many` call, each distinct text once.
+
+        Raises:
+            ValueError: If the wrapped classifier doesn't return one result
+                per miss; nothing is cached then.
+        """
+        keys = [classification_cache_key(self.model, category, text) for text in texts]
+        results: List[Optional[BaseModel]] = [self._lookup(key, category) for key in keys]
+        # Key: cache key of a miss, Value: its text
+        misses = {key: text for key, text, result in zip(keys, texts, results) if result is None}
+        if not misses:
+            return results
+
+        with self._lock:
+            self.misses += len(misses)
+        classified_misses = classify_many(self._classifier, texts=list(misses.values()), category=category)
+        if len(classified_misses) != len(misses):
+            raise ValueError(
+                f"The classifier returned {len(classified_misses)} results for {len(misses)} texts"
+            )
+        classified = dict(zip(misses, classified_misses))
+        for key, result in classified.items():
+            self._remember(key, result)
+        return [
+            result if result is not None else classified[key].model_copy(deep=True)
+            for key, result in zip(keys, results)
+        ]
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`; only a miss awaits the wrapped classifier."""
+        key = classification_cache_key(self.model, category, text)
+        cached = self._lookup(key, category)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            self.misses += 1
+        result = await self._classifier.aclassify(text=text, category=category)
+        self._remember(key, result)
+        return result.model_copy(deep=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str, category: Type[BaseModel]) -> Optional[BaseModel]:
+        """Returns a copy of the cached result for a key, counting a hit, or None."""
+        cached = self._get_local(key)
+        if cached is None and self._store is not None:
+            stored = self._store.get(key)
+            if stored is not None:
+                cached = category.model_validate_json(stored)
+                self._put_local(key, cached)
+        if cached is None:
+            return None
+        with self._lock:
+            self.hits += 1
+        return cached.model_copy(deep=True)
+
+    def _remember(self, key: str, result: BaseModel) -> None:
+        self._put_local(key, result)
+        if self._store is not None:
+            self._store.set(key, result.model_dump_json(), self._ttl)
+
+    def _get_local(self, key: str) -> Optional[BaseModel]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _put_local(self, key: str, value: BaseModel) -> None:
+        expires_at = self._clock() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+class SingleFlightClassifierGateway(LLMClassifier):
+    """
+    A request-coalescing decorator that implements the 'LLMClassifier' port.
+
+    While a classification for a given (model, schema, text) is in flight, any
+    identical request waits for it and receives its result instead of calling
+    the wrapped classifier again. `classify` serves threaded callers and
+    `aclassify` serves asyncio callers, each coalescing among themselves.
+    """
+    def __init__(self, classifier: LLMClassifier):
+        self._classifier = classifier
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+        self._async_in_flight: dict[tuple[int, str], asyncio.Task] = {}
+        self.coalesced = 0
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._classifier, "model", None)
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Classifies the text, sharing the upstream call with identical concurrent requests."""
+        key = classification_cache_key(self.model, category, text)
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            return future.result().model_copy(deep=True)
+
+        try:
+            result = self._classifier.classify(text=text, category=category)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Classifies many texts, sending the ones not already in flight as one
+        `classify_many` call and waiting for the rest.
+
+        Our own batch is sent before waiting on other callers' requests, so
+        two batches that share texts can't wait on each other.
+        """
+        keys = [classification_cache_key(self.model, category, text) for text in texts]
+        # Key: cache key, Value: the shared result of that key's request
+        futures: dict[str, Future] = {}
+        # Key: cache key led by this call, Value: its text
+        led: dict[str, str] = {}
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in futures:
+                    continue
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._in_flight[key] = Future()
+                    led[key] = text
+                else:
+                    self.coalesced += 1
+                futures[key] = future
+
+        if led:
+            try:
+                results = classify_many(self._classifier, texts=list(led.values()), category=category)
+            except BaseException as exc:
+                for key in led:
+                    futures[key].set_exception(exc)
+                raise
+            else:
+                for key, result in zip(led, results):
+                    futures[key].set_result(result)
+            finally:
+                with self._lock:
+                    for key in led:
+                        del self._in_flight[key]
+        return [futures[key].result().model_copy(deep=True) for key in keys]
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`."""
+        key = (id(asyncio.get_running_loop()), classification_cache_key(self.model, category, text))
+        with self._lock:
+            task = self._async_in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(
+                    self._classifier.aclassify(text=text, category=category)
+                )
+                self._async_in_flight[key] = task
+                task.add_done_callback(lambda _: self._forget(key))
+            else:
+                self.coalesced += 1
+        # Shielded so that one cancelled caller doesn't cancel the shared request.
+        result = await asyncio.shield(task)
+        return result.model_copy(deep=True)
+
+    def _forget(self, key: tuple[int, str]) -> None:
+        with self._lock:
+            self._async_in_flight.pop(key, None)
+
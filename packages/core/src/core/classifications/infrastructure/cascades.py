@@ -0,0 +1,144 @@
+"""
+A model cascade: cheap models first, escalating only when they are unsure.
+
+Each tier but the last is asked for a self-reported confidence. A result at
+or above the tier's threshold is returned; otherwise the text is escalated to
+the next tier. The last tier's answer is final. Easy texts are answered by the
+small model, and only hard ones pay for the large model's latency and cost.
+"""
+import logging
+import threading
+import time
+from typing import List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from core.classifications.domain.ports import ConfidenceLLMClassifier, LLMClassifier, classify_many
+from plummy.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class TierStats:
+    """The call and escalation counters and the latency histogram of one tier."""
+
+    __slots__ = ("model", "calls", "escalations", "latency")
+
+    def __init__(self, model: Optional[str]):
+        self.model = model
+        self.calls = 0
+        self.escalations = 0
+        self.latency = Histogram()
+
+    @property
+    def escalation_rate(self) -> float:
+        """The share of this tier's calls that were escalated to the next tier."""
+        return self.escalations / self.calls if self.calls else 0.0
+
+
+class CascadingClassifierGateway(LLMClassifier):
+    """
+    A cascading decorator that implements the 'LLMClassifier' port.
+
+    `classify_many` sends each tier its texts as one batch; every text is
+    counted in the tier's stats with its share of the batch latency.
+
+    Args:
+        tiers: The classifiers to try, cheapest first. Every tier but the last
+            must implement `ConfidenceLLMClassifier`.
+        thresholds: The minimum confidence to accept at each tier but the last.
+            A single float applies to all of them.
+    """
+    def __init__(
+        self,
+        tiers: Sequence[LLMClassifier],
+        thresholds: float | Sequence[float] = 0.8,
+    ):
+        if len(tiers) < 2:
+            raise ValueError("A cascade needs at least two tiers")
+        if isinstance(thresholds, (int, float)):
+            thresholds = [float(thresholds)] * (len(tiers) - 1)
+        if len(thresholds) != len(tiers) - 1:
+            raise ValueError("A cascade needs one threshold per tier but the last")
+        self._tiers: List[ConfidenceLLMClassifier] = list(tiers)
+        self._thresholds = list(thresholds)
+        self._lock = threading.Lock()
+        self.stats = [TierStats(getattr(tier, "model", None)) for tier in tiers]
+
+    @property
+    def model(self) -> str:
+        """The tiers' models, which identify the cascade in cache keys."""
+        return ">".join(str(stats.model) for stats in self.stats)
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Classifies the text with the cheapest tier that is confident enough."""
+        for tier, classifier in enumerate(self._tiers[:-1]):
+            start = time.perf_counter()
+            result, confidence = classifier.classify_with_confidence(text=text, category=category)
+            if self._accept(tier, confidence, time.perf_counter() - start):
+                return result
+        start = time.perf_counter()
+        result = self._tiers[-1].classify(text=text, category=category)
+        self._accept(len(self._tiers) - 1, 1.0, time.perf_counter() - start)
+        return result
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Classifies many texts tier by tier: each tier gets the texts the
+        previous one wasn't confident about, as one batch.
+        """
+        results: List[Optional[BaseModel]] = [None] * len(texts)
+        pending = list(range(len(texts)))
+        for tier, classifier in enumerate(self._tiers[:-1]):
+            if not pending:
+                return results
+            start = time.perf_counter()
+            answers = classifier.classify_many_with_confidence(
+                texts=[texts[index] for index in pending], category=category
+            )
+            latency = (time.perf_counter() - start) / len(pending)
+            escalated = []
+            for index, (result, confidence) in zip(pending, answers):
+                if self._accept(tier, confidence, latency):
+                    results[index] = result
+                else:
+                    escalated.append(index)
+            pending = escalated
+        if pending:
+            start = time.perf_counter()
+            answers = classify_many(
+                self._tiers[-1], texts=[texts[index] for index in pending], category=category
+            )
+            latency = (time.perf_counter() - start) / len(pending)
+            for index, result in zip(pending, answers):
+                self._accept(len(self._tiers) - 1, 1.0, latency)
+                results[index] = result
+        return results
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`."""
+        for tier, classifier in enumerate(self._tiers[:-1]):
+            start = time.perf_counter()
+            result, confidence = await classifier.aclassify_with_confidence(text=text, category=category)
+            if self._accept(tier, confidence, time.perf_counter() - start):
+                return result
+        start = time.perf_counter()
+        result = await self._tiers[-1].aclassify(text=text, category=category)
+        self._accept(len(self._tiers) - 1, 1.0, time.perf_counter() - start)
+        return result
+
+    def _accept(self, tier: int, confidence: float, latency: float) -> bool:
+        """Records a tier's call and returns whether its result is accepted."""
+        stats = self.stats[tier]
+        accepted = tier == len(self._tiers) - 1 or confidence >= self._thresholds[tier]
+        with self._lock:
+            stats.calls += 1
+            stats.latency.observe(latency)
+            if not accepted:
+                stats.escalations += 1
+        if not accepted and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Escalating classification to the next tier",
+                extra={"model": stats.model, "confidence": confidence},
+            )
+        return accepted
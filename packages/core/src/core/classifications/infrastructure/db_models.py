@@ -0,0 +1,98 @@
+"""
+The SQLite schema of the Classification bounded context.
+
+Each classification is one row of the `classifications` table. The category
+is stored as the JSON dump of `ClassificationCategory`, so the table doesn't
+change when the category model grows new fields; its `category` field is
+exposed as an indexed generated column for filtering. The SQL statements are
+module constants: sqlite3 caches prepared statements per connection by their
+SQL text, so reusing the same strings means every statement is compiled once.
+"""
+import functools
+from typing import Tuple
+
+from core.classifications.domain.models import (
+    Classification,
+    ClassificationCategory,
+    ClassificationCreate,
+)
+
+SCHEMA = (
+    # AUTOINCREMENT never reuses the IDs of deleted rows, like the in-memory repository.
+    "CREATE TABLE IF NOT EXISTS classifications ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "call_id TEXT NOT NULL, "
+    "classification_category TEXT NOT NULL, "
+    # A VIRTUAL column takes no space in the table; its values are only stored in the index.
+    "category TEXT GENERATED ALWAYS AS (json_extract(classification_category, '$.category')) VIRTUAL)",
+    "CREATE INDEX IF NOT EXISTS ix_classifications_call_id ON classifications (call_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_classifications_category ON classifications (category, id)",
+)
+
+INSERT_CLASSIFICATION = "INSERT INTO classifications (call_id, classification_category) VALUES (?, ?)"
+INSERT_CLASSIFICATION_WITH_ID = (
+    "INSERT OR REPLACE INTO classifications (id, call_id, classification_category) VALUES (?, ?, ?)"
+)
+# IDs are reserved ahead of the writes by advancing the AUTOINCREMENT sequence.
+SELECT_CLASSIFICATIONS_SEQUENCE = "SELECT seq FROM sqlite_sequence WHERE name = 'classifications'"
+INSERT_CLASSIFICATIONS_SEQUENCE = "INSERT INTO sqlite_sequence (name, seq) VALUES ('classifications', ?)"
+UPDATE_CLASSIFICATIONS_SEQUENCE = "UPDATE sqlite_sequence SET seq = ? WHERE name = 'classifications'"
+SELECT_CLASSIFICATION_BY_ID = "SELECT id, call_id, classification_category FROM classifications WHERE id = ?"
+SELECT_CLASSIFICATIONS_BY_CALL_ID = (
+    "SELECT id, call_id, classification_category FROM classifications WHERE call_id = ? ORDER BY id"
+)
+UPDATE_CLASSIFICATION = "UPDATE classifications SET call_id = ?, classification_category = ? WHERE id = ?"
+DELETE_CLASSIFICATION = "DELETE FROM classifications WHERE id = ?"
+
+ClassificationRow = Tuple[int, str, str]
+
+# Bulk statements bind at most this many IDs, well under SQLite's variable limit.
+MAX_IDS_PER_STATEMENT = 500
+
+
+@functools.lru_cache(maxsize=64)
+def select_classifications_by_ids(count: int) -> str:
+    """The SELECT of `count` classifications by ID; cached so equal batch sizes share a statement."""
+    return (
+        "SELECT id, call_id, classification_category FROM classifications "
+        f"WHERE id IN ({', '.join('?' * count)})"
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def delete_classifications_by_ids(count: int) -> str:
+    """The DELETE of `count` classifications by ID."""
+    return f"DELETE FROM classifications WHERE id IN ({', '.join('?' * count)})"
+
+
+@functools.lru_cache(maxsize=None)
+def select_classifications_page(by_call_id: bool, by_category: bool) -> str:
+    """
+    The keyset page query: rows past an ID cursor, in ID order, optionally of
+    one call and/or one category, served by the `(call_id, id)` and
+    `(category, id)` indexes.
+    """
+    conditions = ["id > ?"]
+    if by_call_id:
+        conditions.append("call_id = ?")
+    if by_category:
+        conditions.append("category = ?")
+    return (
+        "SELECT id, call_id, classification_category FROM classifications "
+        f"WHERE {' AND '.join(conditions)} ORDER BY id LIMIT ?"
+    )
+
+
+def to_row(data: ClassificationCreate) -> Tuple[str, str]:
+    """Maps a classification to the `(call_id, classification_category)` columns."""
+    return data.call_id, data.classification_category.model_dump_json()
+
+
+def from_row(row: ClassificationRow) -> Classification:
+    """Maps an `(id, call_id, classification_category)` row to a classification."""
+    id, call_id, category_json = row
+    return Classification(
+        id=id,
+        call_id=call_id,
+        classification_category=ClassificationCategory.model_validate_json(category_json),
+    )
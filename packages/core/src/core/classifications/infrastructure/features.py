@@ -0,0 +1,87 @@
+"""
+Hashed n-gram features for local text models.
+
+Texts are tokenized into lowercase words, and every word n-gram is mapped
+into a fixed number of buckets with CRC-32. This is the "hashing trick": no
+vocabulary has to be fitted or stored, and unseen words still land in a
+bucket. A batch is returned in a sparse, flattened layout so that linear
+models can score all texts with a few vectorized NumPy calls.
+"""
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class HashedFeatures:
+    """
+    A batch of sparse, L2-normalized feature vectors.
+
+    Entry `k` of `indices`/`values` belongs to text `rows[k]`, so the feature
+    matrix is `X[rows, indices] = values` with shape `(n_texts, n_features)`.
+    """
+    rows: np.ndarray
+    indices: np.ndarray
+    values: np.ndarray
+    n_texts: int
+    n_features: int
+
+
+class HashingFeaturizer:
+    """Maps texts to hashed bag-of-n-gram features."""
+
+    def __init__(self, n_features: int = 2 ** 16, ngram_range: tuple[int, int] = (1, 2)):
+        if n_features < 1:
+            raise ValueError("n_features must be at least 1")
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+
+    def ngrams(self, text: str) -> list[str]:
+        """Returns the word n-grams of a text."""
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        low, high = self.ngram_range
+        return [
+            " ".join(tokens[start:start + n])
+            for n in range(low, high + 1)
+            for start in range(len(tokens) - n + 1)
+        ]
+
+    def transform(self, texts: Sequence[str]) -> HashedFeatures:
+        """
+        Featurizes a batch of texts.
+
+        Args:
+            texts (Sequence[str]): The texts to featurize.
+
+        Returns:
+            HashedFeatures: One sparse row per text, in input order.
+        """
+        rows: list[int] = []
+        indices: list[int] = []
+        counts: list[int] = []
+        for row, text in enumerate(texts):
+            buckets = Counter(
+                zlib.crc32(ngram.encode("utf-8")) % self.n_features for ngram in self.ngrams(text)
+            )
+            rows.extend([row] * len(buckets))
+            indices.extend(buckets.keys())
+            counts.extend(buckets.values())
+
+        rows_array = np.asarray(rows, dtype=np.int64)
+        values = np.asarray(counts, dtype=np.float32)
+        norms = np.sqrt(np.bincount(rows_array, weights=values * values, minlength=len(texts)))
+        if values.size:
+            values /= norms[rows_array].astype(np.float32)
+        return HashedFeatures(
+            rows=rows_array,
+            indices=np.asarray(indices, dtype=np.int64),
+            values=values,
+            n_texts=len(texts),
+            n_features=self.n_features,
+        )
@@ -1,44 +1,266 @@
-from typing import Type
+import asyncio
+import logging
+import weakref
+from typing import Iterator, List, Optional, Sequence, Tuple, Type
+import httpx
 import openai
 from pydantic import BaseModel
 from core.classifications.domain.models import Category, ClassificationCategory
-from core.classifications.domain.ports import LLMClassifier
+from core.classifications.domain.ports import ConfidenceLLMClassifier
+from core.classifications.domain.tokens import estimate_tokens
+from core.classifications.infrastructure.prompts import (
+    compile_prompt,
+    confidence_output_model,
+    response_output_text,
+)
 
-def extract_category_choices(
-    output_model: type[BaseModel], field_name: str = "category"
-) -> str:
-    category_field = output_model.model_fields[field_name]
-    category_enum = category_field.annotation
-    if hasattr(category_enum, "__members__"):
-        return ", ".join(category_enum.__members__.keys())
-    return str(category_enum)
+logger = logging.getLogger(__name__)
 
 
-class OpenAIClassifierGateway(LLMClassifier):
+def build_classification_messages(text: str, category: type[BaseModel]) -> List[dict]:
+    """Builds the system and user messages of a single-text classification request."""
+    return compile_prompt(category).messages(text)
+
+
+def split_confidence(result: BaseModel, category: Type[BaseModel]) -> Tuple[BaseModel, float]:
+    """Splits a self-reported `confidence` off a result, clamping it to [0, 1]."""
+    confidence = min(1.0, max(0.0, result.confidence))
+    return category.model_validate(result.model_dump(exclude={"confidence"})), confidence
+
+
+# The default pack limits, shared by every gateway that packs texts.
+MAX_PACK_TEXTS = 20
+MAX_PACK_TOKENS = 8_000
+
+
+def pack_texts(
+    texts: Sequence[str], max_texts: int, max_tokens: int
+) -> Iterator[Sequence[str]]:
+    """
+    Splits texts into consecutive packs of at most `max_texts` texts whose
+    estimated size stays within `max_tokens`.
+
+    A text larger than the budget on its own forms a pack by itself.
+    """
+    start, pack_tokens = 0, 0
+    for end, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if end > start and (end - start >= max_texts or pack_tokens + tokens > max_tokens):
+            yield texts[start:end]
+            start, pack_tokens = end, 0
+        pack_tokens += tokens
+    if start < len(texts):
+        yield texts[start:]
+
+
+class OpenAIClassifierGateway(ConfidenceLLMClassifier):
     """
     A concrete adapter that implements the 'CanClassify' port
     using the OpenAI API.
+
+    The client is built with `max_retries=0`: retries, backoff and
+    concurrency limits belong to `RateLimitedClassifierGateway`, which must
+    see every 429 to adapt.
     """
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        client: Optional[openai.OpenAI] = None,
+        max_pack_size: int = MAX_PACK_TEXTS,
+        max_pack_tokens: int = MAX_PACK_TOKENS,
+    ):
+        self.client = client if client is not None else openai.OpenAI(api_key=api_key, max_retries=0)
         self.model = model
+        self.max_pack_size = max_pack_size
+        self.max_pack_tokens = max_pack_tokens
 
     def classify(self, text: str, category: Type[BaseModel]) -> ClassificationCategory:
         """Uses the OpenAI API to classify the given text."""
-        print("INFRASTRUCTURE (OpenAI): Classifying text...")
-        categories_str = extract_category_choices(category)
-        response_model=category
-        messages=[
-            {
-                "role": "system",
-                "content": f"Classify the following text into one of the following categories: {categories_str}",
-            },
-            {"role": "user", "content": f"Classify this text:\n\n{text}"},
-        ]
-        response_params = {
-            "model": self.model,
-            "input": messages,
-            "text_format": response_model,
-        }
-        response = self.client.responses.parse(**response_params)
-        return response.output[0].content[0].parsed
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Classifying text with OpenAI",
+                extra={"model": self.model, "text_length": len(text)},
+            )
+        prompt = compile_prompt(category)
+        response = self.client.responses.create(
+            model=self.model,
+            input=prompt.messages(text),
+            text={"format": prompt.text_format},
+        )
+        return prompt.parse(response_output_text(response))
+
+    def classify_with_confidence(self, text: str, category: Type[BaseModel]) -> Tuple[BaseModel, float]:
+        """Uses the OpenAI API to classify the given text, asking the model to self-report its confidence."""
+        prompt = compile_prompt(confidence_output_model(category))
+        response = self.client.responses.create(
+            model=self.model,
+            input=prompt.messages(text),
+            text={"format": prompt.text_format},
+        )
+        return split_confidence(prompt.parse(response_output_text(response)), category)
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Uses the OpenAI API to classify many texts, packing several into each request.
+
+        Texts are grouped into packs of up to `max_pack_size` texts within
+        `max_pack_tokens` estimated tokens, and each pack is sent as a single
+        structured-output request. Results are returned in input order.
+        """
+        results: List[BaseModel] = []
+        for pack in pack_texts(texts, self.max_pack_size, self.max_pack_tokens):
+            results.extend(self._classify_pack(pack, category))
+        return results
+
+    def classify_many_with_confidence(
+        self, texts: Sequence[str], category: Type[BaseModel]
+    ) -> List[Tuple[BaseModel, float]]:
+        """The packed counterpart of `classify_with_confidence`; see `classify_many`."""
+        results = self.classify_many(texts=texts, category=confidence_output_model(category))
+        return [split_confidence(result, category) for result in results]
+
+    def _classify_pack(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Classifies one pack, splitting it in halves and retrying whenever the
+        model's output doesn't line up with the inputs.
+        """
+        if len(texts) == 1:
+            return [self.classify(text=texts[0], category=category)]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Classifying packed texts with OpenAI",
+                extra={"model": self.model, "pack_size": len(texts)},
+            )
+        items = self._request_pack(texts, category)
+        if items is None or [item.index for item in items] != list(range(len(texts))):
+            logger.warning(
+                "Packed classification did not line up with its inputs; splitting pack",
+                extra={"model": self.model, "pack_size": len(texts)},
+            )
+            middle = len(texts) // 2
+            return (
+                self._classify_pack(texts[:middle], category)
+                + self._classify_pack(texts[middle:], category)
+            )
+        return [category.model_validate(item.model_dump(exclude={"index"})) for item in items]
+
+    def _request_pack(self, texts: Sequence[str], category: Type[BaseModel]) -> Optional[List[BaseModel]]:
+        prompt = compile_prompt(category)
+        response = self.client.responses.create(
+            model=self.model,
+            input=prompt.batch_messages(texts),
+            text={"format": prompt.batch_text_format},
+        )
+        try:
+            output_text = response_output_text(response)
+        except ValueError:
+            # A refusal or truncation may come from a single text; splitting the pack isolates it.
+            return None
+        return prompt.parse_batch(output_text)
+
+
+class AsyncOpenAIClassifierGateway(ConfidenceLLMClassifier):
+    """
+    An asynchronous adapter that implements the 'CanClassify' port
+    using the `openai.AsyncOpenAI` client.
+
+    All requests share one pooled HTTP client with configurable connection and
+    keep-alive limits. A semaphore caps the number of requests in flight, so a
+    single event loop can drive hundreds of concurrent classifications without
+    a thread per request. The semaphore is created on first use in each event
+    loop, so the gateway can be built before any loop runs. Use `aclassify`/`aclassify_many`; the blocking
+    methods are not available on this adapter. Like `OpenAIClassifierGateway`,
+    the client it builds does not retry.
+    """
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o",
+        client: Optional[openai.AsyncOpenAI] = None,
+        timeout: float = 30.0,
+        max_concurrency: int = 100,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+    ):
+        if client is None:
+            http_client = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                timeout=timeout,
+            )
+            client = openai.AsyncOpenAI(
+                api_key=api_key, http_client=http_client, timeout=timeout, max_retries=0
+            )
+        self.client = client
+        self.model = model
+        self.timeout = timeout
+        self._max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def classify(self, text: str, category: Type[BaseModel]) -> ClassificationCategory:
+        raise TypeError("AsyncOpenAIClassifierGateway is asynchronous; use 'aclassify' instead")
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        raise TypeError("AsyncOpenAIClassifierGateway is asynchronous; use 'aclassify_many' instead")
+
+    def classify_with_confidence(self, text: str, category: Type[BaseModel]) -> Tuple[BaseModel, float]:
+        raise TypeError("AsyncOpenAIClassifierGateway is asynchronous; use 'aclassify_with_confidence' instead")
+
+    def classify_many_with_confidence(
+        self, texts: Sequence[str], category: Type[BaseModel]
+    ) -> List[Tuple[BaseModel, float]]:
+        raise TypeError("AsyncOpenAIClassifierGateway is asynchronous; use 'aclassify_with_confidence' instead")
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> ClassificationCategory:
+        """Uses the OpenAI API to classify the given text without blocking the event loop."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Classifying text with AsyncOpenAI",
+                extra={"model": self.model, "text_length": len(text)},
+            )
+        prompt = compile_prompt(category)
+        async with self._semaphore():
+            response = await self.client.responses.create(
+                model=self.model,
+                input=prompt.messages(text),
+                text={"format": prompt.text_format},
+                timeout=self.timeout,
+            )
+        return prompt.parse(response_output_text(response))
+
+    async def aclassify_with_confidence(self, text: str, category: Type[BaseModel]) -> Tuple[BaseModel, float]:
+        """The asyncio counterpart of `OpenAIClassifierGateway.classify_with_confidence`."""
+        prompt = compile_prompt(confidence_output_model(category))
+        async with self._semaphore():
+            response = await self.client.responses.create(
+                model=self.model,
+                input=prompt.messages(text),
+                text={"format": prompt.text_format},
+                timeout=self.timeout,
+            )
+        return split_confidence(prompt.parse(response_output_text(response)), category)
+
+    async def aclassify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """Classifies many texts concurrently, bounded by the gateway's concurrency cap."""
+        return list(await asyncio.gather(*(self.aclassify(text, category) for text in texts)))
+
+    async def aclose(self) -> None:
+        """Closes the pooled HTTP connections."""
+        await self.client.close()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """The in-flight cap of the running event loop, created there on first use."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        return semaphore
+
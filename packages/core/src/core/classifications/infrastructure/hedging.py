@@ -0,0 +1,257 @@
+"""
+Hedged requests to cut the tail latency of LLM classification.
+
+A few OpenAI responses are much slower than the rest, and they dominate p99.
+`HedgedClassifierGateway` tracks recent latencies. When a call is still
+pending at the window's `percentile`, it fires one identical backup request
+and returns whichever finishes first. A hedge budget caps the share of
+requests that can be hedged, which bounds the extra spend.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from core.classifications.domain.ports import LLMClassifier, classify_many
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyWindow:
+    """
+    A sliding window of the most recent latencies with a cached percentile.
+
+    The percentile is re-computed at most every `refresh_every` observations,
+    so reading it is O(1) on the hot path.
+    """
+    def __init__(self, size: int = 1_000, percentile: float = 0.95, refresh_every: int = 32):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self._samples: deque[float] = deque(maxlen=size)
+        self._percentile = percentile
+        self._refresh_every = refresh_every
+        self._since_refresh = 0
+        self._value: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+            self._since_refresh += 1
+            if self._value is None or self._since_refresh >= self._refresh_every:
+                self._refresh()
+
+    def value(self) -> Optional[float]:
+        """The current percentile, or None before the first observation."""
+        return self._value
+
+    def _refresh(self) -> None:
+        ordered = sorted(self._samples)
+        self._value = ordered[min(len(ordered) - 1, int(self._percentile * len(ordered)))]
+        self._since_refresh = 0
+
+
+class HedgedClassifierGateway(LLMClassifier):
+    """
+    A hedging decorator that implements the 'LLMClassifier' port.
+
+    After `min_samples` calls, a call still pending at the window's
+    percentile gets a backup request. The first request to succeed wins.
+    Each call adds `max_hedge_rate` to a budget of at most `max_burst`
+    hedges, and each hedge spends one, so no more than about
+    `max_hedge_rate` of all calls are hedged.
+
+    `aclassify` cancels the losing request, and every pending request if the
+    caller is cancelled. A cancelled request's time until cancellation is
+    still observed, as a lower bound of its latency, so slow requests keep
+    reaching the window. `classify` runs requests on the gateway's thread
+    pool; a blocking call can't be interrupted, so the loser runs to the end
+    and its result is discarded instead. Time spent queueing for a worker would look like
+    upstream latency and trigger more hedges, so requests only go to the
+    pool while it has a free worker: otherwise the call runs unhedged on the
+    caller's thread, and a hedge is skipped. `classify_many` forwards the
+    batch unhedged: a packed request's latency isn't comparable to the
+    window's.
+    """
+    def __init__(
+        self,
+        classifier: LLMClassifier,
+        percentile: float = 0.95,
+        window_size: int = 1_000,
+        min_samples: int = 20,
+        max_hedge_rate: float = 0.05,
+        max_burst: float = 10.0,
+        max_workers: int = 32,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self._classifier = classifier
+        self._window = LatencyWindow(size=window_size, percentile=percentile)
+        self._min_samples = min_samples
+        self._max_hedge_rate = max_hedge_rate
+        self._max_burst = max_burst
+        self._budget = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = max_workers
+        # Workers running, or reserved for, a request
+        self._busy_workers = 0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._classifier, "model", None)
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """How long a call may be pending before it's hedged, or None while warming up."""
+        if len(self._window) < self._min_samples:
+            return None
+        return self._window.value()
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Classifies the text, hedging the request if it runs into the latency tail."""
+        delay = self._admit()
+        if delay is None or not self._reserve_worker():
+            return self._timed(self._classifier.classify, text, category)
+
+        primary = self._submit(text, category)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._spend_hedge(reserve_worker=True):
+            return primary.result()
+
+        hedge = self._submit(text, category)
+        return self._first_success({primary: False, hedge: True})
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """Classifies many texts with one `classify_many` call to the wrapped classifier."""
+        return classify_many(self._classifier, texts=texts, category=category)
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`; the losing request is cancelled."""
+        delay = self._admit()
+        if delay is None:
+            return await self._atimed(text, category)
+
+        primary = asyncio.ensure_future(self._atimed(text, category))
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._spend_hedge():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._atimed(text, category))
+            attempts.append(hedge)
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._record_winner(task is hedge)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # Also reached when the caller is cancelled while we wait.
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def close(self) -> None:
+        """Shuts down the thread pool used by `classify`."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _admit(self) -> Optional[float]:
+        """Counts a call, refills the hedge budget and returns the hedge delay."""
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self._max_burst, self._budget + self._max_hedge_rate)
+        return self.hedge_delay
+
+    def _spend_hedge(self, reserve_worker: bool = False) -> bool:
+        """Takes a hedge from the budget and, if asked, a free worker to run it on."""
+        with self._lock:
+            if self._budget < 1.0:
+                return False
+            if reserve_worker:
+                if self._busy_workers >= self._max_workers:
+                    return False
+                self._busy_workers += 1
+            self._budget -= 1.0
+            self.hedged += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Hedging slow classification request", extra={"model": self.model})
+        return True
+
+    def _reserve_worker(self) -> bool:
+        with self._lock:
+            if self._busy_workers >= self._max_workers:
+                return False
+            self._busy_workers += 1
+            return True
+
+    def _release_worker(self, _: Future) -> None:
+        with self._lock:
+            self._busy_workers -= 1
+
+    def _submit(self, text: str, category: Type[BaseModel]) -> Future:
+        """Runs a request on a worker already reserved for it."""
+        future = self._get_executor().submit(self._timed, self._classifier.classify, text, category)
+        future.add_done_callback(self._release_worker)
+        return future
+
+    def _first_success(self, futures: dict[Future, bool]) -> BaseModel:
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    self._record_winner(futures[future])
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _record_winner(self, is_hedge: bool) -> None:
+        if is_hedge:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def _timed(self, classify, text: str, category: Type[BaseModel]) -> BaseModel:
+        start = self._clock()
+        result = classify(text=text, category=category)
+        self._window.observe(self._clock() - start)
+        return result
+
+    async def _atimed(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        start = self._clock()
+        try:
+            result = await self._classifier.aclassify(text=text, category=category)
+        except asyncio.CancelledError:
+            self._window.observe(self._clock() - start)
+            raise
+        self._window.observe(self._clock() - start)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="hedged-classifier"
+                )
+            return self._executor
@@ -0,0 +1,218 @@
+"""
+A local, CPU-only pre-classification stage in front of the LLM.
+
+Many transcripts are obviously one category from a handful of phrases. A
+softmax-regression model over hashed n-grams answers those in microseconds.
+Only texts it isn't confident about are delegated to the wrapped
+`LLMClassifier`.
+"""
+import logging
+import threading
+from enum import Enum
+from typing import Iterable, List, Optional, Sequence, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from core.classifications.domain.ports import LLMClassifier, classify_many
+from core.classifications.infrastructure.features import HashedFeatures, HashingFeaturizer
+
+logger = logging.getLogger(__name__)
+
+
+class SoftmaxTextModel:
+    """
+    A multinomial logistic-regression model over hashed n-gram features.
+
+    `classes` are the members of the category enum the model predicts, in
+    the order of its output columns.
+    """
+    def __init__(
+        self,
+        classes: Sequence[Enum],
+        featurizer: Optional[HashingFeaturizer] = None,
+        weights: Optional[np.ndarray] = None,
+        bias: Optional[np.ndarray] = None,
+    ):
+        if len(classes) < 2:
+            raise ValueError("A model needs at least two classes")
+        self.classes = tuple(classes)
+        self.label_type = type(self.classes[0])
+        self.featurizer = featurizer or HashingFeaturizer()
+        n_features, n_classes = self.featurizer.n_features, len(self.classes)
+        self.weights = weights if weights is not None else np.zeros((n_features, n_classes), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(n_classes, dtype=np.float32)
+
+    @classmethod
+    def train(
+        cls,
+        examples: Iterable[tuple[str, Enum]],
+        featurizer: Optional[HashingFeaturizer] = None,
+        epochs: int = 100,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4,
+    ) -> "SoftmaxTextModel":
+        """
+        Fits a model with full-batch gradient descent.
+
+        Args:
+            examples (Iterable[tuple[str, Enum]]): (text, category) pairs, e.g.
+                transcripts paired with the category the LLM assigned them.
+            featurizer (Optional[HashingFeaturizer]): The featurizer to use.
+            epochs (int): The number of gradient steps.
+            learning_rate (float): The step size.
+            l2 (float): The L2 regularization strength.
+
+        Returns:
+            SoftmaxTextModel: The fitted model.
+
+        Raises:
+            ValueError: If there are no examples.
+        """
+        examples = list(examples)
+        if not examples:
+            raise ValueError("no training examples")
+        texts, labels = zip(*examples)
+        label_type = type(labels[0])
+        model = cls(classes=list(label_type), featurizer=featurizer)
+        features = model.featurizer.transform(texts)
+        column = {label: index for index, label in enumerate(model.classes)}
+        targets = np.zeros((len(texts), len(model.classes)), dtype=np.float32)
+        targets[np.arange(len(texts)), [column[label] for label in labels]] = 1.0
+
+        for _ in range(epochs):
+            errors = (model._probabilities(features) - targets) / len(texts)
+            gradient = l2 * model.weights
+            np.add.at(gradient, features.indices, features.values[:, None] * errors[features.rows])
+            model.weights -= learning_rate * gradient
+            model.bias -= learning_rate * errors.sum(axis=0)
+        return model
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Returns the class probabilities of each text, with shape `(len(texts), len(classes))`."""
+        return self._probabilities(self.featurizer.transform(texts))
+
+    def save(self, path: str) -> None:
+        """Saves the model's parameters to a `.npz` file."""
+        np.savez(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            classes=np.array([label.value for label in self.classes]),
+            ngram_range=np.array(self.featurizer.ngram_range),
+        )
+
+    @classmethod
+    def load(cls, path: str, label_type: Type[Enum]) -> "SoftmaxTextModel":
+        """Loads a model saved with `save`, mapping its classes back onto `label_type`."""
+        with np.load(path) as data:
+            weights = data["weights"]
+            return cls(
+                classes=[label_type(value) for value in data["classes"].tolist()],
+                featurizer=HashingFeaturizer(
+                    n_features=weights.shape[0], ngram_range=tuple(data["ngram_range"].tolist())
+                ),
+                weights=weights,
+                bias=data["bias"],
+            )
+
+    def _probabilities(self, features: HashedFeatures) -> np.ndarray:
+        contributions = self.weights[features.indices] * features.values[:, None]
+        logits = np.column_stack([
+            np.bincount(features.rows, weights=contributions[:, column], minlength=features.n_texts)
+            for column in range(len(self.classes))
+        ]) + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exponentials = np.exp(logits)
+        return exponentials / exponentials.sum(axis=1, keepdims=True)
+
+
+class PreClassifierGateway(LLMClassifier):
+    """
+    A fast-path decorator that implements the 'LLMClassifier' port.
+
+    Texts the local model classifies with a probability of at least
+    `threshold` are answered locally; the rest are delegated to the wrapped
+    classifier. Output models whose `field_name` isn't the model's category
+    enum are always delegated. `bypassed` and `delegated` count the texts
+    handled by each path.
+    """
+    def __init__(
+        self,
+        classifier: LLMClassifier,
+        model: SoftmaxTextModel,
+        threshold: float = 0.9,
+        field_name: str = "category",
+    ):
+        self._classifier = classifier
+        self._model = model
+        self._threshold = threshold
+        self._field_name = field_name
+        self._lock = threading.Lock()
+        self.bypassed = 0
+        self.delegated = 0
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._classifier, "model", None)
+
+    @property
+    def bypass_rate(self) -> float:
+        """The share of texts answered without calling the wrapped classifier."""
+        total = self.bypassed + self.delegated
+        return self.bypassed / total if total else 0.0
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Classifies the text locally if confident, otherwise with the wrapped classifier."""
+        local = self._predict([text], category)[0]
+        if local is not None:
+            return local
+        return self._classifier.classify(text=text, category=category)
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """
+        Classifies all texts in one vectorized pass of the local model and
+        delegates the uncertain ones to the wrapped classifier as one batch.
+        """
+        results = self._predict(texts, category)
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            delegated = classify_many(
+                self._classifier, texts=[texts[index] for index in pending], category=category
+            )
+            for index, result in zip(pending, delegated):
+                results[index] = result
+        return results
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`; only a delegated text awaits the wrapped classifier."""
+        local = self._predict([text], category)[0]
+        if local is not None:
+            return local
+        return await self._classifier.aclassify(text=text, category=category)
+
+    def _predict(self, texts: Sequence[str], category: Type[BaseModel]) -> List[Optional[BaseModel]]:
+        """Returns the confident local results, with None for texts to delegate."""
+        field = category.model_fields.get(self._field_name)
+        if field is None or field.annotation is not self._model.label_type or not texts:
+            with self._lock:
+                self.delegated += len(texts)
+            return [None] * len(texts)
+
+        probabilities = self._model.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        confident = probabilities[np.arange(len(texts)), best] >= self._threshold
+        results: List[Optional[BaseModel]] = [
+            category(**{self._field_name: self._model.classes[label]}) if is_confident else None
+            for label, is_confident in zip(best.tolist(), confident.tolist())
+        ]
+        bypassed = int(confident.sum())
+        with self._lock:
+            self.bypassed += bypassed
+            self.delegated += len(texts) - bypassed
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Pre-classified texts locally",
+                extra={"texts": len(texts), "bypassed": bypassed},
+            )
+        return results
@@ -0,0 +1,172 @@
+"""
+Compiled prompt templates for the LLM classifier gateways.
+
+All the reflection a classification request needs is done once per
+(output model, field): reading the category choices, formatting the system
+prompts and deriving the strict JSON schema that structured outputs send as
+`text.format`. A `CompiledPrompt` is frozen, so the work left for each call
+is substituting the text. That also keeps the prompt prefix byte-identical
+across calls, which lets provider-side prompt caching apply.
+"""
+import functools
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Type
+
+from openai.lib._pydantic import to_strict_json_schema
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+SYSTEM_PROMPT_TEMPLATE = "Classify the following text into one of the following categories: {categories}"
+USER_PROMPT_TEMPLATE = "Classify this text:\n\n{text}"
+
+BATCH_SYSTEM_PROMPT_TEMPLATE = (
+    "Classify each of the following numbered texts into one of the following categories: {categories}. "
+    "Return exactly one item per text, in the same order, with the text's index."
+)
+BATCH_ITEM_TEMPLATE = "Text {index}:\n{text}"
+CONFIDENCE_DESCRIPTION = "Your confidence that the category is correct, from 0.0 (a guess) to 1.0 (certain)."
+
+_USER_PROMPT_PREFIX = USER_PROMPT_TEMPLATE.split("{text}")[0]
+
+
+def extract_category_choices(
+    output_model: type[BaseModel], field_name: str = "category"
+) -> str:
+    category_field = output_model.model_fields[field_name]
+    category_enum = category_field.annotation
+    if hasattr(category_enum, "__members__"):
+        return ", ".join(category_enum.__members__.keys())
+    return str(category_enum)
+
+
+def text_format_param(output_model: Type[BaseModel]) -> dict[str, Any]:
+    """Builds the Responses API `text.format` parameter of a structured output model."""
+    return {
+        "type": "json_schema",
+        "name": output_model.__name__,
+        "schema": to_strict_json_schema(output_model),
+        "strict": True,
+    }
+
+
+def response_output_text(response: Any) -> str:
+    """
+    Returns the text output of a Responses API result.
+
+    Raises:
+        ValueError: If the response is incomplete (e.g. it ran out of output
+            tokens) or the model refused to answer.
+    """
+    if response.status == "incomplete":
+        reason = response.incomplete_details.reason if response.incomplete_details else None
+        raise ValueError(f"The classification response is incomplete: {reason}")
+    for item in response.output:
+        if item.type != "message":
+            continue
+        for content in item.content:
+            if content.type == "refusal":
+                raise ValueError(f"The model refused to classify the text: {content.refusal}")
+    return response.output_text
+
+
+@functools.cache
+def batch_output_model(output_model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Builds (once per output model) the structured-output schema of a packed request.
+
+    Each item extends the output model with the `index` of the text it belongs
+    to, so that the response can be checked against the inputs.
+    """
+    item_model = create_model(
+        f"{output_model.__name__}Item", __base__=output_model, index=(int, ...)
+    )
+    return create_model(f"{output_model.__name__}Batch", items=(List[item_model], ...))
+
+
+@functools.cache
+def confidence_output_model(output_model: type[BaseModel]) -> type[BaseModel]:
+    """
+    Builds (once per output model) a variant of the output model that also
+    asks the model to self-report its `confidence`.
+    """
+    return create_model(
+        f"{output_model.__name__}WithConfidence",
+        __base__=output_model,
+        confidence=(float, Field(description=CONFIDENCE_DESCRIPTION)),
+    )
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """
+    The request parts that only depend on the output model.
+
+    `text_format` and `batch_text_format` are the `text.format` parameters of
+    the Responses API and are shared between calls; treat them as read-only.
+    """
+    output_model: Type[BaseModel]
+    field_name: str
+    system_prompt: str
+    batch_system_prompt: str
+    text_format: dict[str, Any]
+    batch_model: Type[BaseModel]
+    batch_text_format: dict[str, Any]
+    schema_fingerprint: str
+
+    def messages(self, text: str) -> List[dict]:
+        """Returns the system and user messages of a single-text request."""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": _USER_PROMPT_PREFIX + text},
+        ]
+
+    def batch_messages(self, texts: Sequence[str]) -> List[dict]:
+        """Returns the system and user messages of a packed request."""
+        return [
+            {"role": "system", "content": self.batch_system_prompt},
+            {
+                "role": "user",
+                "content": "\n\n".join(
+                    BATCH_ITEM_TEMPLATE.format(index=index, text=text)
+                    for index, text in enumerate(texts)
+                ),
+            },
+        ]
+
+    def parse(self, output_text: str) -> BaseModel:
+        """Validates the model's JSON output against the output model."""
+        return self.output_model.model_validate_json(output_text)
+
+    def parse_batch(self, output_text: str) -> Optional[List[BaseModel]]:
+        """Validates a packed request's output, returning None if it doesn't fit the schema."""
+        try:
+            return self.batch_model.model_validate_json(output_text).items
+        except ValidationError:
+            return None
+
+
+@functools.cache
+def compile_prompt(output_model: Type[BaseModel], field_name: str = "category") -> CompiledPrompt:
+    """
+    Compiles (once per output model and field) the prompt of a classification request.
+
+    Args:
+        output_model (Type[BaseModel]): The structured output model.
+        field_name (str): The field holding the category enum.
+
+    Returns:
+        CompiledPrompt: The frozen, shared template.
+    """
+    categories = extract_category_choices(output_model, field_name)
+    batch_model = batch_output_model(output_model)
+    text_format = text_format_param(output_model)
+    return CompiledPrompt(
+        output_model=output_model,
+        field_name=field_name,
+        system_prompt=SYSTEM_PROMPT_TEMPLATE.format(categories=categories),
+        batch_system_prompt=BATCH_SYSTEM_PROMPT_TEMPLATE.format(categories=categories),
+        text_format=text_format,
+        batch_model=batch_model,
+        batch_text_format=text_format_param(batch_model),
+        schema_fingerprint=json.dumps(text_format["schema"], sort_keys=True, separators=(",", ":")),
+    )
@@ -1,66 +1,665 @@
-from typing import Dict, List, Optional
+import bisect
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
 
-from core.classifications.domain.ports import ClassificationRepository
-from core.classifications.domain.models import Classification, ClassificationCreate
+import numpy as np
 
+from core.classifications.domain.ports import PreallocatingClassificationRepository
+from core.classifications.domain.models import (
+    Category,
+    Classification,
+    ClassificationCategory,
+    ClassificationCreate,
+)
+from core.classifications.infrastructure import db_models
 
-class InMemoryClassificationRepository(ClassificationRepository):
+
+class InMemoryClassificationRepository(PreallocatingClassificationRepository):
     """
     In-memory implementation of ClassificationRepository using a dictionary.
     This is useful for testing or simple applications without a database.
+
+    A `call_id -> ids` secondary index makes `find_by_call_id` O(1) in the
+    size of the store, a sorted list of IDs serves keyset pages, and a lock
+    makes ID allocation and mutations safe across threads.
     """
-    def __init__(self, classifications_dict: Optional[Dict[int, Classification]] = {}):
-        # Initialize with an empty dictionary to store classifications
+    def __init__(self, classifications_dict: Optional[Dict[int, Classification]] = None):
         # Key: classification ID, Value: Classification object
-        self._classifications: Dict[int, Classification] = classifications_dict
-        # Auto-increment counter for ID generation
-        self._next_id: int = 1
-    
+        self._classifications: Dict[int, Classification] = (
+            classifications_dict if classifications_dict is not None else {}
+        )
+        # Key: call ID, Value: the IDs of its classifications
+        self._ids_by_call_id: Dict[str, Dict[int, None]] = {}
+        # Key: classification ID, Value: the call ID it is indexed under. Kept
+        # apart from the records, which callers may mutate before `update`.
+        self._indexed_call_ids: Dict[int, str] = {}
+        for classification in self._classifications.values():
+            self._index(classification)
+        # All IDs in ascending order, for `find_page`
+        self._sorted_ids: List[int] = sorted(self._classifications)
+        # Auto-increment counter for ID generation, past any pre-loaded IDs
+        self._next_id: int = max(self._classifications, default=0) + 1
+        self._lock = threading.RLock()
+
     def get_by_id(self, id: int) -> Optional[Classification]:
         """Retrieve a classification by its ID."""
         classification = self._classifications.get(id)
         if classification is None:
             raise ValueError(f"Classification with ID {id} not found")
         return classification
-    
+
+    def get_many(self, ids: Sequence[int]) -> List[Classification]:
+        """Retrieve many classifications by ID, in input order."""
+        with self._lock:
+            classifications = [self._classifications.get(id) for id in ids]
+        missing = [id for id, classification in zip(ids, classifications) if classification is None]
+        if missing:
+            raise ValueError(f"Classifications with IDs {missing} not found")
+        return classifications
+
     def create(self, data: ClassificationCreate) -> Classification:
         """Create a new classification with auto-generated ID."""
-        # Create a new Classification with an auto-generated ID
+        with self._lock:
+            return self._create(data)
+
+    def create_many(self, data: Sequence[ClassificationCreate]) -> List[Classification]:
+        """Create many classifications with consecutive IDs, in input order."""
+        with self._lock:
+            return [self._create(item) for item in data]
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserves `count` consecutive IDs that `create` will never assign."""
+        with self._lock:
+            reserved = range(self._next_id, self._next_id + count)
+            self._next_id += count
+        return reserved
+
+    def save_many(self, classifications: Sequence[Classification]) -> None:
+        """Stores classifications whose IDs were obtained from `reserve_ids`."""
+        with self._lock:
+            for classification in classifications:
+                if classification.id in self._classifications:
+                    self._unindex(classification.id)
+                else:
+                    bisect.insort(self._sorted_ids, classification.id)
+                self._classifications[classification.id] = classification
+                self._index(classification)
+
+    def update(self, classification: Classification) -> Classification:
+        """Update an existing classification."""
+        with self._lock:
+            self.get_by_id(classification.id)  # Ensure it exists
+            if self._indexed_call_ids[classification.id] != classification.call_id:
+                self._unindex(classification.id)
+                self._index(classification)
+            self._classifications[classification.id] = classification
+        return classification
+
+    def delete(self, id: int) -> None:
+        """Delete a classification by ID."""
+        with self._lock:
+            del self._classifications[id]
+            self._unindex(id)
+            del self._sorted_ids[bisect.bisect_left(self._sorted_ids, id)]
+
+    def delete_many(self, ids: Sequence[int]) -> None:
+        """Delete many classifications by ID; nothing is deleted if any ID is missing."""
+        with self._lock:
+            unique_ids = list(dict.fromkeys(ids))
+            missing = [id for id in unique_ids if id not in self._classifications]
+            if missing:
+                raise ValueError(f"Classifications with IDs {missing} not found")
+            for id in unique_ids:
+                self.delete(id)
+
+    def find_by_call_id(self, call_id: str) -> List[Classification]:
+        """Find all classifications for a specific call ID."""
+        with self._lock:
+            ids = self._ids_by_call_id.get(call_id)
+            # Records saved with reserved IDs can be indexed out of ID order.
+            classifications = [self._classifications[id] for id in sorted(ids)] if ids else []
+
+        if classifications == []:
+            raise ValueError(f"No classifications found for call ID {call_id}")
+        return classifications
+
+    def find_page(
+        self,
+        after_id: int = 0,
+        limit: int = 1_000,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+    ) -> List[Classification]:
+        """Find up to `limit` classifications with an ID above `after_id`, in ID order."""
+        with self._lock:
+            ids = sorted(self._ids_by_call_id.get(call_id, ())) if call_id is not None else self._sorted_ids
+            page = []
+            for index in range(bisect.bisect_right(ids, after_id), len(ids)):
+                if len(page) == limit:
+                    break
+                classification = self._classifications[ids[index]]
+                if category is None or classification.classification_category.category == category:
+                    page.append(classification)
+        return page
+
+    def _create(self, data: ClassificationCreate) -> Classification:
         classification = Classification(
             id=self._next_id,
             call_id=data.call_id,
             classification_category=data.classification_category,
         )
-        
-        # Store in the dictionary
-        self._classifications[classification.id] = classification
-        
-        # Increment ID counter for next creation
         self._next_id += 1
-        
+        self._classifications[classification.id] = classification
+        self._index(classification)
+        # `_next_id` is past every reserved ID, so a created ID is the largest yet.
+        self._sorted_ids.append(classification.id)
         return classification
-    
+
+    def _index(self, classification: Classification) -> None:
+        self._ids_by_call_id.setdefault(classification.call_id, {})[classification.id] = None
+        self._indexed_call_ids[classification.id] = classification.call_id
+
+    def _unindex(self, id: int) -> None:
+        call_id = self._indexed_call_ids.pop(id)
+        ids = self._ids_by_call_id[call_id]
+        del ids[id]
+        if not ids:
+            del self._ids_by_call_id[call_id]
+
+
+class ColumnarClassificationRepository(PreallocatingClassificationRepository):
+    """
+    A compact in-memory implementation of ClassificationRepository that keeps
+    records in columnar numpy arrays instead of one Pydantic object each.
+
+    Per record it stores an int64 ID, the uint8 code of its `Category`, the
+    int32 code of its interned call ID, an int64 link to the next record of
+    the same call and a liveness flag. Each distinct call ID is stored once.
+    `Classification` objects are built on read, so the records returned are
+    copies: changes only reach the store through `update`.
+
+    Records are appended in ID order, so a record's row is its ID minus one.
+    Deleted rows are kept as tombstones, and IDs are never reused.
+    """
+    _CATEGORIES = tuple(Category)
+    _CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+    # Rows scanned per vectorized step of `find_page`.
+    _SCAN_WINDOW = 65_536
+
+    def __init__(self, initial_capacity: int = 1_024):
+        self._size = 0
+        self._capacity = max(1, initial_capacity)
+        self._ids = np.zeros(self._capacity, dtype=np.int64)
+        self._category_codes = np.zeros(self._capacity, dtype=np.uint8)
+        self._call_codes = np.zeros(self._capacity, dtype=np.int32)
+        # The row of the next record with the same call ID, or -1.
+        self._next_rows = np.full(self._capacity, -1, dtype=np.int64)
+        self._live = np.zeros(self._capacity, dtype=np.bool_)
+        # Interned call IDs, and the first and last rows of each call's chain.
+        self._call_ids: List[str] = []
+        self._call_codes_by_id: Dict[str, int] = {}
+        self._first_rows = np.full(self._capacity, -1, dtype=np.int64)
+        self._last_rows = np.full(self._capacity, -1, dtype=np.int64)
+        self._lock = threading.RLock()
+
+    def get_by_id(self, id: int) -> Optional[Classification]:
+        """Retrieve a classification by its ID."""
+        with self._lock:
+            return self._materialize(self._row(id))
+
+    def get_many(self, ids: Sequence[int]) -> List[Classification]:
+        """Retrieve many classifications by ID, in input order."""
+        with self._lock:
+            rows = self._rows(ids)
+            return [self._materialize(int(row)) for row in rows]
+
+    def create(self, data: ClassificationCreate) -> Classification:
+        """Create a new classification with auto-generated ID."""
+        with self._lock:
+            return self._materialize(self._append(data))
+
+    def create_many(self, data: Sequence[ClassificationCreate]) -> List[Classification]:
+        """Create many classifications with consecutive IDs, in input order."""
+        with self._lock:
+            self._reserve(self._size + len(data))
+            return [self._materialize(self._append(item)) for item in data]
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserves `count` consecutive IDs; their rows stay tombstones until saved."""
+        with self._lock:
+            self._reserve(self._size + count)
+            reserved = range(self._size + 1, self._size + count + 1)
+            self._ids[self._size:self._size + count] = reserved
+            self._size += count
+        return reserved
+
+    def save_many(self, classifications: Sequence[Classification]) -> None:
+        """Stores classifications whose IDs were obtained from `reserve_ids`."""
+        with self._lock:
+            for classification in classifications:
+                row = classification.id - 1
+                if not 0 <= row < self._size:
+                    raise ValueError(f"Classification ID {classification.id} was not reserved")
+                if self._live[row]:
+                    self._unlink(row)
+                self._category_codes[row] = self._CATEGORY_CODES[classification.classification_category.category]
+                self._call_codes[row] = self._intern(classification.call_id)
+                self._live[row] = True
+                self._link(row)
+
     def update(self, classification: Classification) -> Classification:
         """Update an existing classification."""
-        existing_classification = self.get_by_id(classification.id)  # Ensure it exists
-        
-        # Store updated classification
-        existing_classification = classification
-        return existing_classification
-    
+        with self._lock:
+            row = self._row(classification.id)
+            call_code = self._intern(classification.call_id)
+            if call_code != self._call_codes[row]:
+                self._unlink(row)
+                self._call_codes[row] = call_code
+                self._link(row)
+            self._category_codes[row] = self._CATEGORY_CODES[classification.classification_category.category]
+        return classification
+
     def delete(self, id: int) -> None:
         """Delete a classification by ID."""
-        del self._classifications[id]
-    
+        with self._lock:
+            row = self._row(id)
+            self._unlink(row)
+            self._live[row] = False
+
+    def delete_many(self, ids: Sequence[int]) -> None:
+        """Delete many classifications by ID; nothing is deleted if any ID is missing."""
+        with self._lock:
+            self._rows(ids)  # Ensure they all exist
+            for id in dict.fromkeys(ids):
+                self.delete(id)
+
     def find_by_call_id(self, call_id: str) -> List[Classification]:
         """Find all classifications for a specific call ID."""
-        classifications = [
-            classification 
-            for classification in self._classifications.values()
-            if classification.call_id == call_id
-        ]
-    
+        with self._lock:
+            code = self._call_codes_by_id.get(call_id)
+            rows = []
+            row = self._first_rows[code] if code is not None else -1
+            while row != -1:
+                rows.append(int(row))
+                row = self._next_rows[row]
+            classifications = [self._materialize(row) for row in rows]
+
         if classifications == []:
             raise ValueError(f"No classifications found for call ID {call_id}")
         return classifications
 
+    def find_page(
+        self,
+        after_id: int = 0,
+        limit: int = 1_000,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+    ) -> List[Classification]:
+        """
+        Find up to `limit` classifications with an ID above `after_id`, in ID order.
+
+        A call's page walks its chain, from the cursor's row when it belongs
+        to the call, so paging through a call costs O(records) overall;
+        otherwise the columns are scanned in vectorized windows from the
+        cursor's row until the page is full.
+        """
+        category_code = self._CATEGORY_CODES[category] if category is not None else None
+        rows: List[int] = []
+        with self._lock:
+            if call_id is not None:
+                code = self._call_codes_by_id.get(call_id)
+                # A row's ID is the row plus one, so the cursor's row is `after_id - 1`.
+                cursor = after_id - 1
+                if code is None:
+                    row = -1
+                elif 0 <= cursor < self._size and self._live[cursor] and self._call_codes[cursor] == code:
+                    row = self._next_rows[cursor]
+                else:
+                    row = self._first_rows[code]
+                while row != -1 and len(rows) < limit:
+                    if row >= after_id and (category_code is None or self._category_codes[row] == category_code):
+                        rows.append(int(row))
+                    row = self._next_rows[row]
+            else:
+                start = max(after_id, 0)
+                while start < self._size and len(rows) < limit:
+                    stop = min(self._size, start + max(limit, self._SCAN_WINDOW))
+                    mask = self._live[start:stop]
+                    if category_code is not None:
+                        mask = mask & (self._category_codes[start:stop] == category_code)
+                    rows.extend((np.flatnonzero(mask)[:limit - len(rows)] + start).tolist())
+                    start = stop
+            return [self._materialize(row) for row in rows]
+
+    def count_by_category(self) -> Dict[Category, int]:
+        """Counts the stored classifications of each category with one vectorized scan."""
+        with self._lock:
+            live_codes = self._category_codes[:self._size][self._live[:self._size]]
+        counts = np.bincount(live_codes, minlength=len(self._CATEGORIES))
+        return {category: int(counts[code]) for code, category in enumerate(self._CATEGORIES)}
+
+    def _rows(self, ids: Sequence[int]) -> np.ndarray:
+        """The rows of the IDs, checked against the liveness flags without materializing them."""
+        rows = np.asarray(ids, dtype=np.int64) - 1
+        in_range = (rows >= 0) & (rows < self._size)
+        found = np.zeros(len(rows), dtype=np.bool_)
+        found[in_range] = self._live[rows[in_range]]
+        if not found.all():
+            missing = [int(id) for id in np.asarray(ids)[~found]]
+            raise ValueError(f"Classifications with IDs {missing} not found")
+        return rows
+
+    def _row(self, id: int) -> int:
+        row = id - 1
+        if not 0 <= row < self._size or not self._live[row]:
+            raise ValueError(f"Classification with ID {id} not found")
+        return row
+
+    def _materialize(self, row: int) -> Classification:
+        return Classification(
+            id=int(self._ids[row]),
+            call_id=self._call_ids[self._call_codes[row]],
+            classification_category=ClassificationCategory(
+                category=self._CATEGORIES[self._category_codes[row]]
+            ),
+        )
+
+    def _append(self, data: ClassificationCreate) -> int:
+        self._reserve(self._size + 1)
+        row = self._size
+        self._size += 1
+        self._ids[row] = row + 1
+        self._category_codes[row] = self._CATEGORY_CODES[data.classification_category.category]
+        self._call_codes[row] = self._intern(data.call_id)
+        self._live[row] = True
+        self._link(row)
+        return row
+
+    def _intern(self, call_id: str) -> int:
+        code = self._call_codes_by_id.get(call_id)
+        if code is None:
+            code = len(self._call_ids)
+            self._call_ids.append(call_id)
+            self._call_codes_by_id[call_id] = code
+            if code == len(self._first_rows):
+                self._first_rows = _grown(self._first_rows, 2 * code, fill=-1)
+                self._last_rows = _grown(self._last_rows, 2 * code, fill=-1)
+        return code
+
+    def _link(self, row: int) -> None:
+        """Adds a row to its call's chain, which is kept in ID order."""
+        code = self._call_codes[row]
+        last = self._last_rows[code]
+        self._next_rows[row] = -1
+        if last == -1:
+            self._first_rows[code] = row
+            self._last_rows[code] = row
+        elif last < row:
+            self._next_rows[last] = row
+            self._last_rows[code] = row
+        else:
+            # Re-linked by `update`: insert the row where its ID belongs.
+            previous, current = -1, self._first_rows[code]
+            while current < row:
+                previous, current = current, self._next_rows[current]
+            self._next_rows[row] = current
+            if previous == -1:
+                self._first_rows[code] = row
+            else:
+                self._next_rows[previous] = row
+
+    def _unlink(self, row: int) -> None:
+        code = self._call_codes[row]
+        previous, current = -1, self._first_rows[code]
+        while current != row:
+            previous, current = current, self._next_rows[current]
+        following = self._next_rows[row]
+        if previous == -1:
+            self._first_rows[code] = following
+        else:
+            self._next_rows[previous] = following
+        if self._last_rows[code] == row:
+            self._last_rows[code] = previous
+
+    def _reserve(self, size: int) -> None:
+        """Grows every per-record column geometrically to hold at least `size` rows."""
+        if size <= self._capacity:
+            return
+        self._capacity = max(size, 2 * self._capacity)
+        self._ids = _grown(self._ids, self._capacity)
+        self._category_codes = _grown(self._category_codes, self._capacity)
+        self._call_codes = _grown(self._call_codes, self._capacity)
+        self._next_rows = _grown(self._next_rows, self._capacity, fill=-1)
+        self._live = _grown(self._live, self._capacity)
+
+
+def _grown(array: np.ndarray, capacity: int, fill: int = 0) -> np.ndarray:
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class _ThreadConnection:
+    """Holds a thread's connection, so that the connection can be closed when the holder is dropped."""
+    __slots__ = ("connection", "__weakref__")
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+
+class SQLiteClassificationRepository(PreallocatingClassificationRepository):
+    """
+    A durable implementation of ClassificationRepository, backed by SQLite.
+
+    The database runs in WAL mode, so readers never block the writer or each
+    other. Each thread gets its own connection, which lets reads run
+    concurrently and is closed when the thread exits. Writes are serialized by a lock and run in `BEGIN IMMEDIATE`
+    transactions, so writers queue up in-process instead of spinning on
+    SQLite's busy handler. `create_many` inserts a whole batch in a single
+    transaction, which pays the commit's fsync once per batch instead of once
+    per row.
+
+    Args:
+        path: The database file. It must be a file rather than `:memory:`,
+            because every thread opens its own connection to it.
+        busy_timeout_ms: How long a connection waits for another process's lock.
+        cache_size_kib: The page cache size of each connection.
+        mmap_size: How many bytes of the database file are memory-mapped for reads.
+    """
+    def __init__(
+        self,
+        path: str,
+        busy_timeout_ms: int = 5_000,
+        cache_size_kib: int = 16_384,
+        mmap_size: int = 256 * 1024 * 1024,
+    ):
+        if path == ":memory:":
+            raise ValueError("SQLiteClassificationRepository needs a database file, not ':memory:'")
+        self._path = path
+        self._pragmas = (
+            "PRAGMA journal_mode = WAL",
+            # With WAL, NORMAL only syncs at checkpoints and is still safe against corruption.
+            "PRAGMA synchronous = NORMAL",
+            f"PRAGMA busy_timeout = {int(busy_timeout_ms)}",
+            f"PRAGMA cache_size = -{int(cache_size_kib)}",
+            f"PRAGMA mmap_size = {int(mmap_size)}",
+            "PRAGMA temp_store = MEMORY",
+        )
+        self._local = threading.local()
+        # One finalizer per thread connection; it closes the connection when
+        # the thread exits, or when `close` calls it.
+        self._connections: List[weakref.finalize] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        with self._transaction() as connection:
+            for statement in db_models.SCHEMA:
+                connection.execute(statement)
+
+    def get_by_id(self, id: int) -> Optional[Classification]:
+        """Retrieve a classification by its ID."""
+        row = self._connection().execute(db_models.SELECT_CLASSIFICATION_BY_ID, (id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Classification with ID {id} not found")
+        return db_models.from_row(row)
+
+    def get_many(self, ids: Sequence[int]) -> List[Classification]:
+        """Retrieve many classifications by ID, in input order."""
+        connection = self._connection()
+        found: Dict[int, Classification] = {}
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), db_models.MAX_IDS_PER_STATEMENT):
+            chunk = unique_ids[start:start + db_models.MAX_IDS_PER_STATEMENT]
+            rows = connection.execute(db_models.select_classifications_by_ids(len(chunk)), chunk)
+            found.update((row[0], db_models.from_row(row)) for row in rows)
+        missing = [id for id in unique_ids if id not in found]
+        if missing:
+            raise ValueError(f"Classifications with IDs {missing} not found")
+        return [found[id] for id in ids]
+
+    def create(self, data: ClassificationCreate) -> Classification:
+        """Create a new classification with auto-generated ID."""
+        with self._transaction() as connection:
+            cursor = connection.execute(db_models.INSERT_CLASSIFICATION, db_models.to_row(data))
+        return Classification(
+            id=cursor.lastrowid,
+            call_id=data.call_id,
+            classification_category=data.classification_category,
+        )
+
+    def create_many(self, data: Sequence[ClassificationCreate]) -> List[Classification]:
+        """Create many classifications in a single transaction, in input order."""
+        if not data:
+            return []
+        with self._transaction() as connection:
+            connection.executemany(db_models.INSERT_CLASSIFICATION, [db_models.to_row(item) for item in data])
+            # The write lock and the IMMEDIATE transaction make this the only
+            # writer, so AUTOINCREMENT hands the batch consecutive IDs.
+            (last_id,) = connection.execute("SELECT last_insert_rowid()").fetchone()
+        first_id = last_id - len(data) + 1
+        return [
+            Classification(
+                id=first_id + offset,
+                call_id=item.call_id,
+                classification_category=item.classification_category,
+            )
+            for offset, item in enumerate(data)
+        ]
+
+    def reserve_ids(self, count: int) -> range:
+        """Reserves `count` consecutive IDs by advancing the AUTOINCREMENT sequence."""
+        with self._transaction() as connection:
+            row = connection.execute(db_models.SELECT_CLASSIFICATIONS_SEQUENCE).fetchone()
+            if row is None:
+                last_id = 0
+                connection.execute(db_models.INSERT_CLASSIFICATIONS_SEQUENCE, (count,))
+            else:
+                (last_id,) = row
+                connection.execute(db_models.UPDATE_CLASSIFICATIONS_SEQUENCE, (last_id + count,))
+        return range(last_id + 1, last_id + count + 1)
+
+    def save_many(self, classifications: Sequence[Classification]) -> None:
+        """Stores classifications whose IDs were obtained from `reserve_ids`, in one transaction."""
+        if not classifications:
+            return
+        with self._transaction() as connection:
+            connection.executemany(
+                db_models.INSERT_CLASSIFICATION_WITH_ID,
+                [(classification.id, *db_models.to_row(classification)) for classification in classifications],
+            )
+
+    def update(self, classification: Classification) -> Classification:
+        """Update an existing classification."""
+        call_id, category_json = db_models.to_row(classification)
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                db_models.UPDATE_CLASSIFICATION, (call_id, category_json, classification.id)
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Classification with ID {classification.id} not found")
+        return classification
+
+    def delete(self, id: int) -> None:
+        """Delete a classification by ID."""
+        with self._transaction() as connection:
+            cursor = connection.execute(db_models.DELETE_CLASSIFICATION, (id,))
+        if cursor.rowcount == 0:
+            raise ValueError(f"Classification with ID {id} not found")
+
+    def delete_many(self, ids: Sequence[int]) -> None:
+        """Delete many classifications by ID in one transaction; nothing is deleted if any ID is missing."""
+        unique_ids = list(dict.fromkeys(ids))
+        with self._transaction() as connection:
+            deleted = 0
+            for start in range(0, len(unique_ids), db_models.MAX_IDS_PER_STATEMENT):
+                chunk = unique_ids[start:start + db_models.MAX_IDS_PER_STATEMENT]
+                deleted += connection.execute(db_models.delete_classifications_by_ids(len(chunk)), chunk).rowcount
+            if deleted != len(unique_ids):
+                # Raising inside the transaction rolls the deletes back.
+                raise ValueError(f"{len(unique_ids) - deleted} of the classification IDs were not found")
+
+    def find_by_call_id(self, call_id: str) -> List[Classification]:
+        """Find all classifications for a specific call ID."""
+        rows = self._connection().execute(db_models.SELECT_CLASSIFICATIONS_BY_CALL_ID, (call_id,)).fetchall()
+        if not rows:
+            raise ValueError(f"No classifications found for call ID {call_id}")
+        return [db_models.from_row(row) for row in rows]
+
+    def find_page(
+        self,
+        after_id: int = 0,
+        limit: int = 1_000,
+        call_id: Optional[str] = None,
+        category: Optional[Category] = None,
+    ) -> List[Classification]:
+        """Find up to `limit` classifications with an ID above `after_id`, in ID order."""
+        parameters: List[object] = [after_id]
+        if call_id is not None:
+            parameters.append(call_id)
+        if category is not None:
+            parameters.append(category.value)
+        parameters.append(limit)
+        statement = db_models.select_classifications_page(call_id is not None, category is not None)
+        rows = self._connection().execute(statement, parameters).fetchall()
+        return [db_models.from_row(row) for row in rows]
+
+    def close(self) -> None:
+        """Closes the connections of every thread."""
+        with self._connections_lock:
+            for finalizer in self._connections:
+                finalizer()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the calling thread's connection, opening it on first use."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            # Autocommit mode: transactions are opened explicitly by `_transaction`.
+            # `check_same_thread` is off only so that `close` can run on any thread.
+            connection = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False)
+            for pragma in self._pragmas:
+                connection.execute(pragma)
+            # The holder lives in the thread-local, which is dropped when the
+            # thread exits, so the connection is closed with it.
+            holder = _ThreadConnection(connection)
+            finalizer = weakref.finalize(holder, connection.close)
+            with self._connections_lock:
+                self._connections = [alive for alive in self._connections if alive.alive]
+                self._connections.append(finalizer)
+            self._local.holder = holder
+        return holder.connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        with self._write_lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
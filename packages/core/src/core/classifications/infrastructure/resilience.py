@@ -0,0 +1,412 @@
+"""
+Client-side flow control for LLM classifier gateways.
+
+Rather than letting the provider reject bursts with 429s, requests are shaped
+before they leave the process:
+
+- `RateLimiter` is a pair of token buckets for requests per minute and tokens
+  per minute, charged with an estimate of each prompt.
+- `AIMDConcurrencyLimiter` adapts the number of requests in flight: additive
+  increase while latency is healthy, multiplicative decrease on 429s or slow
+  responses.
+- `RateLimitedClassifierGateway` combines both around any `LLMClassifier`
+  and retries 429s with jittered exponential backoff that honours `Retry-After`.
+
+Each primitive serves both threaded (`acquire`) and asyncio (`acquire_async`)
+callers from the same state.
+"""
+import asyncio
+import functools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional, Sequence, Type, TypeVar
+
+import openai
+from pydantic import BaseModel
+
+from core.classifications.domain.ports import LLMClassifier, classify_many
+from core.classifications.domain.tokens import estimate_tokens
+from core.classifications.infrastructure.gateways import (
+    MAX_PACK_TEXTS,
+    MAX_PACK_TOKENS,
+    build_classification_messages,
+    pack_texts,
+)
+from core.classifications.infrastructure.prompts import compile_prompt
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_request_tokens(text: str, category: Type[BaseModel], output_tokens: int = 16) -> int:
+    """
+    Estimates the tokens a classification request is charged for: the prompt
+    built by the gateway plus an allowance for the structured output.
+    """
+    messages = build_classification_messages(text, category)
+    return sum(estimate_tokens(message["content"]) for message in messages) + output_tokens
+
+
+def estimate_pack_tokens(texts: Sequence[str], category: Type[BaseModel], output_tokens: int = 16) -> int:
+    """The packed-request counterpart of `estimate_request_tokens`, with an output allowance per text."""
+    messages = compile_prompt(category).batch_messages(texts)
+    return sum(estimate_tokens(message["content"]) for message in messages) + output_tokens * len(texts)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Extracts the server-requested delay from an OpenAI error, if any.
+
+    Honours OpenAI's `retry-after-ms` header as well as the standard
+    `Retry-After` header, in either delta-seconds or HTTP-date form.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    if (value := headers.get("retry-after-ms")) is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    if (value := headers.get("retry-after")) is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[float] = None,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """
+    Computes a "full jitter" exponential backoff delay.
+
+    Args:
+        attempt (int): The zero-based retry attempt.
+        base_delay (float): The delay ceiling of the first retry, in seconds.
+        max_delay (float): The upper bound of any delay, in seconds.
+        retry_after (Optional[float]): A server-requested delay; never wait less.
+        rng (Callable[[], float]): A source of uniform numbers in [0, 1).
+
+    Returns:
+        float: The number of seconds to wait before retrying.
+    """
+    delay = rng() * min(max_delay, base_delay * (2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations instead of blocking.
+
+    `reserve` always succeeds and returns how long the caller must wait for
+    the reservation to be covered. The bucket may go into debt, which keeps
+    concurrent callers queued fairly without a background refill thread.
+    Not thread-safe on its own; `RateLimiter` serialises access.
+    """
+    def __init__(self, capacity: float, refill_per_second: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Takes `amount` tokens and returns the seconds until they are available."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+        # A request larger than the bucket could never be served; charge a full bucket.
+        self._tokens -= min(amount, self.capacity)
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.refill_per_second
+
+
+class RateLimiter:
+    """A limiter that enforces requests-per-minute and tokens-per-minute quotas together."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60, clock)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60, clock)
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Reserves one request and `tokens` tokens; returns the seconds to wait."""
+        with self._lock:
+            return max(self._requests.reserve(1), self._tokens.reserve(tokens))
+
+    def acquire(self, tokens: int, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Blocks the calling thread until the request fits within both quotas."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            sleep(delay)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """Suspends the calling task until the request fits within both quotas."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AIMDConcurrencyLimiter:
+    """
+    A concurrency gate whose limit follows an AIMD (additive increase,
+    multiplicative decrease) control law.
+
+    Every successful request below `latency_target` grows the limit by
+    `1 / limit`, i.e. by about one per full window of requests. A 429 shrinks
+    it by `rate_limited_factor`, and a response slower than the target shrinks
+    it by `slow_factor`.
+
+    A burst of 429s from one window of requests cuts the limit only once:
+    `acquire` hands out the number of decreases so far as a ticket, and a 429
+    reported with a ticket older than the last decrease is ignored, since
+    that request was admitted under the old limit.
+    """
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        latency_target: float = 5.0,
+        rate_limited_factor: float = 0.5,
+        slow_factor: float = 0.9,
+    ):
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_target = latency_target
+        self._rate_limited_factor = rate_limited_factor
+        self._slow_factor = slow_factor
+        self._in_flight = 0
+        self._decreases = 0
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return max(self._min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> int:
+        """
+        Blocks the calling thread until a slot is free and takes it.
+
+        Returns:
+            The ticket to pass to `on_rate_limited` if the request gets a 429.
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            return self._decreases
+
+    async def acquire_async(self) -> int:
+        """Suspends the calling task until a slot is free and takes it; see `acquire`."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return self._decreases
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    try:
+                        self._async_waiters.remove((loop, waiter))
+                    except ValueError:
+                        # `_wake` already picked this waiter; pass the wake-up on.
+                        self._wake()
+                raise
+
+    def release(self) -> None:
+        """Gives a slot back and wakes up a waiter."""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake()
+
+    def on_success(self, latency: float) -> None:
+        """Feeds back the latency of a successful request."""
+        with self._lock:
+            if latency > self._latency_target:
+                self._limit = max(self._min_limit, self._limit * self._slow_factor)
+            else:
+                self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+                self._wake()
+
+    def on_rate_limited(self, ticket: Optional[int] = None) -> None:
+        """
+        Feeds back a 429 from the provider.
+
+        Args:
+            ticket: What `acquire` returned for the rejected request. If the
+                limit was cut since, the 429 is ignored. Without a ticket,
+                every 429 cuts the limit.
+        """
+        with self._lock:
+            if ticket is not None and ticket != self._decreases:
+                return
+            self._decreases += 1
+            self._limit = max(self._min_limit, self._limit * self._rate_limited_factor)
+
+    def _wake(self) -> None:
+        # Called with the lock held. Woken waiters re-check the limit themselves.
+        self._condition.notify()
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            if not waiter.done():
+                loop.call_soon_threadsafe(_resolve, waiter)
+                break
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RateLimitedClassifierGateway(LLMClassifier):
+    """
+    A flow-control decorator that implements the 'LLMClassifier' port.
+
+    Each call first waits for quota from the `RateLimiter`, charged with the
+    estimated prompt size, then for a slot from the `AIMDConcurrencyLimiter`.
+    429s shrink the concurrency limit and are retried up to `max_retries`
+    times with jittered exponential backoff, never sooner than `Retry-After`.
+
+    `classify_many` splits the texts into the packs the OpenAI gateway sends
+    as single requests (`max_pack_size` texts within `max_pack_tokens`) and
+    forwards each pack as one `classify_many` call that takes one permit.
+    """
+    def __init__(
+        self,
+        classifier: LLMClassifier,
+        rate_limiter: RateLimiter,
+        concurrency_limiter: Optional[AIMDConcurrencyLimiter] = None,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        rng: Callable[[], float] = random.random,
+        sleep: Callable[[float], None] = time.sleep,
+        max_pack_size: int = MAX_PACK_TEXTS,
+        max_pack_tokens: int = MAX_PACK_TOKENS,
+    ):
+        self._classifier = classifier
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter or AIMDConcurrencyLimiter()
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._rng = rng
+        self._sleep = sleep
+        self._max_pack_size = max_pack_size
+        self._max_pack_tokens = max_pack_tokens
+        self.rate_limited = 0
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._classifier, "model", None)
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self._concurrency_limiter.limit
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Classifies the text within the configured quotas, retrying 429s."""
+        return self._call(
+            functools.partial(self._classifier.classify, text=text, category=category),
+            estimate_request_tokens(text, category),
+        )
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """Classifies many texts within the configured quotas, one permit per pack."""
+        results: List[BaseModel] = []
+        for pack in pack_texts(texts, self._max_pack_size, self._max_pack_tokens):
+            if len(pack) == 1:
+                results.append(self.classify(text=pack[0], category=category))
+                continue
+            results.extend(self._call(
+                functools.partial(classify_many, self._classifier, texts=pack, category=category),
+                estimate_pack_tokens(pack, category),
+            ))
+        return results
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`."""
+        tokens = estimate_request_tokens(text, category)
+        for attempt in range(self._max_retries + 1):
+            await self._rate_limiter.acquire_async(tokens)
+            ticket = await self._concurrency_limiter.acquire_async()
+            start = time.perf_counter()
+            try:
+                result = await self._classifier.aclassify(text=text, category=category)
+            except openai.RateLimitError as exc:
+                delay = self._on_rate_limited(exc, attempt, ticket)
+            else:
+                self._concurrency_limiter.on_success(time.perf_counter() - start)
+                return result
+            finally:
+                self._concurrency_limiter.release()
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _call(self, request: Callable[[], T], tokens: int) -> T:
+        """Sends one request within the quotas, retrying 429s."""
+        for attempt in range(self._max_retries + 1):
+            self._rate_limiter.acquire(tokens, sleep=self._sleep)
+            ticket = self._concurrency_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                result = request()
+            except openai.RateLimitError as exc:
+                delay = self._on_rate_limited(exc, attempt, ticket)
+            else:
+                self._concurrency_limiter.on_success(time.perf_counter() - start)
+                return result
+            finally:
+                self._concurrency_limiter.release()
+            self._sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _on_rate_limited(self, exc: openai.RateLimitError, attempt: int, ticket: int) -> float:
+        """Records a 429 and returns the backoff delay, re-raising once retries are exhausted."""
+        self.rate_limited += 1
+        self._concurrency_limiter.on_rate_limited(ticket)
+        if attempt >= self._max_retries:
+            raise exc
+        delay = backoff_delay(
+            attempt, self._base_delay, self._max_delay, retry_after_seconds(exc), self._rng
+        )
+        logger.warning(
+            "Rate limited by the LLM provider; retrying",
+            extra={"attempt": attempt + 1, "delay": delay, "concurrency_limit": self.concurrency_limit},
+        )
+        return delay
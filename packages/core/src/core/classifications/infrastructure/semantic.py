@@ -0,0 +1,383 @@
+"""
+A semantic cache that serves paraphrased transcripts from past classifications.
+
+Texts are embedded by a pluggable local `TextEmbedder`, and the label of every
+classified text is stored in a `VectorIndex`. A new text whose nearest stored
+neighbour has a cosine similarity of at least the threshold gets that
+neighbour's label without calling the LLM.
+
+The index is kept in NumPy arrays, optionally memory-mapped to `.npy` files so
+it survives restarts. An exact scan of a million vectors takes tens of
+milliseconds, so lookups are narrowed with random-hyperplane LSH first. Each of
+`n_tables` tables buckets vectors by the signs of `n_bits` projections.
+Candidates are the query's buckets plus a small unindexed tail of recent
+inserts. Only the candidates are scored, in one vectorized dot product.
+Whenever the tail fills up, it is sorted and merged into the tables in linear
+time, outside the index lock, so searches keep scanning the tail meanwhile.
+"""
+import json
+import logging
+import os
+import threading
+from enum import Enum
+from typing import List, Optional, Protocol, Sequence, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from core.classifications.domain.ports import LLMClassifier, classify_many
+from core.classifications.infrastructure.features import HashingFeaturizer
+
+logger = logging.getLogger(__name__)
+
+
+class TextEmbedder(Protocol):
+    """Embeds texts as L2-normalized vectors."""
+
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Returns a `(len(texts), dim)` float32 array of unit vectors."""
+        ...
+
+
+class HashingEmbedder:
+    """
+    A deterministic, offline embedder over hashed word n-grams.
+
+    Texts that share most of their n-grams get a high cosine similarity, which
+    is enough to catch reworded boilerplate without a neural model.
+    """
+    def __init__(self, dim: int = 256, ngram_range: tuple[int, int] = (1, 2)):
+        self.dim = dim
+        self._featurizer = HashingFeaturizer(n_features=dim, ngram_range=ngram_range)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        features = self._featurizer.transform(texts)
+        vectors = np.zeros((features.n_texts, self.dim), dtype=np.float32)
+        np.add.at(vectors, (features.rows, features.indices), features.values)
+        return vectors
+
+
+def _merge_tail(
+    order: np.ndarray, starts: np.ndarray, tail_codes: np.ndarray, first_id: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges new rows into one bucket table.
+
+    A table lists row IDs grouped by bucket, bucket `b` spanning
+    `order[starts[b]:starts[b + 1]]`. The rows `first_id, first_id + 1, ...`
+    with buckets `tail_codes` are placed after the old rows of their bucket.
+    Only the tail is sorted; every old row moves by a known offset.
+    """
+    n_buckets = len(starts) - 1
+    old_counts = np.diff(starts)
+    tail_starts = np.concatenate(([0], np.cumsum(np.bincount(tail_codes, minlength=n_buckets))))
+    merged_starts = starts + tail_starts
+    merged = np.empty(len(order) + len(tail_codes), dtype=np.int32)
+    old_buckets = np.repeat(np.arange(n_buckets), old_counts)
+    merged[np.arange(len(order)) + tail_starts[old_buckets]] = order
+    tail_order = np.argsort(tail_codes, kind="stable")
+    sorted_codes = tail_codes[tail_order]
+    ranks = np.arange(len(tail_codes)) - tail_starts[sorted_codes]
+    merged[merged_starts[sorted_codes] + old_counts[sorted_codes] + ranks] = tail_order + first_id
+    return merged, merged_starts
+
+
+class VectorIndex:
+    """
+    An append-only index of unit vectors and integer labels with LSH lookups.
+
+    If `path` is given, vectors, labels and LSH codes are memory-mapped to
+    `{path}.vectors.npy`, `{path}.labels.npy` and `{path}.codes.npy`, and an
+    existing index at that path is reopened. Otherwise the index lives in
+    memory. Thread-safe.
+
+    `label_code` and `label_value` map string label values (e.g. enum values)
+    to stable integer labels. The mapping is saved to `{path}.vocabulary.json`,
+    so stored labels keep their meaning when the label set changes.
+    """
+    def __init__(
+        self,
+        dim: int,
+        path: Optional[str] = None,
+        capacity: int = 1024,
+        n_tables: int = 12,
+        n_bits: int = 14,
+        tail_size: int = 4096,
+        seed: int = 0,
+    ):
+        if not 1 <= n_bits <= 16:
+            raise ValueError("n_bits must be between 1 and 16")
+        self.dim = dim
+        self._path = path
+        self._tail_size = tail_size
+        self._lock = threading.RLock()
+        self._planes = np.random.default_rng(seed).standard_normal((dim, n_tables * n_bits)).astype(np.float32)
+        self._n_tables = n_tables
+        self._n_bits = n_bits
+        self._bit_weights = (1 << np.arange(n_bits, dtype=np.uint32)).astype(np.uint32)
+
+        if path is not None and os.path.exists(self._file("labels")):
+            self._vectors = np.load(self._file("vectors"), mmap_mode="r+")
+            self._labels = np.load(self._file("labels"), mmap_mode="r+")
+            self._codes = np.load(self._file("codes"), mmap_mode="r+")
+            if self._vectors.shape[1] != dim or self._codes.shape[1] != n_tables:
+                raise ValueError(f"Index at '{path}' was built with a different dimension or LSH layout")
+            # Rows are appended in order and unused labels are -1.
+            self._size = int(np.count_nonzero(self._labels >= 0))
+        else:
+            self._vectors, self._labels, self._codes = self._allocate(max(1, capacity))
+            self._size = 0
+        self._vocabulary: List[str] = []
+        if path is not None and os.path.exists(self._vocabulary_file()):
+            with open(self._vocabulary_file(), encoding="utf-8") as file:
+                self._vocabulary = json.load(file)
+        self._sealed = 0
+        empty_starts = np.zeros((1 << n_bits) + 1, dtype=np.int64)
+        self._order: List[np.ndarray] = [np.empty(0, dtype=np.int32)] * n_tables
+        self._starts: List[np.ndarray] = [empty_starts] * n_tables
+        self._sealing = True
+        self._seal()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def label_code(self, value: str) -> int:
+        """Returns the integer label of a label value, assigning the next free one on first use."""
+        with self._lock:
+            if value not in self._vocabulary:
+                self._vocabulary.append(value)
+                if self._path is not None:
+                    with open(self._vocabulary_file() + ".tmp", "w", encoding="utf-8") as file:
+                        json.dump(self._vocabulary, file)
+                    os.replace(self._vocabulary_file() + ".tmp", self._vocabulary_file())
+            return self._vocabulary.index(value)
+
+    def label_value(self, code: int) -> str:
+        """Returns the label value of an integer label from `label_code`."""
+        with self._lock:
+            return self._vocabulary[code]
+
+    def add(self, vectors: np.ndarray, labels: Sequence[int]) -> None:
+        """Appends unit vectors with shape `(n, dim)` and their labels."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            end = self._size + len(vectors)
+            if end > len(self._labels):
+                self._grow(end)
+            self._vectors[self._size:end] = vectors
+            self._labels[self._size:end] = labels
+            self._codes[self._size:end] = self._hash(vectors)
+            self._size = end
+            seal = not self._sealing and self._size - self._sealed >= self._tail_size
+            self._sealing = self._sealing or seal
+        if seal:
+            self._seal()
+
+    def search(self, query: np.ndarray) -> tuple[int, float]:
+        """
+        Returns the label and cosine similarity of the approximate nearest
+        neighbour of a unit vector, or `(-1, -1.0)` if nothing is close.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        codes = self._hash(query[None, :])[0]
+        with self._lock:
+            candidates = [np.arange(self._sealed, self._size)]
+            for table, code in enumerate(codes.tolist()):
+                starts = self._starts[table]
+                candidates.append(self._order[table][starts[code]:starts[code + 1]])
+            ids = np.unique(np.concatenate(candidates).astype(np.int64))
+            if ids.size == 0:
+                return -1, -1.0
+            scores = self._vectors[ids] @ query
+            best = int(scores.argmax())
+            return int(self._labels[ids[best]]), float(scores[best])
+
+    def search_exact(self, query: np.ndarray, block_size: int = 65_536) -> tuple[int, float]:
+        """Like `search`, but scans every vector in blocks. Used to measure LSH recall."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        best_id, best_score = -1, -1.0
+        with self._lock:
+            for start in range(0, self._size, block_size):
+                scores = self._vectors[start:min(start + block_size, self._size)] @ query
+                index = int(scores.argmax())
+                if scores[index] > best_score:
+                    best_id, best_score = start + index, float(scores[index])
+            return (int(self._labels[best_id]) if best_id >= 0 else -1), best_score
+
+    def flush(self) -> None:
+        """Writes memory-mapped changes to disk."""
+        with self._lock:
+            for array in (self._vectors, self._labels, self._codes):
+                if isinstance(array, np.memmap):
+                    array.flush()
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Returns the `(n, n_tables)` LSH bucket of every vector."""
+        bits = (vectors @ self._planes > 0).reshape(len(vectors), self._n_tables, self._n_bits)
+        return (bits @ self._bit_weights).astype(np.uint16)
+
+    def _seal(self) -> None:
+        """
+        Merges the tail into the bucket tables. Called by the one thread that
+        set `_sealing`; only the snapshot and the swap hold the lock.
+        """
+        try:
+            with self._lock:
+                first_id, end = self._sealed, self._size
+                tail_codes = np.array(self._codes[first_id:end])
+                orders, starts = self._order, self._starts
+            merged = [
+                _merge_tail(orders[table], starts[table], tail_codes[:, table], first_id)
+                for table in range(self._n_tables)
+            ]
+            with self._lock:
+                self._order = [order for order, _ in merged]
+                self._starts = [table_starts for _, table_starts in merged]
+                self._sealed = end
+        finally:
+            self._sealing = False
+
+    def _file(self, name: str) -> str:
+        return f"{self._path}.{name}.npy"
+
+    def _vocabulary_file(self) -> str:
+        return f"{self._path}.vocabulary.json"
+
+    def _allocate(self, capacity: int, suffix: str = "") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        shapes = {
+            "vectors": ((capacity, self.dim), np.float32),
+            "labels": ((capacity,), np.int16),
+            "codes": ((capacity, self._n_tables), np.uint16),
+        }
+        if self._path is None:
+            arrays = {name: np.zeros(shape, dtype=dtype) for name, (shape, dtype) in shapes.items()}
+        else:
+            arrays = {
+                name: np.lib.format.open_memmap(self._file(name) + suffix, mode="w+", dtype=dtype, shape=shape)
+                for name, (shape, dtype) in shapes.items()
+            }
+        arrays["labels"][:] = -1
+        return arrays["vectors"], arrays["labels"], arrays["codes"]
+
+    def _grow(self, required: int) -> None:
+        """Doubles the capacity until `required` rows fit, copying existing rows."""
+        capacity = len(self._labels)
+        while capacity < required:
+            capacity *= 2
+        vectors, labels, codes = self._allocate(capacity, suffix=".tmp")
+        vectors[:self._size] = self._vectors[:self._size]
+        labels[:self._size] = self._labels[:self._size]
+        codes[:self._size] = self._codes[:self._size]
+        if self._path is not None:
+            for name, array in (("vectors", vectors), ("labels", labels), ("codes", codes)):
+                array.flush()
+                os.replace(self._file(name) + ".tmp", self._file(name))
+        self._vectors, self._labels, self._codes = vectors, labels, codes
+
+
+class SemanticCacheGateway(LLMClassifier):
+    """
+    A near-duplicate caching decorator that implements the 'LLMClassifier' port.
+
+    The index stores members of `label_type` by value, through its label
+    vocabulary, so reordering or extending the enum doesn't change what
+    stored labels mean. Misses are classified by the wrapped classifier and
+    added to the index. Output models whose
+    `field_name` isn't of `label_type` are always delegated. Hit and miss
+    counters are exposed as attributes.
+    """
+    def __init__(
+        self,
+        classifier: LLMClassifier,
+        embedder: TextEmbedder,
+        index: VectorIndex,
+        label_type: Type[Enum],
+        threshold: float = 0.95,
+        field_name: str = "category",
+    ):
+        if index.dim != embedder.dim:
+            raise ValueError("The index and embedder dimensions differ")
+        self._classifier = classifier
+        self._embedder = embedder
+        self._index = index
+        self._label_type = label_type
+        self._threshold = threshold
+        self._field_name = field_name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._classifier, "model", None)
+
+    def classify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """Returns the label of a near-duplicate text, classifying the text on a miss."""
+        if not self._caches(category):
+            return self._classifier.classify(text=text, category=category)
+        vector = self._embedder.embed([text])[0]
+        cached = self._lookup(vector, category)
+        if cached is not None:
+            return cached
+        result = self._classifier.classify(text=text, category=category)
+        self._remember([vector], [result])
+        return result
+
+    def classify_many(self, texts: Sequence[str], category: Type[BaseModel]) -> List[BaseModel]:
+        """Embeds all texts at once and delegates the misses as one batch."""
+        if not self._caches(category):
+            return classify_many(self._classifier, texts=texts, category=category)
+        vectors = self._embedder.embed(texts)
+        results = [self._lookup(vector, category) for vector in vectors]
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            delegated = classify_many(
+                self._classifier, texts=[texts[index] for index in pending], category=category
+            )
+            for index, result in zip(pending, delegated):
+                results[index] = result
+            self._remember(vectors[pending], delegated)
+        return results
+
+    async def aclassify(self, text: str, category: Type[BaseModel]) -> BaseModel:
+        """The asyncio counterpart of `classify`; only a miss awaits the wrapped classifier."""
+        if not self._caches(category):
+            return await self._classifier.aclassify(text=text, category=category)
+        vector = self._embedder.embed([text])[0]
+        cached = self._lookup(vector, category)
+        if cached is not None:
+            return cached
+        result = await self._classifier.aclassify(text=text, category=category)
+        self._remember([vector], [result])
+        return result
+
+    def _caches(self, category: Type[BaseModel]) -> bool:
+        field = category.model_fields.get(self._field_name)
+        return field is not None and field.annotation is self._label_type
+
+    def _lookup(self, vector: np.ndarray, category: Type[BaseModel]) -> Optional[BaseModel]:
+        label, score = self._index.search(vector)
+        value = self._label(label) if label >= 0 and score >= self._threshold else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Semantic cache hit", extra={"similarity": score})
+        return category(**{self._field_name: value})
+
+    def _label(self, label: int) -> Optional[Enum]:
+        """The enum member stored as `label`, or None if the enum no longer has its value."""
+        try:
+            return self._label_type(self._index.label_value(label))
+        except (IndexError, ValueError):
+            return None
+
+    def _remember(self, vectors: Sequence[np.ndarray], results: Sequence[BaseModel]) -> None:
+        self._index.add(
+            np.asarray(vectors),
+            [self._index.label_code(getattr(result, self._field_name).value) for result in results],
+        )
@@ -0,0 +1,117 @@
+"""
+Configures structured, leveled logging for the entire application.
+
+Modules log through the standard `logging` module with lazy `%`-style
+arguments, so a disabled level costs a single `isEnabledFor` branch. This
+module wires the root logger to `Settings.log_level`, renders every record as
+one JSON line, and can optionally move the actual I/O to a background thread
+through a queue so that emitting a record never blocks the pipeline.
+Configuring again replaces what the previous call installed, so composition
+roots can call it at import time without stacking handlers or listeners.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple
+
+# Attributes every LogRecord has; anything else was passed through `extra=`.
+_RESERVED_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.NOTSET, "", 0, "", (), None))
+) | {"message", "asctime", "taskName"}
+
+
+# What the last `configure_logging` call installed: its arguments, the root
+# handler and the queue listener, if any.
+_installed: Optional[Tuple[str, bool, logging.Handler, Optional[QueueListener]]] = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Renders log records as single-line JSON objects.
+
+    The standard fields (timestamp, level, logger, message) are always present;
+    any `extra=` fields are added as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(level: str, use_queue: bool = False) -> Optional[QueueListener]:
+    """
+    Configures the root logger.
+
+    The first call replaces any handlers already on the root logger, e.g. a
+    runtime's default one. Later calls only replace the handler and listener
+    installed by the previous call, and a call with the same arguments keeps
+    them as they are.
+
+    Args:
+        level (str): The minimum level to emit, e.g. "INFO" (usually `settings.log_level`).
+        use_queue (bool): If True, records are put on an in-memory queue and
+            written to stdout by a background `QueueListener` thread.
+
+    Returns:
+        Optional[QueueListener]: The started listener when `use_queue` is True.
+        It is stopped, flushing any queued records, at interpreter exit.
+    """
+    global _installed
+    level = level.upper()
+    root_logger = logging.getLogger()
+    if _installed is not None:
+        installed_level, installed_queue, handler, listener = _installed
+        if (installed_level, installed_queue) == (level, use_queue) and handler in root_logger.handlers:
+            return listener
+        stop_logging()
+    else:
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+    root_logger.setLevel(level)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(StructuredFormatter())
+    if not use_queue:
+        root_logger.addHandler(stream_handler)
+        _installed = (level, use_queue, stream_handler, None)
+        return None
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    root_logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    _installed = (level, use_queue, queue_handler, listener)
+    return listener
+
+
+def stop_logging() -> None:
+    """
+    Removes the handler installed by `configure_logging` and stops its queue
+    listener, flushing any queued records. Runs at interpreter exit.
+    """
+    global _installed
+    if _installed is None:
+        return
+    _, _, handler, listener = _installed
+    _installed = None
+    logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+
+
+atexit.register(stop_logging)
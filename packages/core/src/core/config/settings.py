@@ -6,6 +6,7 @@ variables and .env files. It conditionally loads a '.env.test' file if the
 'TESTING' environment variable is set.
 """
 import os
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -14,6 +15,67 @@ load_dotenv()
 class OpenAISettings(BaseModel):
     """Configuration for the external OpenAI API."""
     api_key: str
+    model: str = "gpt-4o"
+    # A cheaper model to try first; texts it isn't confident about escalate to `model`.
+    cascade_model: Optional[str] = None
+    cascade_threshold: float = 0.8
+    # Per-request timeout for classification calls.
+    timeout_seconds: float = 30.0
+    # HTTP connection pool and in-flight request limits for the async gateway.
+    max_concurrency: int = 100
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    # Client-side quotas, kept just under the account's tier limits to avoid 429s.
+    requests_per_minute: float = 500
+    tokens_per_minute: float = 200_000
+    max_retries: int = 5
+    # Hedging: re-send a request still pending at this latency percentile,
+    # for at most `max_hedge_rate` of all requests.
+    hedge_requests: bool = False
+    hedge_percentile: float = 0.95
+    max_hedge_rate: float = 0.05
+
+class ClassificationCacheSettings(BaseModel):
+    """Configuration for the classification result cache."""
+    max_size: int = 10_000
+    ttl_seconds: Optional[float] = 3600.0
+    # Path to a SQLite file to persist the cache across restarts; in-process only if unset.
+    path: Optional[str] = None
+
+class PreClassifierSettings(BaseModel):
+    """Configuration for the local pre-classifier in front of the LLM."""
+    # Path to a `.npz` model saved with `SoftmaxTextModel.save`; disabled if unset.
+    model_path: Optional[str] = None
+    threshold: float = 0.9
+
+class SemanticCacheSettings(BaseModel):
+    """Configuration for the near-duplicate semantic cache."""
+    enabled: bool = False
+    # Minimum cosine similarity for a stored label to be reused.
+    threshold: float = 0.95
+    dim: int = 256
+    # Path prefix of the memory-mapped vector index; in-memory if unset.
+    path: Optional[str] = None
+
+class ClassificationRepositorySettings(BaseModel):
+    """Configuration for classification persistence."""
+    # Path to a SQLite database file; classifications are kept in memory if unset.
+    path: Optional[str] = None
+    # Keep in-memory classifications in compact numpy columns (~20x less memory).
+    columnar: bool = False
+    # Acknowledge writes at once and store them in batches from a background thread.
+    write_behind: bool = False
+    write_behind_batch_size: int = 500
+    write_behind_flush_seconds: float = 1.0
+    write_behind_max_pending: int = 10_000
+    # Maintain category counts (all-time, per call, last 5m/1h/1d) on every write.
+    aggregates: bool = False
+
+class CompactionSettings(BaseModel):
+    """Configuration for transcript compaction before classification."""
+    # Token budget of a compacted transcript; transcripts are classified as is if unset.
+    max_tokens: Optional[int] = None
 
 # --- The main, top-level Settings class ---
 
@@ -27,11 +89,17 @@ class Settings(BaseSettings):
         case_sensitive=False,
     )
 
-    log_level: str = "DEBUG"
+    log_level: str = "INFO"
+    log_queue: bool = False
     pythonpath: str = "."
 
     # The attribute names here (aws, postgres) are the prefixes for the env vars
     openai_api: OpenAISettings
+    classification_cache: ClassificationCacheSettings = ClassificationCacheSettings()
+    preclassifier: PreClassifierSettings = PreClassifierSettings()
+    semantic_cache: SemanticCacheSettings = SemanticCacheSettings()
+    compaction: CompactionSettings = CompactionSettings()
+    classification_repository: ClassificationRepositorySettings = ClassificationRepositorySettings()
 
 # --- Create a single, importable instance of the settings ---
 settings = Settings()
\ No newline at end of file
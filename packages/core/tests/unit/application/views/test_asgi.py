@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from core.application.views.asgi import app
+from plummy.metrics import registry
+
+
+def test_metrics_route_exposes_prometheus_text():
+    registry.step("create_classification").executed += 1
+    client = TestClient(app)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'plummy_step_executed_total{processor="create_classification"}' in response.text
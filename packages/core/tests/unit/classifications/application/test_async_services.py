@@ -0,0 +1,25 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock
+
+from core.classifications.application.services import acreate_classification_service
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.repositories import InMemoryClassificationRepository
+
+
+def test_acreate_classification_service_stores_off_the_event_loop():
+    class RecordingRepository(InMemoryClassificationRepository):
+        def create(self, data):
+            self.thread = threading.current_thread()
+            return super().create(data)
+
+    repo = RecordingRepository()
+    llm_classifier = AsyncMock()
+    llm_classifier.aclassify.return_value = ClassificationCategory(category=Category.COMMERCIAL)
+
+    created = asyncio.run(acreate_classification_service(
+        {"type": "newcall", "text": "Price list please"}, classification_repo=repo, llm_classifier=llm_classifier
+    ))
+
+    assert created.classification_category.category == Category.COMMERCIAL
+    assert repo.thread is not threading.main_thread()
@@ -0,0 +1,14 @@
+from core.classifications.application.services import compact_transcript_service
+
+
+def test_compact_transcript_service_records_the_token_reduction():
+    event = {"type": "newcall", "text": "Uh,   I'd like a price list.   I'd like a price list. Thanks."}
+
+    result = compact_transcript_service(event, max_tokens=100)
+
+    assert result["type"] == "newcall"
+    assert result["text"] == "I'd like a price list. Thanks."
+    assert result["compaction"]["token_reduction"] == (
+        result["compaction"]["original_tokens"] - result["compaction"]["compacted_tokens"]
+    ) > 0
+    assert event["text"].startswith("Uh")
@@ -0,0 +1,60 @@
+from core.classifications.domain.compaction import (
+    compact_transcript,
+    drop_repeated_sentences,
+    normalize_transcript,
+)
+from core.classifications.domain.tokens import estimate_tokens
+
+IVR = "Thank you for calling. Press one for sales, press two for support."
+
+
+def test_normalize_transcript_drops_filler_and_whitespace():
+    text = "Um, so   I was, uh,\n\nlooking for the umbrella\tpricing. Hmm."
+
+    assert normalize_transcript(text) == "so I was, looking for the umbrella pricing."
+
+
+def test_normalize_transcript_keeps_sentence_endings_around_filler():
+    assert normalize_transcript("He said um. Then uh, left. Is it ok, erm?") == "He said. Then left. Is it ok?"
+
+
+def test_drop_repeated_sentences_keeps_short_answers():
+    sentences = ["Yes.", IVR, "No.", "Yes.", IVR.upper()]
+
+    assert drop_repeated_sentences(sentences) == ["Yes.", IVR, "No.", "Yes."]
+
+
+def test_compact_transcript_drops_repeated_ivr_segments():
+    text = f"{IVR} {IVR} thank you for calling! press one for sales, press two for support. I need a quote."
+
+    compacted = compact_transcript(text, max_tokens=1_000)
+
+    assert compacted.text == f"{IVR} I need a quote."
+    assert compacted.original_tokens == estimate_tokens(text)
+    assert compacted.compacted_tokens < compacted.original_tokens
+
+
+def test_compact_transcript_keeps_head_tail_and_highest_signal_middle_within_budget():
+    """
+    Tests that an over-budget transcript keeps its opening and closing
+    sentences and fills the rest with the most informative middle sentences.
+    """
+    # Arrange
+    middle = [f"So yeah it is what it is number {index}." for index in range(200)]
+    middle[150] = "Customer requests invoice pricing discounts quote."
+    text = " ".join(["Hello, this is Ana from Acme."] + middle + ["Please call me back tomorrow."])
+
+    # Act
+    compacted = compact_transcript(text, max_tokens=60)
+
+    # Assert
+    assert compacted.compacted_tokens <= 60
+    assert compacted.text.startswith("Hello, this is Ana from Acme.")
+    assert compacted.text.endswith("Please call me back tomorrow.")
+    assert "Customer requests invoice pricing discounts quote." in compacted.text
+
+
+def test_compact_transcript_truncates_a_single_oversized_sentence():
+    compacted = compact_transcript("word " * 1_000, max_tokens=50)
+
+    assert compacted.compacted_tokens == 50
@@ -1,6 +1,6 @@
-from core.classifications.domain.services import classify_text
+from core.classifications.domain.services import classify_text, classify_texts
 from core.classifications.domain.models import ClassificationCategory, ClassificationCreate
-from core.classifications.domain.services import create_classification
+from core.classifications.domain.services import create_classification, create_classifications
 
 def test_classify_text_calls_llm_classifier(llm_classifier):
     """
@@ -31,4 +31,35 @@ def test_create_classification_calls_repository(classification_repo, mocker):
         classification_repo=classification_repo
     )
     
-    classification_repo.create.assert_called_once_with(classification_create)
\ No newline at end of file
+    classification_repo.create.assert_called_once_with(classification_create)
+
+def test_classify_texts_calls_llm_classifier_once(llm_classifier):
+    """
+    Tests the 'classify_texts' domain service function.
+    Ensures the whole batch goes to LLMClassifier.classify_many in one call.
+    """
+    input_texts = ["First text", "Second text"]
+    classify_texts(texts=input_texts, llm_classifier=llm_classifier)
+
+    llm_classifier.classify_many.assert_called_once_with(
+        texts=input_texts,
+        category=ClassificationCategory
+    )
+
+
+def test_create_classifications_calls_repository_once(classification_repo):
+    """
+    Tests the 'create_classifications' domain service function.
+    Ensures the whole batch goes to ClassificationRepository.create_many in one call.
+    """
+    classifications_create = [
+        ClassificationCreate(call_id=call_id, classification_category=ClassificationCategory(category="COMMERCIAL"))
+        for call_id in ("123", "456")
+    ]
+
+    create_classifications(
+        classifications_data=classifications_create,
+        classification_repo=classification_repo
+    )
+
+    classification_repo.create_many.assert_called_once_with(classifications_create)
@@ -0,0 +1,125 @@
+import pytest
+
+from core.classifications.domain.models import Category, ClassificationCategory, ClassificationCreate
+from core.classifications.infrastructure.aggregates import (
+    AggregatingClassificationRepository,
+    BucketRing,
+    CategoryAggregates,
+)
+from core.classifications.infrastructure.repositories import InMemoryClassificationRepository
+
+
+def make_create(call_id: str, category: Category) -> ClassificationCreate:
+    return ClassificationCreate(call_id=call_id, classification_category=ClassificationCategory(category=category))
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_repo(clock: FakeClock) -> AggregatingClassificationRepository:
+    aggregates = CategoryAggregates(windows={"5m": (300.0, 10.0), "1h": (3_600.0, 60.0)}, clock=clock)
+    return AggregatingClassificationRepository(InMemoryClassificationRepository(), aggregates)
+
+def test_aggregating_repository_maintains_counts_on_every_write():
+    """
+    Tests that creates, updates and deletes keep the totals, the per-call
+    counts and the windows in step with the stored records.
+    """
+    # Arrange
+    clock = FakeClock()
+    repo = make_repo(clock)
+    first, second = repo.create_many(
+        [
+            make_create("call_1", Category.COMMERCIAL),
+            make_create("call_1", Category.COMMERCIAL),
+        ]
+    )
+    third = repo.create(make_create("call_2", Category.FOLLOWING))
+
+    # Act
+    # The stored object is changed in place, as the in-memory repository allows.
+    first.classification_category.category = Category.FOLLOWING
+    repo.update(first)
+    repo.update(third.model_copy(update={"call_id": "call_1"}))
+    repo.delete(second.id)
+
+    # Assert
+    aggregates = repo.aggregates
+    assert aggregates.totals() == {Category.COMMERCIAL: 0, Category.FOLLOWING: 2}
+    assert aggregates.counts_by_call("call_1") == {Category.COMMERCIAL: 0, Category.FOLLOWING: 2}
+    assert aggregates.counts_by_call("call_2") == {Category.COMMERCIAL: 0, Category.FOLLOWING: 0}
+    assert aggregates.counts_by_call("non_existent_call") == {Category.COMMERCIAL: 0, Category.FOLLOWING: 0}
+    assert aggregates.window_counts("5m") == {Category.COMMERCIAL: 0, Category.FOLLOWING: 2}
+
+def test_aggregating_repository_windows_age_out_old_records():
+    clock = FakeClock()
+    repo = make_repo(clock)
+    repo.create(make_create("call_1", Category.COMMERCIAL))
+    clock.now += 240
+    repo.create(make_create("call_1", Category.FOLLOWING))
+
+    clock.now += 120
+
+    assert repo.aggregates.window_counts("5m") == {Category.COMMERCIAL: 0, Category.FOLLOWING: 1}
+    assert repo.aggregates.window_counts("1h") == {Category.COMMERCIAL: 1, Category.FOLLOWING: 1}
+    assert repo.aggregates.totals() == {Category.COMMERCIAL: 1, Category.FOLLOWING: 1}
+
+def test_aggregating_repository_deletes_outside_the_window_only_change_totals():
+    clock = FakeClock()
+    repo = make_repo(clock)
+    old = repo.create(make_create("call_1", Category.COMMERCIAL))
+    clock.now += 600
+    repo.create(make_create("call_1", Category.COMMERCIAL))
+
+    repo.delete(old.id)
+
+    assert repo.aggregates.window_counts("5m") == {Category.COMMERCIAL: 1, Category.FOLLOWING: 0}
+    assert repo.aggregates.window_counts("1h") == {Category.COMMERCIAL: 1, Category.FOLLOWING: 0}
+    assert repo.aggregates.totals() == {Category.COMMERCIAL: 1, Category.FOLLOWING: 0}
+
+def test_aggregating_repository_rebuild_counts_stored_records_outside_the_windows():
+    stored = InMemoryClassificationRepository()
+    stored.create_many([make_create("call_1", Category.FOLLOWING) for _ in range(3)])
+    repo = AggregatingClassificationRepository(stored, CategoryAggregates(clock=FakeClock()))
+
+    repo.rebuild(page_size=2)
+
+    assert repo.aggregates.totals() == {Category.COMMERCIAL: 0, Category.FOLLOWING: 3}
+    assert repo.aggregates.counts_by_call("call_1")[Category.FOLLOWING] == 3
+    assert repo.aggregates.window_counts("1d") == {Category.COMMERCIAL: 0, Category.FOLLOWING: 0}
+
+def test_category_aggregates_window_series_lists_every_bucket():
+    clock = FakeClock(now=1_000.0)
+    aggregates = CategoryAggregates(windows={"1m": (60.0, 20.0)}, clock=clock)
+    repo = AggregatingClassificationRepository(InMemoryClassificationRepository(), aggregates)
+    repo.create(make_create("call_1", Category.COMMERCIAL))
+    clock.now += 40
+    repo.create(make_create("call_1", Category.FOLLOWING))
+
+    series = aggregates.window_series("1m")
+
+    assert [start for start, _ in series] == [1_000.0, 1_020.0, 1_040.0]
+    assert [counts[Category.COMMERCIAL] for _, counts in series] == [1, 0, 0]
+    assert [counts[Category.FOLLOWING] for _, counts in series] == [0, 0, 1]
+
+def test_bucket_ring_rejects_windows_shorter_than_a_bucket():
+    with pytest.raises(ValueError):
+        BucketRing(window_seconds=5.0, bucket_seconds=10.0)
+
+def test_aggregating_repository_rebuilds_on_first_read_without_recounting_new_records():
+    clock = FakeClock()
+    stored = InMemoryClassificationRepository()
+    stored.create_many([make_create("call_1", Category.FOLLOWING) for _ in range(2)])
+    repo = AggregatingClassificationRepository(stored, CategoryAggregates(clock=clock), rebuild_on_first_read=True)
+
+    repo.create(make_create("call_1", Category.COMMERCIAL))
+    repo.delete(1)
+
+    assert repo.aggregates.totals() == {Category.COMMERCIAL: 1, Category.FOLLOWING: 1}
+    # The record created after the decorator was built keeps its window.
+    assert repo.aggregates.window_counts("5m") == {Category.COMMERCIAL: 1, Category.FOLLOWING: 0}
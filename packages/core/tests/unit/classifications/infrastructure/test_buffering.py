@@ -0,0 +1,183 @@
+import threading
+import time
+
+import pytest
+
+from core.classifications.domain.models import Category, ClassificationCategory, ClassificationCreate
+from core.classifications.infrastructure.buffering import WriteBehindClassificationRepository
+from core.classifications.infrastructure.repositories import InMemoryClassificationRepository
+
+
+def make_create(call_id: str = "call_1") -> ClassificationCreate:
+    return ClassificationCreate(
+        call_id=call_id, classification_category=ClassificationCategory(category=Category.FOLLOWING)
+    )
+
+def test_write_behind_repository_reads_its_own_writes_before_they_are_stored(write_behind_repo, gated_classification_repo):
+    """
+    Tests that created records get IDs at once and are readable from the
+    buffer before the background writer stores them.
+    """
+    # Arrange
+    gated_classification_repo.create(make_create("call_1"))
+
+    # Act
+    created = write_behind_repo.create_many([make_create("call_1"), make_create("call_2")])
+
+    # Assert
+    assert [c.id for c in created] == [2, 3]
+    with pytest.raises(ValueError):
+        gated_classification_repo.get_by_id(2)
+    assert write_behind_repo.get_by_id(2) == created[0]
+    assert write_behind_repo.get_many([3, 1]) == [created[1], gated_classification_repo.get_by_id(1)]
+    assert [c.id for c in write_behind_repo.find_by_call_id("call_1")] == [1, 2]
+
+    write_behind_repo.flush()
+
+    assert gated_classification_repo.get_many([2, 3]) == created
+    assert write_behind_repo.pending == 0
+
+def test_write_behind_repository_writes_full_batches(write_behind_repo, gated_classification_repo):
+    for _ in range(25):
+        write_behind_repo.create(make_create())
+
+    write_behind_repo.flush()
+
+    assert gated_classification_repo.batch_sizes == [10, 10, 5]
+    assert write_behind_repo.written == 25
+    assert len(gated_classification_repo.find_by_call_id("call_1")) == 25
+
+def test_write_behind_repository_writes_after_the_flush_interval(gated_classification_repo):
+    repo = WriteBehindClassificationRepository(repository=gated_classification_repo, flush_interval=0.01)
+    created = repo.create(make_create())
+
+    deadline = time.monotonic() + 5.0
+    while repo.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert gated_classification_repo.get_by_id(created.id) == created
+    repo.close()
+
+def test_write_behind_repository_blocks_when_the_buffer_is_full(gated_classification_repo):
+    repo = WriteBehindClassificationRepository(
+        repository=gated_classification_repo, max_batch_size=1, max_pending=2, flush_interval=60.0
+    )
+    gated_classification_repo.gate.clear()
+    # One record is held by the writer and one waits behind it.
+    for _ in range(2):
+        repo.create(make_create())
+    blocked = threading.Thread(target=repo.create, args=(make_create(),))
+
+    blocked.start()
+    blocked.join(timeout=0.2)
+    assert blocked.is_alive()
+
+    gated_classification_repo.gate.set()
+    blocked.join(timeout=5.0)
+    assert not blocked.is_alive()
+    repo.close()
+    assert len(gated_classification_repo.find_by_call_id("call_1")) == 3
+
+def test_write_behind_repository_flushes_on_close(gated_classification_repo):
+    repo = WriteBehindClassificationRepository(repository=gated_classification_repo, flush_interval=60.0)
+    created = repo.create(make_create())
+
+    repo.close()
+
+    assert gated_classification_repo.get_by_id(created.id) == created
+    with pytest.raises(RuntimeError):
+        repo.create(make_create())
+
+def test_write_behind_repository_flushes_before_update_and_delete(write_behind_repo, gated_classification_repo):
+    first, second = write_behind_repo.create_many([make_create(), make_create()])
+
+    write_behind_repo.update(first.model_copy(update={"call_id": "call_2"}))
+    write_behind_repo.delete(second.id)
+
+    assert gated_classification_repo.find_by_call_id("call_2") == [first.model_copy(update={"call_id": "call_2"})]
+    with pytest.raises(ValueError):
+        write_behind_repo.get_by_id(second.id)
+
+def test_write_behind_repository_keeps_and_retries_failed_writes():
+    """
+    Tests that a batch that can't be written stays buffered, makes `flush`
+    raise, and is written once the wrapped repository recovers.
+    """
+    # Arrange
+    class FlakyRepository(InMemoryClassificationRepository):
+        failing = True
+
+        def save_many(self, classifications) -> None:
+            if self.failing:
+                raise OSError("disk full")
+            super().save_many(classifications)
+
+    stored = FlakyRepository()
+    repo = WriteBehindClassificationRepository(repository=stored, flush_interval=0.01, max_retries=1)
+    created = repo.create(make_create())
+
+    # Act / Assert
+    with pytest.raises(RuntimeError):
+        repo.flush()
+    assert repo.failed_writes == 1
+    assert repo.pending == 1
+    assert repo.get_by_id(created.id) == created
+
+    stored.failing = False
+    repo.flush()
+    repo.close()
+
+    assert stored.get_by_id(created.id) == created
+    assert repo.pending == 0
+
+def test_write_behind_repository_counts_failed_records_towards_the_buffer():
+    """
+    Tests that records whose batch failed fill the buffer, make `create`
+    raise once they fill it, and count once in `failed_writes` however often
+    they are retried.
+    """
+    # Arrange
+    class FailingRepository(InMemoryClassificationRepository):
+        def save_many(self, classifications) -> None:
+            raise OSError("disk full")
+
+    repo = WriteBehindClassificationRepository(
+        repository=FailingRepository(), flush_interval=0.01, max_pending=2, max_retries=0
+    )
+    repo.create_many([make_create(), make_create()])
+
+    # Act
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            repo.flush()
+    with pytest.raises(RuntimeError, match="full"):
+        repo.create(make_create())
+
+    # Assert
+    assert repo.failed_writes == 2
+    assert repo.pending == 2
+    with pytest.raises(RuntimeError):
+        repo.close()
+
+def test_write_behind_repository_flush_racing_close_returns(gated_classification_repo):
+    repo = WriteBehindClassificationRepository(repository=gated_classification_repo, flush_interval=60.0)
+    gated_classification_repo.gate.clear()
+    repo.create_many([make_create() for _ in range(5)])
+    flusher = threading.Thread(target=repo.flush)
+    closer = threading.Thread(target=repo.close)
+
+    flusher.start()
+    closer.start()
+    gated_classification_repo.gate.set()
+    flusher.join(timeout=5.0)
+    closer.join(timeout=5.0)
+
+    assert not flusher.is_alive() and not closer.is_alive()
+    assert len(gated_classification_repo.find_by_call_id("call_1")) == 5
+    with pytest.raises(RuntimeError):
+        repo.create(make_create())
+
+def test_write_behind_repository_scans_include_buffered_records(write_behind_repo):
+    created = write_behind_repo.create_many([make_create(), make_create("call_2"), make_create()])
+
+    assert list(write_behind_repo.iter_by(call_id="call_1", page_size=1)) == [created[0], created[2]]
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.caches import (
+    CachedClassifierGateway,
+    SingleFlightClassifierGateway,
+    SQLiteClassificationCache,
+    classification_cache_key,
+)
+
+
+def _classifier(category=Category.COMMERCIAL):
+    classifier = MagicMock()
+    classifier.model = "gpt-4o"
+    classifier.classify.return_value = ClassificationCategory(category=category)
+    return classifier
+
+
+def test_classification_cache_key_depends_on_model_and_text():
+    key = classification_cache_key("gpt-4o", ClassificationCategory, "hello")
+
+    assert key == classification_cache_key("gpt-4o", ClassificationCategory, "hello")
+    assert key != classification_cache_key("gpt-4o-mini", ClassificationCategory, "hello")
+    assert key != classification_cache_key("gpt-4o", ClassificationCategory, "hello!")
+
+
+def test_cached_classifier_gateway_serves_repeated_text_from_cache():
+    classifier = _classifier()
+    gateway = CachedClassifierGateway(classifier=classifier)
+
+    first = gateway.classify(text="voicemail", category=ClassificationCategory)
+    first.category = Category.FOLLOWING  # callers mutating a result must not poison the cache
+    second = gateway.classify(text="voicemail", category=ClassificationCategory)
+
+    classifier.classify.assert_called_once_with(text="voicemail", category=ClassificationCategory)
+    assert second.category == Category.COMMERCIAL
+    assert (gateway.hits, gateway.misses) == (1, 1)
+
+
+def test_cached_classifier_gateway_evicts_least_recently_used_and_expired_entries():
+    now = [0.0]
+    classifier = _classifier()
+    gateway = CachedClassifierGateway(classifier=classifier, max_size=2, ttl=10, clock=lambda: now[0])
+
+    gateway.classify(text="a", category=ClassificationCategory)
+    gateway.classify(text="b", category=ClassificationCategory)
+    gateway.classify(text="a", category=ClassificationCategory)
+    gateway.classify(text="c", category=ClassificationCategory)  # evicts "b"
+    now[0] = 11.0
+    gateway.classify(text="a", category=ClassificationCategory)  # expired
+
+    assert classifier.classify.call_count == 4
+    assert gateway.evictions == 2
+    assert len(gateway) == 2
+
+
+def test_cached_classifier_gateway_persists_to_sqlite_store(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    CachedClassifierGateway(
+        classifier=_classifier(), store=SQLiteClassificationCache(path)
+    ).classify(text="hello", category=ClassificationCategory)
+
+    classifier = _classifier(Category.FOLLOWING)
+    restarted = CachedClassifierGateway(classifier=classifier, store=SQLiteClassificationCache(path))
+    result = restarted.classify(text="hello", category=ClassificationCategory)
+
+    classifier.classify.assert_not_called()
+    assert result.category == Category.COMMERCIAL
+    assert restarted.hits == 1
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.001)
+
+
+def test_cached_classifier_gateway_rejects_misaligned_batch_results():
+    classifier = _classifier()
+    classifier.classify_many.return_value = [ClassificationCategory(category=Category.COMMERCIAL)]
+    gateway = CachedClassifierGateway(classifier=classifier)
+
+    with pytest.raises(ValueError):
+        gateway.classify_many(texts=["a", "b"], category=ClassificationCategory)
+
+    assert len(gateway) == 0
+
+
+def test_single_flight_gateway_coalesces_concurrent_threaded_requests():
+    release = threading.Event()
+    classifier = _classifier()
+    classifier.classify.side_effect = lambda **kwargs: (
+        release.wait(5), ClassificationCategory(category=Category.COMMERCIAL)
+    )[1]
+    gateway = SingleFlightClassifierGateway(classifier=classifier)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(gateway.classify, text="same", category=ClassificationCategory)
+            for _ in range(5)
+        ]
+        _wait_for(lambda: gateway.coalesced == 4)
+        release.set()
+        results = [future.result() for future in futures]
+
+    classifier.classify.assert_called_once()
+    assert {result.category for result in results} == {Category.COMMERCIAL}
+
+
+def test_single_flight_gateway_coalesces_asyncio_requests_and_shares_errors():
+    classifier = MagicMock()
+    classifier.model = "gpt-4o"
+    classifier.aclassify = AsyncMock(side_effect=RuntimeError("rate limited"))
+    gateway = SingleFlightClassifierGateway(classifier=classifier)
+
+    async def burst():
+        return await asyncio.gather(
+            *(gateway.aclassify(text="same", category=ClassificationCategory) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(burst())
+
+    classifier.aclassify.assert_awaited_once()
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert gateway.coalesced == 2
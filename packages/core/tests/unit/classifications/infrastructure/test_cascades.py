@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.cascades import CascadingClassifierGateway
+from core.classifications.infrastructure.gateways import AsyncOpenAIClassifierGateway, OpenAIClassifierGateway
+
+
+def test_cascade_escalates_only_unconfident_texts(scripted_openai_server):
+    """
+    Tests that the small model's confident answers are returned as is and
+    that unconfident ones are re-classified by the large model.
+    """
+    # Arrange
+    scripted_openai_server.script = {
+        "gpt-4o-mini": [
+            {"category": "COMMERCIAL", "confidence": 0.95},
+            {"category": "COMMERCIAL", "confidence": 0.4},
+        ],
+        "gpt-4o": [{"category": "FOLLOWING"}],
+    }
+    client = scripted_openai_server.client()
+    cascade = CascadingClassifierGateway(
+        tiers=[
+            OpenAIClassifierGateway(api_key="test", model="gpt-4o-mini", client=client),
+            OpenAIClassifierGateway(api_key="test", model="gpt-4o", client=client),
+        ],
+        thresholds=0.8,
+    )
+
+    # Act
+    easy = cascade.classify(text="Price list please", category=ClassificationCategory)
+    hard = cascade.classify(text="Hmm, about that thing", category=ClassificationCategory)
+
+    # Assert
+    assert easy == ClassificationCategory(category=Category.COMMERCIAL)
+    assert hard == ClassificationCategory(category=Category.FOLLOWING)
+    assert [request["model"] for request in scripted_openai_server.requests] == [
+        "gpt-4o-mini", "gpt-4o-mini", "gpt-4o"
+    ]
+    assert "confidence" in scripted_openai_server.requests[0]["text"]["format"]["schema"]["required"]
+    small, large = cascade.stats
+    assert (small.calls, small.escalations, small.escalation_rate) == (2, 1, 0.5)
+    assert (large.calls, large.escalations) == (1, 0)
+    assert small.latency.count == 2 and large.latency.count == 1
+    assert cascade.model == "gpt-4o-mini>gpt-4o"
+
+
+def test_cascade_classify_many_sends_each_tier_one_batch(fake_openai_client):
+    small = OpenAIClassifierGateway(api_key="test", model="gpt-4o-mini", client=fake_openai_client)
+    large = OpenAIClassifierGateway(api_key="test", model="gpt-4o", client=fake_openai_client)
+    # The fake reports no confidence; script the small tier to be sure only about pricing.
+    small.classify_many_with_confidence = lambda texts, category: [
+        (category(category=Category.COMMERCIAL), 0.9 if "pric" in text else 0.1) for text in texts
+    ]
+    cascade = CascadingClassifierGateway(tiers=[small, large], thresholds=0.8)
+
+    results = cascade.classify_many(
+        texts=["pricing", "follow up", "pricing again", "follow up again"], category=ClassificationCategory
+    )
+
+    assert [result.category for result in results] == [
+        Category.COMMERCIAL, Category.FOLLOWING, Category.COMMERCIAL, Category.FOLLOWING
+    ]
+    assert [call["model"] for call in fake_openai_client.responses.calls] == ["gpt-4o"]
+    assert [(stats.calls, stats.escalations) for stats in cascade.stats] == [(4, 2), (2, 0)]
+
+
+def test_async_cascade_awaits_each_tier(scripted_openai_server):
+    scripted_openai_server.script = {
+        "gpt-4o-mini": [{"category": "FOLLOWING", "confidence": 0.1}],
+        "gpt-4o": [{"category": "COMMERCIAL"}],
+    }
+    client = scripted_openai_server.async_client()
+    cascade = CascadingClassifierGateway(
+        tiers=[
+            AsyncOpenAIClassifierGateway(api_key="test", model="gpt-4o-mini", client=client),
+            AsyncOpenAIClassifierGateway(api_key="test", model="gpt-4o", client=client),
+        ],
+    )
+
+    result = asyncio.run(cascade.aclassify(text="Any news?", category=ClassificationCategory))
+
+    assert result == ClassificationCategory(category=Category.COMMERCIAL)
+    assert cascade.stats[0].escalations == 1
+
+
+def test_cascade_clamps_self_reported_confidence(scripted_openai_server):
+    scripted_openai_server.script = {"gpt-4o-mini": [{"category": "COMMERCIAL", "confidence": 7}]}
+    gateway = OpenAIClassifierGateway(api_key="test", model="gpt-4o-mini", client=scripted_openai_server.client())
+
+    result, confidence = gateway.classify_with_confidence(text="Prices?", category=ClassificationCategory)
+
+    assert type(result) is ClassificationCategory
+    assert confidence == 1.0
+
+
+def test_cascade_requires_one_threshold_per_escalating_tier():
+    with pytest.raises(ValueError):
+        CascadingClassifierGateway(tiers=[object(), object()], thresholds=[0.5, 0.9])
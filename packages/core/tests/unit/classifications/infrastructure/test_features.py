@@ -0,0 +1,23 @@
+import numpy as np
+
+from core.classifications.infrastructure.features import HashingFeaturizer
+
+
+def test_hashing_featurizer_builds_normalized_sparse_rows():
+    featurizer = HashingFeaturizer(n_features=1024, ngram_range=(1, 2))
+
+    features = featurizer.transform(["Price, price list", "", "follow up"])
+
+    assert featurizer.ngrams("Price, price list") == ["price", "price", "list", "price price", "price list"]
+    assert features.n_texts == 3
+    assert set(features.rows.tolist()) == {0, 2}
+    assert np.all((features.indices >= 0) & (features.indices < 1024))
+    norms = np.bincount(features.rows, weights=features.values ** 2, minlength=3)
+    np.testing.assert_allclose(norms, [1.0, 0.0, 1.0], rtol=1e-6)
+
+
+def test_hashing_featurizer_is_deterministic():
+    first = HashingFeaturizer().transform(["Asking about pricing"])
+    second = HashingFeaturizer().transform(["Asking about pricing"])
+
+    np.testing.assert_array_equal(first.indices, second.indices)
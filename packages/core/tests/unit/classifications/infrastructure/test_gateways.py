@@ -0,0 +1,167 @@
+from core.classifications.domain.models import Category, ClassificationCategory
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from core.classifications.infrastructure.caches import CachedClassifierGateway, SingleFlightClassifierGateway
+from core.classifications.infrastructure.gateways import (
+    AsyncOpenAIClassifierGateway,
+    OpenAIClassifierGateway,
+    pack_texts,
+)
+from core.classifications.infrastructure.hedging import HedgedClassifierGateway
+from core.classifications.infrastructure.prompts import compile_prompt
+from core.classifications.infrastructure.resilience import (
+    AIMDConcurrencyLimiter,
+    RateLimitedClassifierGateway,
+    RateLimiter,
+)
+
+
+def test_pack_texts_respects_count_and_token_budget():
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 400, "e"]
+
+    packs = list(pack_texts(texts, max_texts=2, max_tokens=25))
+
+    assert packs == [texts[0:2], texts[2:3], texts[3:4], texts[4:5]]
+
+
+def test_classify_many_packs_texts_into_one_request(fake_openai_client):
+    gateway = OpenAIClassifierGateway(api_key="test", client=fake_openai_client)
+
+    results = gateway.classify_many(
+        texts=["Asking about pricing", "Following up on my order", "Bulk price list please"],
+        category=ClassificationCategory,
+    )
+
+    assert [result.category for result in results] == [
+        Category.COMMERCIAL, Category.FOLLOWING, Category.COMMERCIAL
+    ]
+    assert all(type(result) is ClassificationCategory for result in results)
+    assert len(fake_openai_client.responses.calls) == 1
+    assert fake_openai_client.responses.calls[0]["text"]["format"] is compile_prompt(
+        ClassificationCategory
+    ).batch_text_format
+
+
+def test_classify_many_splits_and_retries_misaligned_packs(fake_openai_client):
+    fake_openai_client.responses.max_items = 2
+    gateway = OpenAIClassifierGateway(api_key="test", client=fake_openai_client)
+
+    results = gateway.classify_many(
+        texts=["pricing", "follow up", "pricing again", "follow up again"],
+        category=ClassificationCategory,
+    )
+
+    assert [result.category for result in results] == [
+        Category.COMMERCIAL, Category.FOLLOWING, Category.COMMERCIAL, Category.FOLLOWING
+    ]
+    # One rejected pack of 4, then two packs of 2 that line up.
+    assert len(fake_openai_client.responses.calls) == 3
+
+
+def test_decorator_stack_sends_cache_misses_as_one_packed_request(fake_openai_client):
+    """
+    Tests that a batch classified through the full decorator stack reaches
+    the OpenAI gateway as a single packed request holding only the distinct
+    cache misses.
+    """
+    # Arrange
+    openai_gateway = OpenAIClassifierGateway(api_key="test", client=fake_openai_client)
+    rate_limited = RateLimitedClassifierGateway(
+        openai_gateway, RateLimiter(requests_per_minute=1_000, tokens_per_minute=1_000_000)
+    )
+    stack = CachedClassifierGateway(SingleFlightClassifierGateway(HedgedClassifierGateway(rate_limited)))
+    stack.classify(text="Asking about pricing", category=ClassificationCategory)
+    fake_openai_client.responses.calls.clear()
+
+    # Act
+    results = stack.classify_many(
+        texts=["Asking about pricing", "Following up on my order", "Bulk price list please", "Following up on my order"],
+        category=ClassificationCategory,
+    )
+
+    # Assert
+    assert [result.category for result in results] == [
+        Category.COMMERCIAL, Category.FOLLOWING, Category.COMMERCIAL, Category.FOLLOWING
+    ]
+    assert len(fake_openai_client.responses.calls) == 1
+    packed = fake_openai_client.responses.calls[0]["input"][-1]["content"]
+    assert packed.count("Text ") == 2
+    assert (stack.hits, stack.misses) == (1, 3)
+
+
+def test_async_gateway_caps_in_flight_requests(fake_async_openai_client):
+    gateway = AsyncOpenAIClassifierGateway(
+        api_key="test", client=fake_async_openai_client, max_concurrency=5, timeout=2.5
+    )
+    texts = [f"pricing request {index}" for index in range(50)]
+
+    results = asyncio.run(gateway.aclassify_many(texts=texts, category=ClassificationCategory))
+
+    assert [result.category for result in results] == [Category.COMMERCIAL] * 50
+    assert fake_async_openai_client.responses.max_in_flight == 5
+    assert fake_async_openai_client.responses.calls[0]["timeout"] == 2.5
+
+
+def test_async_gateway_serves_several_event_loops(fake_async_openai_client):
+    gateway = AsyncOpenAIClassifierGateway(api_key="test", client=fake_async_openai_client, max_concurrency=2)
+    texts = [f"pricing request {index}" for index in range(10)]
+
+    first = asyncio.run(gateway.aclassify_many(texts=texts, category=ClassificationCategory))
+    second = asyncio.run(gateway.aclassify_many(texts=texts, category=ClassificationCategory))
+
+    assert first == second
+    assert fake_async_openai_client.responses.max_in_flight == 2
+
+
+def test_async_gateway_builds_pooled_client_from_limits(mocker):
+    http_client = mocker.patch("core.classifications.infrastructure.gateways.openai.DefaultAsyncHttpxClient")
+    async_openai = mocker.patch("core.classifications.infrastructure.gateways.openai.AsyncOpenAI")
+
+    AsyncOpenAIClassifierGateway(
+        api_key="test", timeout=5.0, max_connections=7, max_keepalive_connections=3, keepalive_expiry=10.0
+    )
+
+    http_client.assert_called_once_with(
+        limits=httpx.Limits(max_connections=7, max_keepalive_connections=3, keepalive_expiry=10.0),
+        timeout=5.0,
+    )
+    async_openai.assert_called_once_with(
+        api_key="test", http_client=http_client.return_value, timeout=5.0, max_retries=0
+    )
+
+
+def test_openai_client_leaves_429s_to_the_rate_limited_gateway():
+    """
+    Tests that the gateway's own client does not retry, so the first 429
+    reaches the concurrency limiter.
+    """
+    # Arrange
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(429, json={"error": {"message": "rate limited"}})
+
+    openai_gateway = OpenAIClassifierGateway(api_key="test")
+    openai_gateway.client = openai_gateway.client.with_options(
+        http_client=httpx.Client(transport=httpx.MockTransport(handler))
+    )
+    limiter = AIMDConcurrencyLimiter(initial_limit=8)
+    gateway = RateLimitedClassifierGateway(
+        classifier=openai_gateway,
+        rate_limiter=RateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000),
+        concurrency_limiter=limiter,
+        max_retries=0,
+    )
+
+    # Act
+    with pytest.raises(openai.RateLimitError):
+        gateway.classify(text="pricing", category=ClassificationCategory)
+
+    # Assert
+    assert len(requests) == 1
+    assert limiter.limit == 4
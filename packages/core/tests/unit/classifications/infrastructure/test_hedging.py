@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.hedging import HedgedClassifierGateway, LatencyWindow
+
+
+def test_latency_window_tracks_a_percentile():
+    window = LatencyWindow(size=100, percentile=0.9, refresh_every=1)
+
+    for latency in range(1, 201):
+        window.observe(latency / 1000)
+
+    assert len(window) == 100
+    assert window.value() == 0.191
+
+
+def test_hedged_gateway_aclassify_returns_the_first_response_and_cancels_the_loser():
+    """
+    Tests that a request still pending at p95 gets a backup request whose
+    faster answer is returned while the slow request is cancelled.
+    """
+    # Arrange
+    delays = iter([0.001] * 20 + [5.0, 0.001])
+    cancelled = []
+
+    async def aclassify(text, category):
+        try:
+            await asyncio.sleep(next(delays))
+        except asyncio.CancelledError:
+            cancelled.append(text)
+            raise
+        return category(category=Category.COMMERCIAL)
+
+    classifier = MagicMock()
+    classifier.aclassify = aclassify
+    gateway = HedgedClassifierGateway(classifier=classifier, min_samples=20, max_hedge_rate=1.0)
+
+    async def main():
+        for _ in range(20):
+            await gateway.aclassify(text="warm-up", category=ClassificationCategory)
+        return await asyncio.wait_for(gateway.aclassify(text="slow", category=ClassificationCategory), 2.0)
+
+    # Act
+    result = asyncio.run(main())
+
+    # Assert
+    assert result == ClassificationCategory(category=Category.COMMERCIAL)
+    assert (gateway.requests, gateway.hedged, gateway.hedge_wins) == (21, 1, 1)
+    assert cancelled == ["slow"]
+    # The cancelled loser is observed along with the winner.
+    assert len(gateway._window) == 22
+
+
+def test_hedged_gateway_classify_hedges_slow_blocking_calls():
+    release = threading.Event()
+    calls = []
+
+    def classify(text, category):
+        calls.append(text)
+        if text == "slow" and len(calls) == 21:
+            release.wait(5.0)
+        return category(category=Category.FOLLOWING)
+
+    classifier = MagicMock()
+    classifier.classify.side_effect = classify
+    gateway = HedgedClassifierGateway(classifier=classifier, min_samples=20, max_hedge_rate=1.0)
+    for _ in range(20):
+        gateway.classify(text="warm-up", category=ClassificationCategory)
+
+    result = gateway.classify(text="slow", category=ClassificationCategory)
+    release.set()
+    gateway.close()
+
+    assert result == ClassificationCategory(category=Category.FOLLOWING)
+    assert (gateway.hedged, gateway.hedge_wins) == (1, 1)
+
+
+def test_hedged_gateway_caps_the_hedge_rate():
+    async def aclassify(text, category):
+        await asyncio.sleep(0.02 if text == "slow" else 0.0)
+        return category(category=Category.COMMERCIAL)
+
+    classifier = MagicMock()
+    classifier.aclassify = aclassify
+    gateway = HedgedClassifierGateway(classifier=classifier, min_samples=20, max_hedge_rate=0.1)
+
+    async def main():
+        for _ in range(20):
+            await gateway.aclassify(text="fast", category=ClassificationCategory)
+        for _ in range(10):
+            await gateway.aclassify(text="slow", category=ClassificationCategory)
+
+    asyncio.run(main())
+
+    # 30 calls earn a budget of 3 hedges.
+    assert gateway.hedged == 3
+
+
+def test_hedged_gateway_aclassify_cancels_the_request_when_the_caller_is_cancelled():
+    cancelled = []
+
+    async def aclassify(text, category):
+        try:
+            await asyncio.sleep(0.001 if text == "warm-up" else 5.0)
+        except asyncio.CancelledError:
+            cancelled.append(text)
+            raise
+        return category(category=Category.COMMERCIAL)
+
+    classifier = MagicMock()
+    classifier.aclassify = aclassify
+    gateway = HedgedClassifierGateway(classifier=classifier, min_samples=20, max_hedge_rate=1.0)
+
+    async def main():
+        for _ in range(20):
+            await gateway.aclassify(text="warm-up", category=ClassificationCategory)
+        caller = asyncio.ensure_future(gateway.aclassify(text="slow", category=ClassificationCategory))
+        # Cancelled while still waiting on the primary request, before any hedge.
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0)
+        # Read before `asyncio.run` cancels whatever is left at shutdown.
+        return list(cancelled)
+
+    cancelled_before_shutdown = asyncio.run(main())
+
+    assert cancelled_before_shutdown == ["slow"]
+    assert gateway.hedged == 0
+
+
+def test_hedged_gateway_classify_skips_hedges_while_the_pool_is_full():
+    release = threading.Event()
+
+    def classify(text, category):
+        if text == "slow":
+            release.wait(5.0)
+        return category(category=Category.FOLLOWING)
+
+    classifier = MagicMock()
+    classifier.classify.side_effect = classify
+    gateway = HedgedClassifierGateway(classifier=classifier, min_samples=20, max_hedge_rate=1.0, max_workers=1)
+    for _ in range(20):
+        gateway.classify(text="warm-up", category=ClassificationCategory)
+
+    threading.Timer(0.2, release.set).start()
+    result = gateway.classify(text="slow", category=ClassificationCategory)
+    gateway.close()
+
+    assert result == ClassificationCategory(category=Category.FOLLOWING)
+    assert gateway.hedged == 0
@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import BaseModel
+
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.preclassifiers import PreClassifierGateway, SoftmaxTextModel
+
+EXAMPLES = [
+    ("What is the price of the premium plan", Category.COMMERCIAL),
+    ("Can you send me a price list", Category.COMMERCIAL),
+    ("I want to buy a new subscription", Category.COMMERCIAL),
+    ("Do you offer discounts on bulk orders", Category.COMMERCIAL),
+    ("I am calling to follow up on my ticket", Category.FOLLOWING),
+    ("Following up on the order I placed last week", Category.FOLLOWING),
+    ("Any update on my previous request", Category.FOLLOWING),
+    ("Checking the status of my repair", Category.FOLLOWING),
+]
+
+
+@pytest.fixture(name="text_model", scope="module")
+def _text_model_fixture() -> SoftmaxTextModel:
+    return SoftmaxTextModel.train(EXAMPLES, epochs=300)
+
+
+def _classifier():
+    classifier = MagicMock()
+    classifier.model = "gpt-4o"
+    classifier.classify.return_value = ClassificationCategory(category=Category.FOLLOWING)
+    classifier.classify_many.side_effect = lambda texts, category: [
+        category(category=Category.FOLLOWING) for _ in texts
+    ]
+    return classifier
+
+
+def test_softmax_text_model_learns_training_examples(text_model, tmp_path):
+    texts = [text for text, _ in EXAMPLES]
+
+    probabilities = text_model.predict_proba(texts)
+
+    assert [text_model.classes[label] for label in probabilities.argmax(axis=1)] == [
+        label for _, label in EXAMPLES
+    ]
+    path = str(tmp_path / "model.npz")
+    text_model.save(path)
+    restored = SoftmaxTextModel.load(path, label_type=Category)
+    assert restored.predict_proba(texts) == pytest.approx(probabilities)
+
+
+def test_preclassifier_answers_confident_texts_locally(text_model):
+    """
+    Tests that a confident prediction bypasses the LLM and an uncertain
+    one is delegated to it.
+    """
+    # Arrange
+    classifier = _classifier()
+    gateway = PreClassifierGateway(classifier=classifier, model=text_model, threshold=0.8)
+
+    # Act
+    local = gateway.classify(text="Can you send me the price list", category=ClassificationCategory)
+    delegated = gateway.classify(text="Hello there", category=ClassificationCategory)
+
+    # Assert
+    assert local == ClassificationCategory(category=Category.COMMERCIAL)
+    assert delegated == ClassificationCategory(category=Category.FOLLOWING)
+    classifier.classify.assert_called_once_with(text="Hello there", category=ClassificationCategory)
+    assert (gateway.bypassed, gateway.delegated, gateway.bypass_rate) == (1, 1, 0.5)
+
+
+def test_preclassifier_classify_many_delegates_uncertain_texts_as_one_batch(text_model):
+    classifier = _classifier()
+    gateway = PreClassifierGateway(classifier=classifier, model=text_model, threshold=0.8)
+
+    results = gateway.classify_many(
+        texts=["price list please", "Hello there", "follow up on my ticket", "Good morning"],
+        category=ClassificationCategory,
+    )
+
+    assert [result.category for result in results] == [
+        Category.COMMERCIAL, Category.FOLLOWING, Category.FOLLOWING, Category.FOLLOWING
+    ]
+    classifier.classify_many.assert_called_once_with(
+        texts=["Hello there", "Good morning"], category=ClassificationCategory
+    )
+    assert gateway.bypassed == 2
+
+
+def test_softmax_text_model_rejects_an_empty_training_set():
+    with pytest.raises(ValueError, match="no training examples"):
+        SoftmaxTextModel.train(iter([]))
+
+
+def test_preclassifier_delegates_output_models_it_was_not_trained_for(text_model):
+    class Sentiment(BaseModel):
+        category: str
+
+    classifier = _classifier()
+    classifier.aclassify = AsyncMock(return_value=Sentiment(category="positive"))
+    gateway = PreClassifierGateway(classifier=classifier, model=text_model, threshold=0.0)
+
+    result = asyncio.run(gateway.aclassify(text="price list", category=Sentiment))
+
+    assert result.category == "positive"
+    assert gateway.delegated == 1
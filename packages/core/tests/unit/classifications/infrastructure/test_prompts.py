@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.classifications.domain.models import ClassificationCategory
+from core.classifications.infrastructure.prompts import compile_prompt, response_output_text
+
+
+def test_compile_prompt_is_compiled_once_per_output_model():
+    prompt = compile_prompt(ClassificationCategory)
+
+    assert compile_prompt(ClassificationCategory) is prompt
+    assert prompt.system_prompt.endswith("COMMERCIAL, FOLLOWING")
+    assert prompt.text_format["strict"] is True
+    assert prompt.text_format["schema"]["required"] == ["category"]
+    assert "items" in prompt.batch_text_format["schema"]["properties"]
+
+
+def test_compiled_prompt_only_substitutes_the_text():
+    """
+    Tests that requests for different texts share a byte-identical prefix,
+    so that provider-side prompt caching can apply.
+    """
+    # Arrange
+    prompt = compile_prompt(ClassificationCategory)
+
+    # Act
+    first = prompt.messages("Asking about pricing")
+    second = prompt.messages("Following up")
+
+    # Assert
+    assert first[0] == second[0]
+    assert first[1]["content"] == "Classify this text:\n\nAsking about pricing"
+    assert prompt.parse('{"category": "COMMERCIAL"}') == ClassificationCategory(category="COMMERCIAL")
+
+
+def test_compiled_prompt_rejects_packed_output_that_does_not_fit_the_schema():
+    prompt = compile_prompt(ClassificationCategory)
+
+    assert prompt.parse_batch('{"items": [{"category": "COMMERCIAL"}]}') is None
+    assert [item.index for item in prompt.parse_batch('{"items": [{"category": "COMMERCIAL", "index": 0}]}')] == [0]
+
+
+def test_text_format_is_a_strict_schema_without_sibling_refs():
+    prompt = compile_prompt(ClassificationCategory)
+
+    item_schema = prompt.batch_text_format["schema"]["$defs"]["ClassificationCategoryItem"]
+
+    assert prompt.batch_text_format["name"] == "ClassificationCategoryBatch"
+    assert prompt.batch_text_format["schema"]["additionalProperties"] is False
+    assert item_schema["required"] == ["category", "index"]
+    assert item_schema["additionalProperties"] is False
+
+
+def test_response_output_text_rejects_refusals_and_incomplete_responses():
+    def response(status="completed", content_type="output_text"):
+        content = SimpleNamespace(type=content_type, text='{"category": "COMMERCIAL"}', refusal="I can't help")
+        return SimpleNamespace(
+            status=status,
+            incomplete_details=SimpleNamespace(reason="max_output_tokens"),
+            output=[SimpleNamespace(type="message", content=[content])],
+            output_text=content.text,
+        )
+
+    assert response_output_text(response()) == '{"category": "COMMERCIAL"}'
+    with pytest.raises(ValueError, match="refused"):
+        response_output_text(response(content_type="refusal"))
+    with pytest.raises(ValueError, match="max_output_tokens"):
+        response_output_text(response(status="incomplete"))
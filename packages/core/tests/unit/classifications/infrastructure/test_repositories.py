@@ -1,7 +1,15 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from core.classifications.domain.models import ClassificationCreate
-from core.classifications.infrastructure.repositories import InMemoryClassificationRepository
+from core.classifications.domain.models import Category, Classification, ClassificationCategory, ClassificationCreate
+from core.classifications.infrastructure.repositories import (
+    ColumnarClassificationRepository,
+    InMemoryClassificationRepository,
+    SQLiteClassificationRepository,
+)
 
 
 def test_in_memory_classification_repository_get_classification_by_id(classifications_dict):
@@ -50,4 +58,304 @@ def test_in_memory_classification_repository_find_by_call_id(classifications_dic
 def test_in_memory_classification_repository_find_by_call_id_raises_no_classifications_found_error(classifications_dict):
     repo = InMemoryClassificationRepository(classifications_dict)
     with pytest.raises(ValueError):
-        repo.find_by_call_id("non_existent_call")
\ No newline at end of file
+        repo.find_by_call_id("non_existent_call")
+
+def test_in_memory_classification_repository_does_not_share_state_between_instances():
+    first = InMemoryClassificationRepository()
+    first.create(ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"}))
+
+    with pytest.raises(ValueError):
+        InMemoryClassificationRepository().get_by_id(1)
+
+def test_in_memory_classification_repository_allocates_ids_after_preloaded_records(classifications_dict):
+    repo = InMemoryClassificationRepository(classifications_dict)
+    new_classification = repo.create(
+        ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"})
+    )
+    assert new_classification.id == 3
+    assert [c.id for c in repo.find_by_call_id("call_1")] == [1, 3]
+
+def test_in_memory_classification_repository_keeps_call_id_index_consistent(classifications_dict):
+    repo = InMemoryClassificationRepository(classifications_dict)
+    classification = repo.get_by_id(1).model_copy(update={"call_id": "call_9"})
+
+    repo.update(classification)
+    repo.delete(2)
+
+    assert repo.get_by_id(1).call_id == "call_9"
+    assert [c.id for c in repo.find_by_call_id("call_9")] == [1]
+    for call_id in ("call_1", "call_2"):
+        with pytest.raises(ValueError):
+            repo.find_by_call_id(call_id)
+
+def test_in_memory_classification_repository_allocates_unique_ids_across_threads():
+    repo = InMemoryClassificationRepository()
+    data = ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        created = list(executor.map(lambda _: repo.create(data), range(1_000)))
+
+    assert sorted(c.id for c in created) == list(range(1, 1_001))
+    assert len(repo.find_by_call_id("call_1")) == 1_000
+
+def test_sqlite_classification_repository_crud_round_trip(sqlite_classification_repo):
+    """
+    Tests that a classification can be created, read, updated and deleted.
+    """
+    # Arrange
+    repo = sqlite_classification_repo
+    created = repo.create(ClassificationCreate(call_id="call_1", classification_category={"category": "COMMERCIAL"}))
+
+    # Act
+    fetched = repo.get_by_id(created.id)
+    repo.update(fetched.model_copy(update={"classification_category": ClassificationCategory(category=Category.FOLLOWING)}))
+    updated = repo.get_by_id(created.id)
+    repo.delete(created.id)
+
+    # Assert
+    assert fetched == created
+    assert updated.classification_category.category == Category.FOLLOWING
+    with pytest.raises(ValueError):
+        repo.get_by_id(created.id)
+
+def test_sqlite_classification_repository_raises_not_found_errors(sqlite_classification_repo):
+    missing = Classification(id=999, call_id="call_1", classification_category={"category": "FOLLOWING"})
+    with pytest.raises(ValueError):
+        sqlite_classification_repo.find_by_call_id("non_existent_call")
+    with pytest.raises(ValueError):
+        sqlite_classification_repo.update(missing)
+    with pytest.raises(ValueError):
+        sqlite_classification_repo.delete(999)
+
+def test_sqlite_classification_repository_create_many_assigns_ids_in_order(sqlite_classification_repo):
+    data = [
+        ClassificationCreate(call_id=f"call_{index % 3}", classification_category={"category": "FOLLOWING"})
+        for index in range(9)
+    ]
+
+    created = sqlite_classification_repo.create_many(data)
+
+    assert [c.id for c in created] == list(range(1, 10))
+    assert sqlite_classification_repo.find_by_call_id("call_1") == [created[1], created[4], created[7]]
+
+def test_sqlite_classification_repository_closes_a_thread_connection_when_the_thread_exits(sqlite_classification_repo):
+    connections = []
+
+    def read():
+        sqlite_classification_repo.find_page()
+        connections.append(sqlite_classification_repo._connection())
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+    assert sqlite_classification_repo.find_page() == []
+
+def test_sqlite_classification_repository_persists_across_instances(tmp_path):
+    path = str(tmp_path / "classifications.db")
+    first = SQLiteClassificationRepository(path)
+    created = first.create(ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"}))
+    first.delete(first.create(created).id)
+    first.close()
+
+    second = SQLiteClassificationRepository(path)
+    try:
+        assert second.find_by_call_id("call_1") == [created]
+        # Deleted IDs are never reused.
+        assert second.create(created).id == created.id + 2
+    finally:
+        second.close()
+
+def test_sqlite_classification_repository_allocates_unique_ids_across_threads(sqlite_classification_repo):
+    data = ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        singles = list(executor.map(lambda _: sqlite_classification_repo.create(data), range(200)))
+        batches = list(executor.map(lambda _: sqlite_classification_repo.create_many([data] * 10), range(20)))
+
+    ids = [c.id for c in singles] + [c.id for batch in batches for c in batch]
+    assert sorted(ids) == list(range(1, 401))
+    assert [c.id for c in sqlite_classification_repo.find_by_call_id("call_1")] == list(range(1, 401))
+
+@pytest.fixture(name="bulk_repo", params=["in_memory", "columnar", "sqlite"])
+def _bulk_repo_fixture(request):
+    """Provides each ClassificationRepository implementation in turn."""
+    if request.param == "in_memory":
+        return InMemoryClassificationRepository()
+    if request.param == "columnar":
+        return ColumnarClassificationRepository(initial_capacity=2)
+    return request.getfixturevalue("sqlite_classification_repo")
+
+def test_classification_repository_bulk_operations(bulk_repo):
+    """
+    Tests that create_many, get_many and delete_many keep input order and
+    stay consistent with the single-entity reads.
+    """
+    # Arrange
+    data = [
+        ClassificationCreate(call_id=f"call_{index % 2}", classification_category={"category": "FOLLOWING"})
+        for index in range(6)
+    ]
+
+    # Act
+    created = bulk_repo.create_many(data)
+    fetched = bulk_repo.get_many([6, 1, 3])
+    bulk_repo.delete_many([1, 3, 5])
+
+    # Assert
+    assert [c.id for c in created] == [1, 2, 3, 4, 5, 6]
+    assert [c.call_id for c in created] == [item.call_id for item in data]
+    assert fetched == [created[5], created[0], created[2]]
+    assert bulk_repo.find_by_call_id("call_1") == [created[1], created[3], created[5]]
+    with pytest.raises(ValueError):
+        bulk_repo.find_by_call_id("call_0")
+    assert bulk_repo.create_many([]) == []
+
+def test_classification_repository_bulk_operations_fail_atomically(bulk_repo):
+    created = bulk_repo.create_many(
+        [ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"})] * 3
+    )
+
+    with pytest.raises(ValueError):
+        bulk_repo.get_many([1, 999])
+    with pytest.raises(ValueError):
+        bulk_repo.delete_many([1, 999])
+
+    assert bulk_repo.get_many([1, 2, 3]) == created
+
+def test_columnar_classification_repository_keeps_call_chains_in_id_order():
+    """
+    Tests that find_by_call_id returns records in ID order after updates
+    move them between calls and deletes remove them.
+    """
+    # Arrange
+    repo = ColumnarClassificationRepository(initial_capacity=1)
+    created = repo.create_many(
+        [
+            ClassificationCreate(call_id=call_id, classification_category={"category": "COMMERCIAL"})
+            for call_id in ("call_1", "call_2", "call_1", "call_2", "call_1")
+        ]
+    )
+
+    # Act
+    repo.update(created[1].model_copy(update={"call_id": "call_1"}))
+    repo.update(created[4].model_copy(update={"call_id": "call_3"}))
+    repo.delete(1)
+
+    # Assert
+    assert [c.id for c in repo.find_by_call_id("call_1")] == [2, 3]
+    assert [c.id for c in repo.find_by_call_id("call_2")] == [4]
+    assert [c.id for c in repo.find_by_call_id("call_3")] == [5]
+    assert repo.create(created[0]).id == 6
+
+def test_columnar_classification_repository_counts_by_category():
+    repo = ColumnarClassificationRepository()
+    created = repo.create_many(
+        [
+            ClassificationCreate(call_id=f"call_{index}", classification_category={"category": category})
+            for index, category in enumerate(["COMMERCIAL", "FOLLOWING", "FOLLOWING", "COMMERCIAL"])
+        ]
+    )
+    repo.delete(created[0].id)
+    repo.update(created[3].model_copy(update={"classification_category": ClassificationCategory(category=Category.FOLLOWING)}))
+
+    assert repo.count_by_category() == {Category.COMMERCIAL: 0, Category.FOLLOWING: 3}
+
+def test_columnar_classification_repository_returns_copies():
+    repo = ColumnarClassificationRepository()
+    created = repo.create(ClassificationCreate(call_id="call_1", classification_category={"category": "COMMERCIAL"}))
+
+    created.classification_category.category = Category.FOLLOWING
+
+    assert repo.get_by_id(created.id).classification_category.category == Category.COMMERCIAL
+
+def test_columnar_classification_repository_pages_a_call_from_any_cursor():
+    repo = ColumnarClassificationRepository()
+    repo.create_many(
+        [
+            ClassificationCreate(call_id=f"call_{index % 2}", classification_category={"category": "COMMERCIAL"})
+            for index in range(10)
+        ]
+    )
+    repo.delete(5)
+
+    # The cursor is one of the call's records, another call's record, or deleted.
+    assert [c.id for c in repo.find_page(after_id=3, limit=2, call_id="call_0")] == [7, 9]
+    assert [c.id for c in repo.find_page(after_id=4, limit=2, call_id="call_0")] == [7, 9]
+    assert [c.id for c in repo.find_page(after_id=5, limit=2, call_id="call_0")] == [7, 9]
+    assert [c.id for c in repo.find_page(after_id=0, limit=3, call_id="call_0")] == [1, 3, 7]
+    assert repo.find_page(after_id=9, call_id="call_0") == []
+
+def test_classification_repository_saves_records_with_reserved_ids(bulk_repo):
+    """
+    Tests that reserved IDs are skipped by `create` and can be saved later,
+    in any order.
+    """
+    # Arrange
+    reserved = bulk_repo.reserve_ids(3)
+    created = bulk_repo.create(ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"}))
+    saved = [
+        Classification(id=id, call_id="call_1", classification_category={"category": "COMMERCIAL"})
+        for id in reversed(reserved)
+    ]
+
+    # Act
+    bulk_repo.save_many(saved)
+
+    # Assert
+    assert list(reserved) == [1, 2, 3]
+    assert created.id == 4
+    assert [c.id for c in bulk_repo.find_by_call_id("call_1")] == [1, 2, 3, 4]
+    assert bulk_repo.get_many([3, 1]) == [saved[0], saved[2]]
+
+def test_classification_repository_streams_records_in_keyset_pages(bulk_repo):
+    """
+    Tests that iter_all and iter_by stream every matching record in ID order,
+    page by page, and can resume from a cursor.
+    """
+    # Arrange
+    categories = ["COMMERCIAL", "FOLLOWING", "FOLLOWING"]
+    created = bulk_repo.create_many(
+        [
+            ClassificationCreate(call_id=f"call_{index % 4}", classification_category={"category": categories[index % 3]})
+            for index in range(30)
+        ]
+    )
+    bulk_repo.delete_many([2, 3])
+
+    # Act
+    scan = bulk_repo.iter_all(page_size=4)
+    by_call = list(bulk_repo.iter_by(call_id="call_1", page_size=3))
+    by_call_and_category = list(bulk_repo.iter_by(call_id="call_1", category=Category.COMMERCIAL, page_size=2))
+    resumed = list(bulk_repo.iter_by(category=Category.FOLLOWING, page_size=5, after_id=20))
+
+    # Assert
+    assert not isinstance(scan, list)
+    assert list(scan) == [c for c in created if c.id not in (2, 3)]
+    assert by_call == [c for c in created if c.call_id == "call_1" and c.id != 2]
+    assert by_call_and_category == [c for c in by_call if c.classification_category.category == Category.COMMERCIAL]
+    assert resumed == [
+        c for c in created if c.id > 20 and c.classification_category.category == Category.FOLLOWING
+    ]
+    assert list(bulk_repo.iter_by(call_id="non_existent_call")) == []
+    with pytest.raises(ValueError):
+        bulk_repo.iter_all(page_size=0)
+
+def test_classification_repository_scan_tolerates_concurrent_changes(bulk_repo):
+    created = bulk_repo.create_many(
+        [ClassificationCreate(call_id="call_1", classification_category={"category": "FOLLOWING"})] * 6
+    )
+    seen = []
+
+    for classification in bulk_repo.iter_all(page_size=2):
+        seen.append(classification.id)
+        if classification.id == 1:
+            bulk_repo.delete(4)
+            bulk_repo.create(created[0])
+
+    assert seen == [1, 2, 3, 5, 6, 7]
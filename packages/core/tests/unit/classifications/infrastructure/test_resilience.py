@@ -0,0 +1,215 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import openai
+import pytest
+
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.resilience import (
+    AIMDConcurrencyLimiter,
+    RateLimitedClassifierGateway,
+    RateLimiter,
+    TokenBucket,
+    backoff_delay,
+    retry_after_seconds,
+)
+
+
+def _rate_limit_error(headers=None) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_token_bucket_reserves_into_debt_and_reports_the_wait():
+    now = [0.0]
+    bucket = TokenBucket(capacity=2, refill_per_second=1, clock=lambda: now[0])
+
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    now[0] = 4.0
+    assert bucket.reserve(1) == 0.0
+
+
+def test_rate_limiter_waits_for_the_tightest_quota():
+    """
+    Tests that a request waits for whichever of the RPM and TPM buckets
+    is further from covering it.
+    """
+    # Arrange
+    now = [0.0]
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60, clock=lambda: now[0])
+    sleeps = []
+
+    # Act
+    limiter.acquire(60, sleep=sleeps.append)
+    limiter.acquire(30, sleep=sleeps.append)
+
+    # Assert
+    assert sleeps == [pytest.approx(30.0)]
+
+
+def test_retry_after_seconds_reads_openai_and_standard_headers():
+    assert retry_after_seconds(_rate_limit_error({"retry-after-ms": "1500"})) == pytest.approx(1.5)
+    assert retry_after_seconds(_rate_limit_error({"retry-after": "7"})) == pytest.approx(7.0)
+    assert retry_after_seconds(_rate_limit_error({"retry-after": "Thu, 01 Jan 1970 00:00:00 GMT"})) == 0.0
+    assert retry_after_seconds(_rate_limit_error()) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_backoff_delay_is_jittered_capped_and_honours_retry_after():
+    assert backoff_delay(3, base_delay=1, max_delay=4, rng=lambda: 0.5) == 2.0
+    assert backoff_delay(0, base_delay=1, max_delay=4, retry_after=3, rng=lambda: 0.5) == 3.0
+
+
+def test_aimd_concurrency_limiter_adapts_to_latency_and_rate_limits():
+    """
+    Tests that the limit grows additively on healthy responses and shrinks
+    multiplicatively on 429s and slow responses.
+    """
+    # Arrange
+    limiter = AIMDConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=8, latency_target=1.0)
+
+    # Act / Assert
+    for _ in range(4):
+        limiter.on_success(latency=0.1)
+    assert limiter.limit == 4  # 4 + 4 * ~1/4 just shy of 5
+    for _ in range(2):
+        limiter.on_success(latency=0.1)
+    assert limiter.limit == 5
+    limiter.on_rate_limited()
+    assert limiter.limit == 2
+    limiter.on_success(latency=10.0)
+    assert limiter.limit == 2
+    for _ in range(5):
+        limiter.on_rate_limited()
+    assert limiter.limit == 1
+
+
+def test_aimd_concurrency_limiter_caps_async_requests_in_flight():
+    limiter = AIMDConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = [0]
+
+    async def request():
+        await limiter.acquire_async()
+        try:
+            peak[0] = max(peak[0], limiter.in_flight)
+            await asyncio.sleep(0.01)
+        finally:
+            limiter.release()
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+
+    assert peak[0] == 2
+    assert limiter.in_flight == 0
+
+
+def test_aimd_concurrency_limiter_passes_on_the_wake_up_of_a_cancelled_waiter():
+    limiter = AIMDConcurrencyLimiter(initial_limit=1, max_limit=1)
+
+    async def main():
+        await limiter.acquire_async()
+        first = asyncio.ensure_future(limiter.acquire_async())
+        second = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        # `first` is woken up, then cancelled before it can resume.
+        limiter.release()
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1.0)
+
+    asyncio.run(main())
+
+    assert limiter.in_flight == 1
+
+
+def test_aimd_concurrency_limiter_cuts_once_for_a_burst_of_rate_limits():
+    """
+    Tests that 429s for requests admitted before the last decrease are
+    ignored, so a window of concurrent rejections halves the limit once.
+    """
+    # Arrange
+    limiter = AIMDConcurrencyLimiter(initial_limit=8, max_limit=8)
+    tickets = [limiter.acquire() for _ in range(8)]
+
+    # Act
+    for ticket in tickets:
+        limiter.on_rate_limited(ticket)
+        limiter.release()
+
+    # Assert
+    assert limiter.limit == 4
+    limiter.on_rate_limited(limiter.acquire())
+    assert limiter.limit == 2
+
+
+def test_rate_limited_classifier_gateway_retries_after_rate_limit():
+    """
+    Tests that a 429 is retried after the server-requested delay and
+    halves the concurrency limit.
+    """
+    # Arrange
+    classifier = MagicMock()
+    classifier.model = "gpt-4o"
+    classifier.classify.side_effect = [
+        _rate_limit_error({"retry-after": "2"}),
+        ClassificationCategory(category=Category.COMMERCIAL),
+    ]
+    sleeps = []
+    gateway = RateLimitedClassifierGateway(
+        classifier=classifier,
+        rate_limiter=RateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000),
+        concurrency_limiter=AIMDConcurrencyLimiter(initial_limit=8),
+        rng=lambda: 0.0,
+        sleep=sleeps.append,
+    )
+
+    # Act
+    result = gateway.classify(text="pricing", category=ClassificationCategory)
+
+    # Assert
+    assert result.category == Category.COMMERCIAL
+    assert classifier.classify.call_count == 2
+    assert sleeps == [2.0]
+    assert gateway.rate_limited == 1
+    assert gateway.concurrency_limit == 4
+    assert gateway.model == "gpt-4o"
+
+
+def test_rate_limited_classifier_gateway_gives_up_after_max_retries():
+    classifier = MagicMock()
+    classifier.classify.side_effect = _rate_limit_error()
+    gateway = RateLimitedClassifierGateway(
+        classifier=classifier,
+        rate_limiter=RateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000),
+        max_retries=2,
+        sleep=lambda _: None,
+    )
+
+    with pytest.raises(openai.RateLimitError):
+        gateway.classify(text="pricing", category=ClassificationCategory)
+
+    assert classifier.classify.call_count == 3
+
+
+def test_rate_limited_classifier_gateway_aclassify_awaits_wrapped_classifier():
+    classifier = MagicMock()
+    classifier.aclassify = AsyncMock(
+        side_effect=[_rate_limit_error({"retry-after-ms": "1"}), ClassificationCategory(category=Category.FOLLOWING)]
+    )
+    gateway = RateLimitedClassifierGateway(
+        classifier=classifier,
+        rate_limiter=RateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000),
+        rng=lambda: 0.0,
+    )
+
+    result = asyncio.run(gateway.aclassify(text="follow up", category=ClassificationCategory))
+
+    assert result.category == Category.FOLLOWING
+    assert classifier.aclassify.await_count == 2
+    classifier.classify.assert_not_called()
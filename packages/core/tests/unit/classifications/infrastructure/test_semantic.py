@@ -0,0 +1,177 @@
+import asyncio
+from enum import Enum
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+from pydantic import BaseModel
+
+from core.classifications.domain.models import Category, ClassificationCategory
+from core.classifications.infrastructure.semantic import (
+    HashingEmbedder,
+    SemanticCacheGateway,
+    VectorIndex,
+    _merge_tail,
+)
+
+
+def _unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _classifier(category=Category.FOLLOWING):
+    classifier = MagicMock()
+    classifier.classify.return_value = ClassificationCategory(category=category)
+    classifier.classify_many.side_effect = lambda texts, category: [
+        category(category=Category.FOLLOWING) for _ in texts
+    ]
+    return classifier
+
+
+def test_hashing_embedder_scores_paraphrases_as_similar():
+    vectors = HashingEmbedder().embed([
+        "I am calling to follow up on my order",
+        "I am calling to follow up on my order please",
+        "What is the price of the premium plan",
+    ])
+
+    assert vectors[0] @ vectors[1] > 0.9
+    assert vectors[0] @ vectors[2] < 0.5
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-6)
+
+
+def test_vector_index_finds_the_same_neighbours_as_an_exact_scan():
+    """
+    Tests that LSH lookups agree with a blocked exact scan, across both the
+    indexed rows and the unindexed tail of recent inserts.
+    """
+    # Arrange
+    rng = np.random.default_rng(0)
+    vectors = _unit(rng.standard_normal((5_000, 32)).astype(np.float32))
+    index = VectorIndex(dim=32, capacity=16, n_tables=16, n_bits=8, tail_size=1_000)
+    index.add(vectors, np.arange(5_000) % 2)
+
+    # Act
+    results = [index.search(vector) for vector in vectors[::250]]
+
+    # Assert
+    assert len(index) == 5_000
+    for (label, score), query in zip(results, vectors[::250]):
+        assert (label, score) == (index.search_exact(query, block_size=512)[0], index.search_exact(query)[1])
+        assert score > 0.999
+
+
+def test_vector_index_reopens_memory_mapped_files(tmp_path):
+    path = str(tmp_path / "index")
+    vectors = _unit(np.eye(4, dtype=np.float32) + 0.1)
+    index = VectorIndex(dim=4, path=path, capacity=2, n_tables=2, n_bits=2)
+    index.add(vectors, [0, 1, 0, 1])
+    index.flush()
+
+    reopened = VectorIndex(dim=4, path=path, n_tables=2, n_bits=2)
+
+    assert len(reopened) == 4
+    assert reopened.search(vectors[3])[0] == 1
+
+
+def test_vector_index_merges_the_tail_like_a_full_sort():
+    rng = np.random.default_rng(1)
+    codes = rng.integers(0, 16, size=(300, 1)).astype(np.uint16)
+    order, starts = np.empty(0, dtype=np.int32), np.zeros(17, dtype=np.int64)
+
+    for first_id in range(0, 300, 70):
+        order, starts = _merge_tail(order, starts, codes[first_id:first_id + 70, 0], first_id)
+
+    np.testing.assert_array_equal(order, np.argsort(codes[:, 0], kind="stable"))
+    np.testing.assert_array_equal(starts, np.concatenate(([0], np.cumsum(np.bincount(codes[:, 0], minlength=16)))))
+
+
+def test_semantic_cache_gateway_persists_labels_by_value(tmp_path):
+    path = str(tmp_path / "index")
+    texts = ["I am calling to follow up on my order", "What is the price of the premium plan"]
+    classifier = _classifier()
+    classifier.classify_many.side_effect = lambda texts, category: [
+        category(category=Category.FOLLOWING), category(category=Category.COMMERCIAL)
+    ]
+    gateway = SemanticCacheGateway(
+        classifier=classifier, embedder=HashingEmbedder(), index=VectorIndex(dim=256, path=path), label_type=Category
+    )
+    gateway.classify_many(texts=texts, category=ClassificationCategory)
+
+    class Reordered(str, Enum):
+        COMMERCIAL = "COMMERCIAL"
+        NEW = "NEW"
+        FOLLOWING = "FOLLOWING"
+
+    class ReorderedCategory(BaseModel):
+        category: Reordered
+
+    reopened = SemanticCacheGateway(
+        classifier=_classifier(), embedder=HashingEmbedder(), index=VectorIndex(dim=256, path=path), label_type=Reordered
+    )
+
+    results = reopened.classify_many(texts=texts, category=ReorderedCategory)
+
+    assert [result.category for result in results] == [Reordered.FOLLOWING, Reordered.COMMERCIAL]
+    assert reopened.hits == 2
+
+
+def test_semantic_cache_gateway_reuses_labels_of_paraphrases():
+    """
+    Tests that a paraphrase of a classified text is served from the index,
+    while an unrelated text reaches the wrapped classifier.
+    """
+    # Arrange
+    classifier = _classifier()
+    embedder = HashingEmbedder(dim=64)
+    gateway = SemanticCacheGateway(
+        classifier=classifier,
+        embedder=embedder,
+        index=VectorIndex(dim=64),
+        label_type=Category,
+        threshold=0.9,
+    )
+
+    # Act
+    first = gateway.classify(text="I am calling to follow up on my order", category=ClassificationCategory)
+    paraphrase = gateway.classify(
+        text="I am calling to follow up on my order please", category=ClassificationCategory
+    )
+    unrelated = gateway.classify(text="What is the price of the premium plan", category=ClassificationCategory)
+
+    # Assert
+    assert first == paraphrase == unrelated == ClassificationCategory(category=Category.FOLLOWING)
+    assert classifier.classify.call_count == 2
+    assert (gateway.hits, gateway.misses) == (1, 2)
+
+
+def test_semantic_cache_gateway_classify_many_delegates_misses_as_one_batch():
+    classifier = _classifier()
+    gateway = SemanticCacheGateway(
+        classifier=classifier, embedder=HashingEmbedder(), index=VectorIndex(dim=256), label_type=Category
+    )
+    gateway.classify_many(texts=["follow up on order 1"], category=ClassificationCategory)
+
+    results = gateway.classify_many(
+        texts=["follow up on order 1", "a new question"], category=ClassificationCategory
+    )
+
+    assert [result.category for result in results] == [Category.FOLLOWING, Category.FOLLOWING]
+    classifier.classify_many.assert_called_with(texts=["a new question"], category=ClassificationCategory)
+    assert gateway.hits == 1
+
+
+def test_semantic_cache_gateway_delegates_other_output_models():
+    class Sentiment(BaseModel):
+        category: str
+
+    classifier = _classifier()
+    classifier.aclassify = AsyncMock(return_value=Sentiment(category="positive"))
+    index = VectorIndex(dim=256)
+    gateway = SemanticCacheGateway(
+        classifier=classifier, embedder=HashingEmbedder(), index=index, label_type=Category
+    )
+
+    result = asyncio.run(gateway.aclassify(text="price list", category=Sentiment))
+
+    assert result.category == "positive"
+    assert len(index) == 0
@@ -0,0 +1,56 @@
+import json
+import logging
+
+from core.config.logging_config import StructuredFormatter, configure_logging, stop_logging
+
+
+def test_structured_formatter_renders_json_with_extra_fields():
+    record = logging.LogRecord(
+        "plummy.handlers", logging.DEBUG, __file__, 1, "Handler executing processor: %s", ("X",), None
+    )
+    record.processor = "X"
+
+    payload = json.loads(StructuredFormatter().format(record))
+
+    assert payload["level"] == "DEBUG"
+    assert payload["logger"] == "plummy.handlers"
+    assert payload["message"] == "Handler executing processor: X"
+    assert payload["processor"] == "X"
+
+
+def test_configure_logging_with_queue_writes_from_background_listener(capsys):
+    root_logger = logging.getLogger()
+    previous_handlers, previous_level = list(root_logger.handlers), root_logger.level
+    try:
+        listener = configure_logging(level="info", use_queue=True)
+        assert listener is not None
+        logging.getLogger("core.test").info("queued", extra={"call_id": "1"})
+        logging.getLogger("core.test").debug("dropped")
+        stop_logging()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["call_id"] == "1"
+    finally:
+        root_logger.handlers[:] = previous_handlers
+        root_logger.setLevel(previous_level)
+
+
+def test_configure_logging_twice_keeps_one_handler_and_listener():
+    root_logger = logging.getLogger()
+    previous_handlers, previous_level = list(root_logger.handlers), root_logger.level
+    try:
+        first = configure_logging(level="info", use_queue=True)
+        second = configure_logging(level="INFO", use_queue=True)
+        handlers = len(root_logger.handlers)
+        third = configure_logging(level="warning", use_queue=False)
+
+        assert second is first
+        assert handlers == 1
+        assert third is None
+        assert len(root_logger.handlers) == 1
+        assert root_logger.level == logging.WARNING
+    finally:
+        stop_logging()
+        root_logger.handlers[:] = previous_handlers
+        root_logger.setLevel(previous_level)
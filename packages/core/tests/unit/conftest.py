@@ -1,9 +1,22 @@
+import asyncio
+import json
+import re
+import threading
+from types import SimpleNamespace
 from typing import Optional
 from unittest.mock import MagicMock
+
+import httpx
+import openai
 from core.classifications.domain.ports import ClassificationRepository
 import pytest
 
 from core.classifications.domain.models import Category, Classification, ClassificationCategory, ClassificationCreate
+from core.classifications.infrastructure.buffering import WriteBehindClassificationRepository
+from core.classifications.infrastructure.repositories import (
+    InMemoryClassificationRepository,
+    SQLiteClassificationRepository,
+)
 
 # ==============================================================================
 # 1. Mock Classes for Unit Tests
@@ -61,6 +74,153 @@ class MockOpenAIClassifierGateway:
         print("MOCK GATEWAY: 'classify' called.")
         return Category.COMMERCIAL
 
+def categorize_by_keyword(text: str) -> Category:
+    """A deterministic stand-in for the model: anything about prices is commercial."""
+    return Category.COMMERCIAL if "pric" in text.lower() else Category.FOLLOWING
+
+
+def output_response(output: dict) -> SimpleNamespace:
+    """Wraps a JSON-able output in the shape returned by `client.responses.create`."""
+    output_text = json.dumps(output)
+    return SimpleNamespace(
+        status="completed",
+        incomplete_details=None,
+        output=[SimpleNamespace(type="message", content=[SimpleNamespace(type="output_text", text=output_text)])],
+        output_text=output_text,
+    )
+
+
+class FakeResponses:
+    """
+    A local fake of the OpenAI Responses API's `create` endpoint with
+    structured outputs.
+
+    Single-text requests are answered from the user message; packed requests
+    (whose schema has `items`) are answered per "Text N:" section. `max_items`
+    truncates packed answers to simulate a model output that doesn't line up
+    with its inputs.
+    """
+
+    def __init__(self, categorize=categorize_by_keyword, max_items: Optional[int] = None):
+        self.categorize = categorize
+        self.max_items = max_items
+        self.calls = []
+
+    def create(self, *, model, input, text, **kwargs):
+        self.calls.append({"model": model, "input": input, "text": text, **kwargs})
+        user_content = input[-1]["content"]
+        if "items" not in text["format"]["schema"]["properties"]:
+            body = user_content.split("\n\n", 1)[-1]
+            return output_response({"category": self.categorize(body).value})
+
+        texts = re.findall(r"Text \d+:\n(.*?)(?=\n\nText \d+:\n|\Z)", user_content, re.DOTALL)
+        items = [
+            {"category": self.categorize(body).value, "index": index}
+            for index, body in enumerate(texts)
+        ]
+        if self.max_items is not None:
+            items = items[: self.max_items]
+        return output_response({"items": items})
+
+
+class FakeOpenAIClient:
+    """A fake `openai.OpenAI` client exposing only `responses.create`."""
+
+    def __init__(self, **kwargs):
+        self.responses = FakeResponses(**kwargs)
+
+
+class FakeAsyncResponses:
+    """
+    An async fake of the Responses API that answers like `FakeResponses`
+    after `delay` seconds and records the peak number of concurrent requests.
+    """
+
+    def __init__(self, delay: float = 0.01, **kwargs):
+        self._responses = FakeResponses(**kwargs)
+        self.calls = self._responses.calls
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._responses.create(**params)
+        finally:
+            self.in_flight -= 1
+
+
+class FakeAsyncOpenAIClient:
+    """A fake `openai.AsyncOpenAI` client exposing only `responses.create`."""
+
+    def __init__(self, **kwargs):
+        self.responses = FakeAsyncResponses(**kwargs)
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class ScriptedOpenAIServer:
+    """
+    A local fake of the Responses API at the HTTP layer, for real SDK clients.
+
+    `script` maps a model name to the outputs it returns in turn, e.g.
+    `{"category": "COMMERCIAL", "confidence": 0.4}`. Requests are recorded.
+    """
+
+    def __init__(self, script: Optional[dict[str, list[dict]]] = None):
+        self.script = script or {}
+        self.requests = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        output = self.script[body["model"]].pop(0)
+        return httpx.Response(200, json={
+            "id": f"resp_{len(self.requests)}",
+            "object": "response",
+            "created_at": 0,
+            "model": body["model"],
+            "status": "completed",
+            "output": [{
+                "type": "message",
+                "id": f"msg_{len(self.requests)}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": json.dumps(output), "annotations": []}],
+            }],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+        })
+
+    def client(self) -> openai.OpenAI:
+        return openai.OpenAI(
+            api_key="test", http_client=httpx.Client(transport=httpx.MockTransport(self.handle))
+        )
+
+    def async_client(self) -> openai.AsyncOpenAI:
+        return openai.AsyncOpenAI(
+            api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        )
+
+class GatedClassificationRepository(InMemoryClassificationRepository):
+    """An in-memory repository whose `save_many` waits until `gate` is set and records its batch sizes."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.batch_sizes: list[int] = []
+
+    def save_many(self, classifications) -> None:
+        self.gate.wait()
+        self.batch_sizes.append(len(classifications))
+        super().save_many(classifications)
+
 # ==============================================================================
 # 2. Pytest Fixtures
 # ==============================================================================
@@ -94,6 +254,46 @@ def _classifications_dict() -> dict[int, Classification]:
         ),
     }
     
+@pytest.fixture(name="sqlite_classification_repo")
+def _sqlite_classification_repo_fixture(tmp_path) -> SQLiteClassificationRepository:
+    """Provides a SQLiteClassificationRepository on a fresh database file."""
+    repo = SQLiteClassificationRepository(str(tmp_path / "classifications.db"))
+    yield repo
+    repo.close()
+
+@pytest.fixture(name="gated_classification_repo")
+def _gated_classification_repo_fixture() -> GatedClassificationRepository:
+    """Provides an in-memory repository whose writes can be held back."""
+    return GatedClassificationRepository()
+
+@pytest.fixture(name="write_behind_repo")
+def _write_behind_repo_fixture(gated_classification_repo) -> WriteBehindClassificationRepository:
+    """
+    Provides a write-behind repository over `gated_classification_repo` that
+    only writes full batches of 10 or on `flush`.
+    """
+    repo = WriteBehindClassificationRepository(
+        repository=gated_classification_repo, max_batch_size=10, flush_interval=60.0
+    )
+    yield repo
+    gated_classification_repo.gate.set()
+    repo.close()
+
+@pytest.fixture(name="fake_openai_client")
+def _fake_openai_client_fixture() -> FakeOpenAIClient:
+    """Provides a local fake of the OpenAI Responses API."""
+    return FakeOpenAIClient()
+
+@pytest.fixture(name="fake_async_openai_client")
+def _fake_async_openai_client_fixture() -> FakeAsyncOpenAIClient:
+    """Provides a local async fake of the OpenAI Responses API."""
+    return FakeAsyncOpenAIClient()
+
+@pytest.fixture(name="scripted_openai_server")
+def _scripted_openai_server_fixture() -> ScriptedOpenAIServer:
+    """Provides a local HTTP-level fake of the Responses API with scripted outputs."""
+    return ScriptedOpenAIServer()
+
 @pytest.fixture(name="llm_classifier")
 def _llm_classifier_fixture() -> MagicMock:
     """
@@ -0,0 +1,53 @@
+"""
+Compares the linked `StepHandler` chain with the compiled `Pipeline` executor.
+
+Run from the repository root:
+
+    uv run python packages/plummy/benchmarks/bench_pipelines.py
+"""
+import timeit
+
+from plummy.adapters import FunctionalProcessor
+from plummy.handlers import StepHandler
+from plummy.pipelines import Pipeline
+
+CHAIN_LENGTHS = (1, 10, 100, 1000)
+EVENT = {"type": "newcall", "text": "Customer called to inquire about pricing."}
+
+
+def build_chain(length: int) -> StepHandler:
+    processor = FunctionalProcessor(
+        can_handle=lambda data: data.get("type") == "newcall",
+        process=lambda data: data,
+    )
+    start = current = StepHandler(processor=processor)
+    for _ in range(length - 1):
+        current = current.set_next(StepHandler(processor=processor))
+    return start
+
+
+def time_per_event(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    print(f"{'steps':>6} {'linked (us)':>12} {'compiled (us)':>14} {'speedup':>8}")
+    for length in CHAIN_LENGTHS:
+        chain = build_chain(length)
+        compiled = Pipeline.from_handler(chain).compile()
+        number = max(1, 10_000 // length)
+
+        compiled_time = time_per_event(lambda: compiled.handle(EVENT), number)
+        try:
+            linked_time = time_per_event(lambda: chain.handle(EVENT), number)
+        except RecursionError:
+            print(f"{length:>6} {'RecursionError':>12} {compiled_time * 1e6:>14.2f} {'-':>8}")
+            continue
+        print(
+            f"{length:>6} {linked_time * 1e6:>12.2f} {compiled_time * 1e6:>14.2f} "
+            f"{linked_time / compiled_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ the object-oriented structure of the handlers, following the Adapter design patt
 """
 
 from dataclasses import dataclass
-from typing import Callable, Any, Generic
+from typing import Awaitable, Callable, Any, Generic, Optional, Sequence
 from .protocols import DataType
 
 
@@ -19,7 +19,25 @@ class FunctionalProcessor(Generic[DataType]):
     functions and wrapping them in a single object that the `StepHandler`
     can work with. This allows the core business logic to remain fully decoupled
     from the framework.
+
+    The optional `can_handle_many` and `process_many` functions make it a
+    `BatchProcessable`; when omitted, handlers fall back to per-item calls.
     """
 
     can_handle: Callable[[DataType], bool]
     process: Callable[[DataType], Any]
+    can_handle_many: Optional[Callable[[Sequence[DataType]], Sequence[bool]]] = None
+    process_many: Optional[Callable[[Sequence[DataType]], Sequence[Any]]] = None
+
+
+@dataclass
+class AsyncFunctionalProcessor(Generic[DataType]):
+    """
+    An adapter that makes standalone functions compatible with the `AsyncProcessable` protocol.
+
+    It is the asynchronous twin of `FunctionalProcessor`: `can_handle` is a plain
+    predicate and `process` is a coroutine function awaited by the `AsyncStepHandler`.
+    """
+
+    can_handle: Callable[[DataType], bool]
+    process: Callable[[DataType], Awaitable[Any]]
@@ -0,0 +1,251 @@
+"""
+Provides a DAG (directed acyclic graph) pipeline with concurrent stages.
+
+A `Handler` chain runs every step in strict sequence. A `DAGPipeline` instead
+lets each step declare the inputs it depends on, namely the pipeline input
+and/or the outputs of earlier steps. Every step starts as soon as its inputs
+are ready, so independent branches run concurrently on a thread pool (`run`)
+or on the event loop (`arun`). End-to-end latency is then the critical path
+rather than the sum of all steps. A merge function combines the step outputs
+into the final result.
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Sequence
+from .handlers import Handler
+from .protocols import DataType
+
+
+def merge_into_event(data: Any, outputs: Mapping[str, Any]) -> Any:
+    """
+    The default merge: adds every step output to a dict event under the step's name.
+
+    Args:
+        data: The pipeline input.
+        outputs: The output of every step, keyed by step name.
+
+    Returns:
+        A new dict with the event's fields plus one field per step.
+    """
+    return {**data, **outputs}
+
+
+@dataclass(frozen=True)
+class DAGStep:
+    """A named step, its callable and the names of the inputs it consumes."""
+
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...]
+    is_async: bool
+
+
+class DAGPipeline(Handler[DataType]):
+    """
+    A pipeline whose steps form a DAG and run concurrently where possible.
+
+    Steps are called positionally with the values of their `inputs`, in order.
+    An input is either `input_name` (the data passed to the pipeline) or the
+    name of a previously added step. Because inputs must already exist when a
+    step is added, the graph can't contain cycles.
+
+    Example:
+        dag = DAGPipeline()
+        dag.add_step("text", lambda event: event["text"])
+        dag.add_step("category", classify, inputs=("text",))
+        dag.add_step("sentiment", analyse_sentiment, inputs=("text",))
+        result = dag.handle(event)  # category and sentiment run in parallel
+    """
+
+    def __init__(
+        self,
+        merge: Callable[[Any, Mapping[str, Any]], Any] = merge_into_event,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        input_name: str = "input",
+    ):
+        """
+        Initializes an empty DAG pipeline.
+
+        Args:
+            merge: Combines the pipeline input and all step outputs into the result.
+            executor: The executor used by `run`. Defaults to a lazily created
+                `ThreadPoolExecutor` owned by this pipeline.
+            max_workers: The worker count for the default executor.
+            input_name: The name under which steps refer to the pipeline input.
+        """
+        self._merge = merge
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._input_name = input_name
+        self._steps: dict[str, DAGStep] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._dependency_counts: dict[str, int] = {}
+
+    def add_step(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Sequence[str] | None = None,
+    ) -> "DAGPipeline[DataType]":
+        """
+        Adds a step to the graph.
+
+        Args:
+            name: A unique step name; its output is stored under this name.
+            func: A function or coroutine function called with the input values.
+            inputs: The names this step depends on. Defaults to the pipeline input.
+
+        Returns:
+            The pipeline itself, to allow for chaining calls.
+
+        Raises:
+            ValueError: If the name is taken or an input is unknown.
+        """
+        inputs = tuple(inputs) if inputs is not None else (self._input_name,)
+        if name == self._input_name or name in self._steps:
+            raise ValueError(f"Step name '{name}' is already in use")
+        for input_name in inputs:
+            if input_name != self._input_name and input_name not in self._steps:
+                raise ValueError(f"Step '{name}' depends on unknown input '{input_name}'")
+
+        upstream = {input_name for input_name in inputs if input_name != self._input_name}
+        for input_name in upstream:
+            self._dependents[input_name].append(name)
+        self._dependents[name] = []
+        self._dependency_counts[name] = len(upstream)
+        self._steps[name] = DAGStep(
+            name=name, func=func, inputs=inputs, is_async=inspect.iscoroutinefunction(func)
+        )
+        return self
+
+    def handle(self, data: DataType) -> DataType:
+        """
+        Runs the DAG on the data, then passes the merged result down the chain.
+
+        Args:
+            data: The data being passed through the pipeline.
+
+        Returns:
+            The merged result after it has been processed by the rest of the chain.
+        """
+        return super().handle(self.run(data))
+
+    def run(self, data: DataType) -> Any:
+        """
+        Runs the DAG on a thread pool and merges the step outputs.
+
+        Coroutine steps are created and run to completion with `asyncio.run`
+        inside their worker thread, so a step cancelled before it starts leaves
+        no coroutine behind. If a step raises, steps that haven't started are
+        cancelled and the exception is re-raised. Call `close` to shut down
+        the default executor.
+
+        Args:
+            data: The pipeline input.
+
+        Returns:
+            The result of the merge function.
+        """
+        executor = self._get_executor()
+        values: dict[str, Any] = {self._input_name: data}
+        pending = dict(self._dependency_counts)
+        running: dict[Future, DAGStep] = {}
+
+        def start(step: DAGStep) -> None:
+            args = [values[input_name] for input_name in step.inputs]
+            if step.is_async:
+                running[executor.submit(lambda: asyncio.run(step.func(*args)))] = step
+            else:
+                running[executor.submit(step.func, *args)] = step
+
+        for step in self._ready_steps(pending):
+            start(step)
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    values[step.name] = future.result()
+                    for dependent in self._release(step.name, pending):
+                        start(dependent)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+        return self._merge(data, self._outputs(values))
+
+    async def arun(self, data: DataType) -> Any:
+        """
+        Runs the DAG on the running event loop and merges the step outputs.
+
+        Coroutine steps are awaited directly; synchronous steps run in a worker
+        thread via `asyncio.to_thread`. If a step raises, the other in-flight
+        steps are cancelled and the exception is re-raised.
+
+        Args:
+            data: The pipeline input.
+
+        Returns:
+            The result of the merge function.
+        """
+        values: dict[str, Any] = {self._input_name: data}
+        pending = dict(self._dependency_counts)
+        running: dict[asyncio.Task, DAGStep] = {}
+
+        def start(step: DAGStep) -> None:
+            args = [values[input_name] for input_name in step.inputs]
+            if step.is_async:
+                running[asyncio.ensure_future(step.func(*args))] = step
+            else:
+                running[asyncio.ensure_future(asyncio.to_thread(step.func, *args))] = step
+
+        for step in self._ready_steps(pending):
+            start(step)
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    values[step.name] = task.result()
+                    for dependent in self._release(step.name, pending):
+                        start(dependent)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            raise
+
+        return self._merge(data, self._outputs(values))
+
+    def close(self) -> None:
+        """Shuts down the default executor, if this pipeline created one."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="plummy-dag"
+            )
+        return self._executor
+
+    def _ready_steps(self, pending: dict[str, int]) -> list[DAGStep]:
+        return [self._steps[name] for name, count in pending.items() if count == 0]
+
+    def _release(self, name: str, pending: dict[str, int]) -> list[DAGStep]:
+        """Marks a step as done and returns the dependents that became ready."""
+        ready = []
+        for dependent in self._dependents[name]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(self._steps[dependent])
+        return ready
+
+    def _outputs(self, values: dict[str, Any]) -> dict[str, Any]:
+        return {name: values[name] for name in self._steps}
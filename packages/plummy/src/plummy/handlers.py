@@ -3,12 +3,36 @@ Provides the structural components for the Chain of Responsibility pattern.
 
 This module contains the `Handler` abstract base class, which defines the
 stateful "link" in a chain, and the `StepHandler`, a concrete implementation
-that executes a business logic step.
+that executes a business logic step. `RouterHandler` dispatches events to
+processors by a discriminator key instead of scanning predicates.
+`AsyncHandler` and `AsyncStepHandler` are the asynchronous counterparts,
+meant to run on an event loop.
 """
 
+import asyncio
+import functools
+import inspect
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Generic
-from .protocols import Processable, DataType
+from typing import Any, Callable, Generic, Hashable, Mapping, Sequence
+from .metrics import MetricsRegistry, StepMetrics
+from .protocols import AsyncProcessable, Processable, DataType
+
+logger = logging.getLogger(__name__)
+
+
+def _accept(data: Any) -> bool:
+    return True
+
+
+def _default_name(processor: Processable[Any]) -> str:
+    """The `__qualname__` of a processor's plain `process` function, or else its class name."""
+    process = processor.process
+    if inspect.ismethod(process):
+        return processor.__class__.__name__
+    process = getattr(process, "func", process)  # Unwraps a functools.partial
+    return getattr(process, "__qualname__", processor.__class__.__name__)
 
 
 class Handler(Generic[DataType], ABC):
@@ -57,6 +81,29 @@ class Handler(Generic[DataType], ABC):
             return self._next_handler.handle(data)
         return data
 
+    def handle_many(self, data: Sequence[DataType]) -> list[DataType]:
+        """
+        Handles a batch of data and passes it down the chain.
+
+        The default implementation sends each item through `handle`, so any
+        handler supports batches. Batch-aware subclasses override it and hand
+        the processed batch on with `_pass_many()`.
+
+        Args:
+            data: The batch of data being passed through the pipeline.
+
+        Returns:
+            The batch after it has been processed by the entire subsequent chain,
+            in input order.
+        """
+        return [self.handle(item) for item in data]
+
+    def _pass_many(self, data: list[DataType]) -> list[DataType]:
+        """Passes a batch to the next handler in the chain, if any."""
+        if self._next_handler:
+            return self._next_handler.handle_many(data)
+        return data
+
 
 class StepHandler(Handler[DataType]):
     """
@@ -66,14 +113,31 @@ class StepHandler(Handler[DataType]):
     bridging the structural framework with the functional business logic.
     """
 
-    def __init__(self, processor: Processable[DataType]):
+    def __init__(
+        self,
+        processor: Processable[DataType],
+        name: str | None = None,
+        metrics: MetricsRegistry | None = None,
+    ):
         """
         Initializes the StepHandler with a specific processor.
 
         Args:
             processor: A component that fulfills the `Processable` protocol.
+            name: The name used in logs and metric labels. Defaults to the
+                `__qualname__` of the processor's `process` function when it
+                wraps a plain function (e.g. a `FunctionalProcessor`), and to
+                the processor's class name otherwise.
+            metrics: An optional registry to record executed/skipped/error
+                counts and `can_handle`/`process` latencies into.
         """
         self._processor = processor
+        self._processor_name = name or _default_name(processor)
+        self._metrics: StepMetrics | None = (
+            metrics.step(self._processor_name) if metrics is not None else None
+        )
+        self._can_handle_many = getattr(processor, "can_handle_many", None)
+        self._process_many = getattr(processor, "process_many", None)
 
     def handle(self, data: DataType) -> DataType:
         """
@@ -89,15 +153,350 @@ class StepHandler(Handler[DataType]):
         Returns:
             The data after it has been processed by this step and the rest of the chain.
         """
+        return super().handle(self.step(data))
+
+    @property
+    def name(self) -> str:
+        """The name used in logs and metric labels."""
+        return self._processor_name
+
+    def step(self, data: DataType) -> DataType:
+        """
+        Runs this step's processor on the data, without passing it on.
+
+        Args:
+            data: The data to process.
+
+        Returns:
+            The processed data, or the data itself if the processor skipped it.
+        """
+        if self._metrics is not None:
+            return self._measured_step(data, self._metrics)
+
         processed_data = data
         if self._processor.can_handle(data):
-            print(
-                f"✅ Handler executing processor: {self._processor.__class__.__name__}"
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler executing processor: %s", self._processor_name,
+                    extra={"processor": self._processor_name, "action": "execute"},
+                )
+            processed_data = self._processor.process(data)
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler skipping processor: %s", self._processor_name,
+                    extra={"processor": self._processor_name, "action": "skip"},
+                )
+        return processed_data
+
+    def step_callables(self) -> tuple[Callable[[DataType], bool], Callable[[DataType], DataType]]:
+        """
+        Returns the `(can_handle, process)` pair that runs this step, for
+        executors that call it once per event.
+
+        Without metrics they are the processor's own methods. With metrics,
+        `can_handle` accepts everything and `process` is the measured step,
+        which checks the processor's `can_handle` itself. Neither logs.
+        """
+        if self._metrics is None:
+            return self._processor.can_handle, self._processor.process
+        return _accept, functools.partial(self._measured_step, metrics=self._metrics)
+
+    def _measured_step(self, data: DataType, metrics: StepMetrics) -> DataType:
+        """Runs this step's processor on the data while recording its metrics."""
+        start = time.perf_counter()
+        try:
+            can_handle = self._processor.can_handle(data)
+        except Exception:
+            metrics.record_can_handle(time.perf_counter() - start, failed=True)
+            raise
+        metrics.record_can_handle(time.perf_counter() - start)
+
+        if not can_handle:
+            metrics.record_skipped()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler skipping processor: %s", self._processor_name,
+                    extra={"processor": self._processor_name, "action": "skip"},
+                )
+            return data
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Handler executing processor: %s", self._processor_name,
+                extra={"processor": self._processor_name, "action": "execute"},
             )
+        start = time.perf_counter()
+        try:
             processed_data = self._processor.process(data)
+        except Exception:
+            metrics.record_process(time.perf_counter() - start, failed=True)
+            raise
+        metrics.record_process(time.perf_counter() - start)
+        return processed_data
+
+    def handle_many(self, data: Sequence[DataType]) -> list[DataType]:
+        """
+        Executes the processor on the matching part of a batch, then passes
+        the whole batch to the next link.
+
+        If the processor implements `BatchProcessable`, `can_handle_many` is
+        called once with the full batch and `process_many` once with the items
+        that matched. Otherwise it falls back to per-item calls. Items that
+        don't match are passed along unchanged, and input order is preserved.
+        When metrics are enabled, the batch's `can_handle` and `process` calls
+        are each recorded as one latency observation, and executed/skipped
+        counts per item once processing succeeded; a failed batch counts one
+        process error.
+
+        Args:
+            data: The batch of data being passed through the pipeline.
+
+        Returns:
+            The batch after it has been processed by this step and the rest of the chain.
+        """
+        return self._pass_many(self.step_many(data))
+
+    def step_many(self, data: Sequence[DataType]) -> list[DataType]:
+        """
+        Runs this step's processor on the matching part of a batch, without passing it on.
+
+        Args:
+            data: The batch of data to process.
+
+        Returns:
+            The batch with its matching items processed, in input order.
+        """
+        batch = list(data)
+        metrics = self._metrics
+        start = time.perf_counter()
+        try:
+            mask = self._mask(batch)
+        except Exception:
+            if metrics is not None:
+                metrics.record_can_handle(time.perf_counter() - start, failed=True)
+            raise
+        if metrics is not None:
+            metrics.record_can_handle(time.perf_counter() - start)
+
+        indices = [index for index, matched in enumerate(mask) if matched]
+        if metrics is not None and len(indices) < len(batch):
+            metrics.record_skipped(len(batch) - len(indices))
+        if indices:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler executing processor: %s on %d/%d items",
+                    self._processor_name, len(indices), len(batch),
+                    extra={"processor": self._processor_name, "action": "execute"},
+                )
+            matched = [batch[index] for index in indices]
+            start = time.perf_counter()
+            try:
+                results = self._process_batch(matched)
+            except Exception:
+                if metrics is not None:
+                    metrics.record_process(time.perf_counter() - start, failed=True)
+                raise
+            if metrics is not None:
+                metrics.record_process(time.perf_counter() - start, executed=len(matched))
+            for index, result in zip(indices, results):
+                batch[index] = result
         else:
-            print(
-                f"➖ Handler skipping processor: {self._processor.__class__.__name__}"
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler skipping processor: %s", self._processor_name,
+                    extra={"processor": self._processor_name, "action": "skip"},
+                )
+        return batch
+
+    def _mask(self, batch: list[DataType]) -> list[bool]:
+        if self._can_handle_many is not None:
+            return self._can_handle_many(batch)
+        return [self._processor.can_handle(item) for item in batch]
+
+    def _process_batch(self, matched: list[DataType]) -> list[DataType]:
+        if self._process_many is not None:
+            results = self._process_many(matched)
+        else:
+            results = [self._processor.process(item) for item in matched]
+        if len(results) != len(matched):
+            raise ValueError(
+                f"process_many returned {len(results)} results for {len(matched)} items"
+            )
+        return results
+
+
+class RouterHandler(Handler[Mapping[str, Any]]):
+    """
+    A concrete `Handler` that dispatches events by a discriminator field.
+
+    Processors are registered under a value of `key` (e.g. `event["type"]`),
+    so finding the processors for an event is one dict lookup rather than a
+    `can_handle` call per step. Keyed processors are trusted to accept every
+    event carrying their value, so their `can_handle` is not evaluated.
+    Processors with arbitrary predicates can still be registered as
+    fallbacks. Those are evaluated in order, after the keyed ones.
+    """
+
+    def __init__(self, key: str):
+        """
+        Initializes the RouterHandler.
+
+        Args:
+            key: The event field whose value selects the processors to run.
+        """
+        self._key = key
+        self._routes: dict[Hashable, tuple[Callable[[Any], Any], ...]] = {}
+        self._fallbacks: tuple[Processable[Any], ...] = ()
+
+    def register(self, value: Hashable, processor: Processable[Any]) -> "RouterHandler":
+        """
+        Routes events whose `key` field equals `value` to the processor.
+
+        Several processors may share a value; they run in registration order.
+
+        Args:
+            value: The discriminator value, e.g. "newcall".
+            processor: A component that fulfills the `Processable` protocol.
+
+        Returns:
+            The router itself, to allow for chaining calls.
+        """
+        self._routes[value] = self._routes.get(value, ()) + (processor.process,)
+        return self
+
+    def register_fallback(self, processor: Processable[Any]) -> "RouterHandler":
+        """
+        Adds a processor selected by its own `can_handle` predicate.
+
+        Args:
+            processor: A component that fulfills the `Processable` protocol.
+
+        Returns:
+            The router itself, to allow for chaining calls.
+        """
+        self._fallbacks += (processor,)
+        return self
+
+    def handle(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
+        """
+        Runs the processors routed to the event's discriminator value, then
+        any matching fallbacks, then passes the result to the next link.
+
+        The route is chosen from the incoming event, before any processor runs.
+
+        Args:
+            data: The event being passed through the pipeline.
+
+        Returns:
+            The event after it has been processed by this router and the rest of the chain.
+        """
+        value = data.get(self._key)
+        processes = self._routes.get(value, ()) if isinstance(value, Hashable) else ()
+        if processes and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Router dispatching %s=%r to %d processors", self._key, value, len(processes),
+                extra={"route_key": self._key, "action": "route"},
             )
+        for process in processes:
+            data = process(data)
+        for processor in self._fallbacks:
+            if processor.can_handle(data):
+                data = processor.process(data)
+        return super().handle(data)
+
+
+class AsyncHandler(Generic[DataType], ABC):
+    """
+    An abstract base class representing a single link in an asynchronous
+    Chain of Responsibility.
+
+    It mirrors `Handler`, but `handle` is a coroutine so that many events can
+    be in flight on a single event loop.
+    """
+
+    _next_handler: "AsyncHandler[DataType] | None" = None
+
+    def set_next(self, handler: "AsyncHandler[DataType]") -> "AsyncHandler[DataType]":
+        """
+        Sets the next handler in the chain.
+
+        Args:
+            handler: The next handler instance in the chain.
+
+        Returns:
+            The `handler` that was passed in, to allow for chaining calls.
+        """
+        self._next_handler = handler
+        return handler
+
+    @abstractmethod
+    async def handle(self, data: DataType) -> DataType:
+        """
+        Handles the data and passes it to the next handler in the chain.
+
+        Subclasses should implement their specific logic and then await
+        super().handle() to ensure the data continues down the chain.
+
+        Args:
+            data: The data being passed through the pipeline.
+
+        Returns:
+            The data after it has been processed by the entire subsequent chain.
+        """
+        if self._next_handler:
+            return await self._next_handler.handle(data)
+        return data
+
+
+class AsyncStepHandler(AsyncHandler[DataType]):
+    """
+    A concrete `AsyncHandler` that executes a business logic step.
+
+    It accepts both `AsyncProcessable` and plain `Processable` components:
+    coroutine `process` functions are awaited directly, while synchronous ones
+    are run in a worker thread so they never block the event loop.
+    """
+
+    def __init__(self, processor: AsyncProcessable[DataType] | Processable[DataType]):
+        """
+        Initializes the AsyncStepHandler with a specific processor.
+
+        Args:
+            processor: A component that fulfills the `AsyncProcessable` or
+                `Processable` protocol.
+        """
+        self._processor = processor
+        self._processor_name = processor.__class__.__name__
+        self._is_async = inspect.iscoroutinefunction(processor.process)
+
+    async def handle(self, data: DataType) -> DataType:
+        """
+        Executes the processor if it can handle the data, then passes to the next link.
+
+        Args:
+            data: The data being passed through the pipeline.
+
+        Returns:
+            The data after it has been processed by this step and the rest of the chain.
+        """
+        processed_data = data
+        if self._processor.can_handle(data):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler executing processor: %s", self._processor_name,
+                    extra={"processor": self._processor_name, "action": "execute"},
+                )
+            if self._is_async:
+                processed_data = await self._processor.process(data)
+            else:
+                processed_data = await asyncio.to_thread(self._processor.process, data)
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Handler skipping processor: %s", self._processor_name,
+                    extra={"processor": self._processor_name, "action": "skip"},
+                )
+
+        return await super().handle(processed_data)
 
-        return super().handle(processed_data)
@@ -0,0 +1,197 @@
+"""
+Provides per-step metrics for pipeline handlers.
+
+A `MetricsRegistry` holds one `StepMetrics` per processor name. Each one has
+executed, skipped and error counters and latency histograms for `can_handle`
+and `process`. Handlers record into preallocated slots through the
+`record_*` methods, which take the step's own lock, so steps running on
+several threads don't lose increments. `render_prometheus` turns a registry
+into Prometheus text exposition format for scraping.
+"""
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Iterator, Sequence
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans fast in-process predicates up to slow LLM round-trips.
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Histogram:
+    """A fixed-bucket histogram with Prometheus (`le`, inclusive) semantics."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.bounds: tuple[float, ...] = tuple(sorted(bounds))
+        # One slot per bound plus the implicit +Inf bucket.
+        self.counts: list[int] = [0] * (len(self.bounds) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Records a single observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        """The total number of observations."""
+        return sum(self.counts)
+
+
+class StepMetrics:
+    """The counters and histograms for a single pipeline step."""
+
+    __slots__ = (
+        "name",
+        "executed",
+        "skipped",
+        "can_handle_errors",
+        "process_errors",
+        "can_handle_latency",
+        "process_latency",
+        "_lock",
+    )
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.executed = 0
+        self.skipped = 0
+        self.can_handle_errors = 0
+        self.process_errors = 0
+        self.can_handle_latency = Histogram(buckets)
+        self.process_latency = Histogram(buckets)
+        self._lock = Lock()
+
+    def record_can_handle(self, latency: float, failed: bool = False) -> None:
+        """Records one `can_handle` (or `can_handle_many`) call."""
+        with self._lock:
+            self.can_handle_latency.observe(latency)
+            if failed:
+                self.can_handle_errors += 1
+
+    def record_skipped(self, count: int = 1) -> None:
+        """Counts events rejected by `can_handle`."""
+        with self._lock:
+            self.skipped += count
+
+    def record_process(self, latency: float, executed: int = 1, failed: bool = False) -> None:
+        """
+        Records one `process` (or `process_many`) call over `executed` events;
+        a failed call counts an error instead of executed events.
+        """
+        with self._lock:
+            self.process_latency.observe(latency)
+            if failed:
+                self.process_errors += 1
+            else:
+                self.executed += executed
+
+
+class MetricsRegistry:
+    """
+    A collection of `StepMetrics`, keyed by processor name.
+
+    Handlers sharing a name share their metrics.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._steps: dict[str, StepMetrics] = {}
+        self._lock = Lock()
+
+    def step(self, name: str) -> StepMetrics:
+        """
+        Returns the metrics for a step, registering them on first use.
+
+        Args:
+            name: The processor name used as the metric label.
+
+        Returns:
+            The `StepMetrics` instance for that name.
+        """
+        with self._lock:
+            metrics = self._steps.get(name)
+            if metrics is None:
+                metrics = self._steps[name] = StepMetrics(name, self._buckets)
+            return metrics
+
+    def __iter__(self) -> Iterator[StepMetrics]:
+        with self._lock:
+            steps = list(self._steps.values())
+        return iter(steps)
+
+    def render_prometheus(self) -> str:
+        """Renders every registered step in Prometheus text exposition format."""
+        return render_prometheus(self)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(registry: MetricsRegistry, prefix: str = "plummy_step") -> str:
+    """
+    Renders a registry in Prometheus text exposition format (version 0.0.4).
+
+    Args:
+        registry: The registry to export.
+        prefix: The prefix for every metric family name.
+
+    Returns:
+        The exposition text, ending with a newline.
+    """
+    steps = list(registry)
+    lines: list[str] = []
+
+    counters = (
+        ("executed", "Events processed by the step.", lambda m: [("", m.executed)]),
+        ("skipped", "Events rejected by can_handle.", lambda m: [("", m.skipped)]),
+        (
+            "errors",
+            "Exceptions raised by the step.",
+            lambda m: [
+                (',stage="can_handle"', m.can_handle_errors),
+                (',stage="process"', m.process_errors),
+            ],
+        ),
+    )
+    for suffix, help_text, samples in counters:
+        name = f"{prefix}_{suffix}_total"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for metrics in steps:
+            label = f'processor="{_escape_label(metrics.name)}"'
+            for extra_labels, value in samples(metrics):
+                lines.append(f"{name}{{{label}{extra_labels}}} {value}")
+
+    histograms = (
+        ("can_handle_seconds", "Latency of can_handle calls.", "can_handle_latency"),
+        ("process_seconds", "Latency of process calls.", "process_latency"),
+    )
+    for suffix, help_text, attribute in histograms:
+        name = f"{prefix}_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for metrics in steps:
+            histogram: Histogram = getattr(metrics, attribute)
+            label = f'processor="{_escape_label(metrics.name)}"'
+            counts = list(histogram.counts)
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label},le="{float(bound)!r}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{label}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{label}}} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+# A process-wide default registry, exported by the ASGI app's /metrics route.
+registry = MetricsRegistry()
@@ -0,0 +1,161 @@
+"""
+Provides a compiled, loop-based alternative to the linked handler chain.
+
+A `Handler` chain walks its links by recursion, so every event costs one or
+more Python frames per step and very long chains hit the recursion limit.
+The `Pipeline` builder flattens a `set_next` chain (or a plain list of
+processors) into a `CompiledPipeline` that runs the same steps in a flat loop
+over prebound `can_handle`/`process` callables. Steps keep what their
+`StepHandler` does besides processing: metrics, debug logging and the
+`BatchProcessable` batch path.
+"""
+
+import logging
+from typing import Any, Callable, Generic, Iterable, Sequence
+from .handlers import Handler, StepHandler
+from .handlers import logger as handler_logger
+from .protocols import Processable, DataType
+
+Step = Processable[DataType] | StepHandler[DataType]
+
+
+class CompiledPipeline(Generic[DataType]):
+    """
+    An immutable, loop-based executor with the same semantics as a chain of
+    `StepHandler`s.
+
+    Each step is stored as a `(can_handle, process)` pair of bound callables
+    inside a tuple, so running an event does no attribute lookups and adds
+    no stack frames per step. A step whose handler records metrics runs the
+    handler's measured step instead. While debug logging is enabled, events
+    go through each handler's step so that they are logged like in a chain,
+    and `handle_many` always does, so that `BatchProcessable` processors get
+    whole batches.
+    """
+
+    def __init__(self, processors: Sequence[Step[DataType]]):
+        """
+        Initializes the executor from an ordered sequence of steps.
+
+        Args:
+            processors: Components that fulfill the `Processable` protocol,
+                or the `StepHandler`s hosting them, in execution order.
+        """
+        self._handlers: tuple[StepHandler[DataType], ...] = tuple(
+            processor if isinstance(processor, StepHandler) else StepHandler(processor=processor)
+            for processor in processors
+        )
+        self._steps: tuple[tuple[Callable[[DataType], bool], Callable[[DataType], Any]], ...] = tuple(
+            handler.step_callables() for handler in self._handlers
+        )
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def handle(self, data: DataType) -> DataType:
+        """
+        Runs the data through every step whose `can_handle` accepts it.
+
+        Args:
+            data: The data being passed through the pipeline.
+
+        Returns:
+            The data after it has been processed by every step.
+        """
+        if handler_logger.isEnabledFor(logging.DEBUG):
+            for handler in self._handlers:
+                data = handler.step(data)
+            return data
+        for can_handle, process in self._steps:
+            if can_handle(data):
+                data = process(data)
+        return data
+
+    def handle_many(self, data: Iterable[DataType]) -> list[DataType]:
+        """
+        Runs a batch through the pipeline, one step at a time.
+
+        Each step handles the batch like `StepHandler.handle_many`, so a
+        `BatchProcessable` processor is called once per batch.
+
+        Args:
+            data: The batch of data being passed through the pipeline.
+
+        Returns:
+            The processed batch, in input order.
+        """
+        batch = list(data)
+        for handler in self._handlers:
+            batch = handler.step_many(batch)
+        return batch
+
+
+class Pipeline(Generic[DataType]):
+    """
+    A builder that collects processors and compiles them into a `CompiledPipeline`.
+
+    Example:
+        pipeline = Pipeline.from_handler(pipeline_start).compile()
+        result = pipeline.handle(event)
+    """
+
+    def __init__(self, processors: Iterable[Step[DataType]] = ()):
+        """
+        Initializes the builder.
+
+        Args:
+            processors: Optional initial processors or `StepHandler`s, in
+                execution order.
+        """
+        self._processors: list[Step[DataType]] = list(processors)
+
+    @classmethod
+    def from_handler(cls, handler: Handler[DataType]) -> "Pipeline[DataType]":
+        """
+        Flattens a `set_next` chain of `StepHandler`s into a builder.
+
+        Args:
+            handler: The first handler of the chain.
+
+        Returns:
+            A builder holding the chain's handlers in order, with their
+            names and metrics.
+
+        Raises:
+            TypeError: If a link is not a `StepHandler`, since arbitrary
+                handler logic can't be flattened.
+            ValueError: If the chain loops back on itself.
+        """
+        processors: list[Step[DataType]] = []
+        seen: set[int] = set()
+        current: Handler[DataType] | None = handler
+        while current is not None:
+            if id(current) in seen:
+                raise ValueError("Handler chain contains a cycle")
+            seen.add(id(current))
+            if not isinstance(current, StepHandler):
+                raise TypeError(
+                    f"Cannot compile handler of type {type(current).__name__}; "
+                    "only StepHandler links are supported"
+                )
+            processors.append(current)
+            current = current._next_handler
+        return cls(processors)
+
+    def add(self, processor: Step[DataType]) -> "Pipeline[DataType]":
+        """
+        Appends a processor to the pipeline.
+
+        Args:
+            processor: A component that fulfills the `Processable` protocol,
+                or a `StepHandler` hosting one.
+
+        Returns:
+            The builder itself, to allow for chaining calls.
+        """
+        self._processors.append(processor)
+        return self
+
+    def compile(self) -> CompiledPipeline[DataType]:
+        """Freezes the collected processors into a `CompiledPipeline`."""
+        return CompiledPipeline(self._processors)
@@ -6,7 +6,7 @@ to the application's business logic and persistence layers. Using Protocols enab
 a decoupled, pluggable architecture based on structural typing ("duck typing").
 """
 
-from typing import Protocol, Any, TypeVar, Generic, Optional
+from typing import Protocol, Any, TypeVar, Generic, Optional, Sequence
 
 # ==============================================================================
 # 1. Generic Type Variables
@@ -73,15 +73,89 @@ class CanDelete(Repository, Protocol[IdType]):
         ...
 
 
+# --- Bulk variants ---
+# Each extends its single-entity protocol with a default that loops over it;
+# stores that can do a batch in one round-trip or transaction should override
+# them. Protocol defaults only reach classes that subclass the protocol, so
+# callers holding a structurally typed adapter should go through the
+# module-level helpers below, which fall back to the loop when the bulk
+# method is missing.
+
+
+class CanReadMany(CanRead[DataType, IdType], Protocol[DataType, IdType]):
+    """An interface for a repository that can read many entities at once."""
+
+    def get_many(self, ids: Sequence[IdType]) -> list[DataType]:
+        """
+        Retrieves the entities with the given identifiers, in input order.
+
+        Defaults to one `get_by_id` call per identifier.
+        """
+        return [self.get_by_id(id) for id in ids]
+
+
+class CanCreateMany(CanCreate[DataType, CreateModelType], Protocol[DataType, CreateModelType]):
+    """An interface for a repository that can create many entities at once."""
+
+    def create_many(self, data: Sequence[CreateModelType]) -> list[DataType]:
+        """
+        Creates many entities, returning them in input order.
+
+        Defaults to one `create` call per item.
+        """
+        return [self.create(item) for item in data]
+
+
+class CanDeleteMany(CanDelete[IdType], Protocol[IdType]):
+    """An interface for a repository that can delete many entities at once."""
+
+    def delete_many(self, ids: Sequence[IdType]) -> None:
+        """
+        Deletes the entities with the given identifiers.
+
+        Defaults to one `delete` call per identifier.
+        """
+        for id in ids:
+            self.delete(id)
+
+
+def get_many(repository: CanRead[DataType, IdType], ids: Sequence[IdType]) -> list[DataType]:
+    """Calls `repository.get_many` if it has one, else `get_by_id` per identifier."""
+    bulk = getattr(repository, "get_many", None)
+    if bulk is not None:
+        return bulk(ids)
+    return [repository.get_by_id(id) for id in ids]
+
+
+def create_many(
+    repository: CanCreate[DataType, CreateModelType], data: Sequence[CreateModelType]
+) -> list[DataType]:
+    """Calls `repository.create_many` if it has one, else `create` per item."""
+    bulk = getattr(repository, "create_many", None)
+    if bulk is not None:
+        return bulk(data)
+    return [repository.create(item) for item in data]
+
+
+def delete_many(repository: CanDelete[IdType], ids: Sequence[IdType]) -> None:
+    """Calls `repository.delete_many` if it has one, else `delete` per identifier."""
+    bulk = getattr(repository, "delete_many", None)
+    if bulk is not None:
+        bulk(ids)
+        return
+    for id in ids:
+        repository.delete(id)
+
+
 # --- Composite Protocol for full CRUD functionality ---
 class CRUDRepository(
-    CanRead[DataType, IdType],
-    CanCreate[DataType, CreateModelType],
+    CanReadMany[DataType, IdType],
+    CanCreateMany[DataType, CreateModelType],
     CanUpdate[DataType],
-    CanDelete[IdType],
+    CanDeleteMany[IdType],
     Protocol,
 ):
-    """A composite interface for a repository with full CRUD capabilities."""
+    """A composite interface for a repository with full CRUD capabilities, single and bulk."""
 
     pass
 
@@ -91,6 +165,24 @@ class CanClassify(LLM, Protocol[InputType, OutputType]):
     def classify(self, data: InputType) -> OutputType:
         ...
 
+    def classify_many(self, data: Sequence[InputType]) -> list[OutputType]:
+        """
+        Classifies a batch of inputs, returning results in input order.
+
+        Defaults to one `classify` call per item; adapters that can pack
+        several inputs into one request should override it.
+        """
+        return [self.classify(item) for item in data]
+
+
+def classify_many(
+    classifier: CanClassify[InputType, OutputType], data: Sequence[InputType]
+) -> list[OutputType]:
+    """Calls `classifier.classify_many` if it has one, else `classify` per item."""
+    bulk = getattr(classifier, "classify_many", None)
+    if bulk is not None:
+        return bulk(data)
+    return [classifier.classify(item) for item in data]
 
 
 # ==============================================================================
@@ -130,3 +222,71 @@ class Processable(Protocol[DataType]):
             The result of the processing.
         """
         ...
+
+
+class BatchProcessable(Processable[DataType], Protocol[DataType]):
+    """
+    An optional extension of `Processable` for components that can work on
+    many items at once.
+
+    Handlers detect these methods and use them in `handle_many`; processors
+    that don't implement them fall back to per-item `can_handle`/`process`.
+    """
+
+    def can_handle_many(self, data: Sequence[DataType]) -> Sequence[bool]:
+        """
+        Evaluates a whole batch in one call.
+
+        Args:
+            data: The batch of input data to be evaluated.
+
+        Returns:
+            One flag per item, in input order.
+        """
+        ...
+
+    def process_many(self, data: Sequence[DataType]) -> Sequence[Any]:
+        """
+        Executes the core business logic on the sub-batch that matched.
+
+        Args:
+            data: The items for which `can_handle` was True, in input order.
+
+        Returns:
+            One result per item, in input order.
+        """
+        ...
+
+
+class AsyncProcessable(Protocol[DataType]):
+    """
+    The asynchronous counterpart of `Processable`.
+
+    `can_handle` stays a cheap, synchronous predicate, while `process` is a
+    coroutine so that I/O-bound business logic (e.g. LLM calls) can yield to
+    the event loop instead of blocking the worker.
+    """
+
+    def can_handle(self, data: DataType) -> bool:
+        """
+        Determines if the component is capable of processing the given data.
+
+        Args:
+            data: The input data to be evaluated.
+
+        Returns:
+            True if the component can process the data, False otherwise.
+        """
+        ...
+
+    async def process(self, data: DataType) -> Any:
+        """
+        Executes the core business logic on the given data.
+
+        Args:
+            data: The input data to be processed.
+
+        Returns:
+            The result of the processing.
+        """
+        ...
@@ -1,5 +1,5 @@
 """Unit tests for the adapter classes in the shared framework."""
-from plummy.adapters import FunctionalProcessor
+from plummy.adapters import AsyncFunctionalProcessor, FunctionalProcessor
 
 def test_functional_processor_holds_functions():
     """
@@ -23,4 +23,21 @@ def test_functional_processor_holds_functions():
     # 3. Assert
     # Check that the attributes of the instance are the functions we passed in
     assert processor.can_handle is can_handle_func
-    assert processor.process is process_func
\ No newline at end of file
+    assert processor.process is process_func
+
+def test_async_functional_processor_holds_functions():
+    """
+    Tests that the AsyncFunctionalProcessor stores the predicate and the coroutine.
+    """
+    def can_handle_func(data):
+        return True
+    async def process_func(data):
+        return {"processed": True}
+
+    processor = AsyncFunctionalProcessor(
+        can_handle=can_handle_func,
+        process=process_func
+    )
+
+    assert processor.can_handle is can_handle_func
+    assert processor.process is process_func
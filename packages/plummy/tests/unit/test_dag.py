@@ -0,0 +1,83 @@
+"""Unit tests for the DAG pipeline."""
+import asyncio
+import threading
+
+import pytest
+
+from plummy.dag import DAGPipeline
+
+
+def test_dag_pipeline_runs_independent_steps_concurrently():
+    """
+    Tests that independent branches run at the same time: both steps wait on
+    a two-party barrier, which only passes if they overlap.
+    """
+    # 1. Arrange
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(label):
+        def step(text):
+            barrier.wait()
+            return f"{label}:{text}"
+        return step
+
+    dag = DAGPipeline(max_workers=4)
+    dag.add_step("text", lambda event: event["text"].strip())
+    dag.add_step("category", branch("category"), inputs=("text",))
+    dag.add_step("sentiment", branch("sentiment"), inputs=("text",))
+    dag.add_step("summary", lambda category, sentiment: [category, sentiment], inputs=("category", "sentiment"))
+
+    # 2. Act
+    result = dag.handle({"text": " hello "})
+    dag.close()
+
+    # 3. Assert
+    assert result["summary"] == ["category:hello", "sentiment:hello"]
+    assert result["text"] == "hello"
+
+
+def test_dag_pipeline_arun_mixes_async_and_sync_steps():
+    """
+    Tests that arun awaits coroutine steps concurrently, runs sync steps in
+    threads, and applies the merge function.
+    """
+    # 1. Arrange
+    async def main():
+        barrier = asyncio.Barrier(2)
+
+        async def category(text):
+            await asyncio.wait_for(barrier.wait(), timeout=5)
+            return "COMMERCIAL"
+
+        async def entities(text):
+            await asyncio.wait_for(barrier.wait(), timeout=5)
+            return ["pricing"]
+
+        dag = DAGPipeline(merge=lambda event, outputs: (outputs["category"], outputs["entities"]))
+        dag.add_step("category", category, inputs=("input",))
+        dag.add_step("entities", entities)
+        dag.add_step("length", len)
+        return await dag.arun("pricing for bulk orders")
+
+    # 2. Act
+    result = asyncio.run(main())
+
+    # 3. Assert
+    assert result == ("COMMERCIAL", ["pricing"])
+
+
+def test_dag_pipeline_rejects_unknown_inputs_and_propagates_errors():
+    """
+    Tests graph validation and that a failing step fails the run.
+    """
+    dag = DAGPipeline()
+    with pytest.raises(ValueError):
+        dag.add_step("category", lambda text: text, inputs=("text",))
+
+    def fail(event):
+        raise RuntimeError("upstream failed")
+
+    dag.add_step("text", fail)
+    with pytest.raises(RuntimeError):
+        dag.run({"text": "hello"})
+    dag.close()
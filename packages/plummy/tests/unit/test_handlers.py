@@ -1,5 +1,10 @@
 """Unit tests for the Handler classes in the shared framework."""
-from plummy.handlers import StepHandler
+import asyncio
+import threading
+from unittest.mock import AsyncMock
+
+from plummy.adapters import AsyncFunctionalProcessor, FunctionalProcessor
+from plummy.handlers import AsyncStepHandler, RouterHandler, StepHandler
 
 def test_step_handler_processes_when_can_handle_is_true(
     processor, handler
@@ -79,4 +84,196 @@ def test_step_handler_at_end_of_chain(processor):
     processor.process.assert_called_once_with(test_data)
 
     # Verify that the final result is the data returned by our processor
-    assert result == processed_data
\ No newline at end of file
+    assert result == processed_data
+
+
+def test_async_step_handler_awaits_async_processor(processor):
+    """
+    Tests that AsyncStepHandler awaits a coroutine `process` and passes its
+    result down the chain.
+    """
+    # 1. Arrange
+    processor.can_handle.return_value = True
+    processor.process = AsyncMock(return_value={"status": "processed"})
+    next_handler = AsyncStepHandler(processor=AsyncFunctionalProcessor(
+        can_handle=lambda data: True,
+        process=AsyncMock(side_effect=lambda data: {**data, "next": True}),
+    ))
+    first_handler = AsyncStepHandler(processor=processor)
+    first_handler.set_next(next_handler)
+
+    # 2. Act
+    result = asyncio.run(first_handler.handle({"status": "new"}))
+
+    # 3. Assert
+    processor.process.assert_awaited_once_with({"status": "new"})
+    assert result == {"status": "processed", "next": True}
+
+
+def test_async_step_handler_runs_sync_processor_in_thread():
+    """
+    Tests that AsyncStepHandler runs a synchronous `process` off the event loop thread.
+    """
+    # 1. Arrange
+    loop_thread = threading.get_ident()
+    seen_threads = []
+
+    def process(data):
+        seen_threads.append(threading.get_ident())
+        return {**data, "processed": True}
+
+    handler = AsyncStepHandler(processor=FunctionalProcessor(
+        can_handle=lambda data: True,
+        process=process,
+    ))
+
+    # 2. Act
+    result = asyncio.run(handler.handle({"key": "value"}))
+
+    # 3. Assert
+    assert result == {"key": "value", "processed": True}
+    assert seen_threads and seen_threads[0] != loop_thread
+
+
+def test_async_step_handler_skips_when_can_handle_is_false(processor):
+    """
+    Tests that AsyncStepHandler skips its processor and returns the data untouched.
+    """
+    # 1. Arrange
+    processor.can_handle.return_value = False
+    processor.process = AsyncMock()
+    test_data = {"key": "value"}
+
+    # 2. Act
+    result = asyncio.run(AsyncStepHandler(processor=processor).handle(test_data))
+
+    # 3. Assert
+    processor.process.assert_not_awaited()
+    assert result == test_data
+
+
+
+def test_step_handler_handle_many_uses_batch_protocol():
+    """
+    Tests that handle_many calls can_handle_many once with the whole batch and
+    process_many once with the matching sub-batch, preserving input order.
+    """
+    # 1. Arrange
+    batches = []
+
+    def process_many(items):
+        batches.append(items)
+        return [{**item, "processed": True} for item in items]
+
+    processor = FunctionalProcessor(
+        can_handle=lambda data: data["type"] == "newcall",
+        process=lambda data: data,
+        can_handle_many=lambda items: [item["type"] == "newcall" for item in items],
+        process_many=process_many,
+    )
+    events = [{"type": "newcall"}, {"type": "other"}, {"type": "newcall"}]
+
+    # 2. Act
+    result = StepHandler(processor=processor).handle_many(events)
+
+    # 3. Assert
+    assert batches == [[{"type": "newcall"}, {"type": "newcall"}]]
+    assert result == [
+        {"type": "newcall", "processed": True},
+        {"type": "other"},
+        {"type": "newcall", "processed": True},
+    ]
+
+
+def test_step_handler_handle_many_falls_back_to_per_item_calls():
+    """
+    Tests that handle_many works with plain processors and continues the
+    batch down the chain.
+    """
+    # 1. Arrange
+    first_handler = StepHandler(processor=FunctionalProcessor(
+        can_handle=lambda data: data % 2 == 0,
+        process=lambda data: data * 10,
+    ))
+    first_handler.set_next(StepHandler(processor=FunctionalProcessor(
+        can_handle=lambda data: True,
+        process=lambda data: data + 1,
+    )))
+
+    # 2. Act
+    result = first_handler.handle_many([1, 2, 3, 4])
+
+    # 3. Assert
+    assert result == [2, 21, 4, 41]
+
+
+def test_step_handler_logs_steps_at_debug_level(processor, caplog):
+    """
+    Tests that StepHandler reports executed steps through logging with the
+    processor name as a structured field.
+    """
+    processor.can_handle.return_value = True
+
+    with caplog.at_level("DEBUG", logger="plummy.handlers"):
+        StepHandler(processor=processor).handle({"key": "value"})
+
+    assert [record.action for record in caplog.records] == ["execute"]
+    assert caplog.records[0].processor == "MagicMock"
+
+
+def test_step_handler_is_silent_when_debug_is_disabled(processor, caplog):
+    """
+    Tests that no records are produced when the DEBUG level is disabled.
+    """
+    processor.can_handle.return_value = False
+
+    with caplog.at_level("INFO", logger="plummy.handlers"):
+        StepHandler(processor=processor).handle({"key": "value"})
+
+    assert caplog.records == []
+
+
+def test_router_handler_dispatches_by_key_without_predicates(processor, handler):
+    """
+    Tests that RouterHandler runs the processor registered for the event's
+    value without calling its can_handle, and continues the chain.
+    """
+    # 1. Arrange
+    processor.process.return_value = {"type": "newcall", "processed": True}
+    other_processor = FunctionalProcessor(can_handle=lambda data: True, process=lambda data: None)
+    router = RouterHandler(key="type").register("newcall", processor).register("hangup", other_processor)
+    router.set_next(handler)
+
+    # 2. Act
+    router.handle({"type": "newcall"})
+
+    # 3. Assert
+    processor.can_handle.assert_not_called()
+    processor.process.assert_called_once_with({"type": "newcall"})
+    handler.handle.assert_called_once_with({"type": "newcall", "processed": True})
+
+
+def test_router_handler_evaluates_fallbacks_after_routes():
+    """
+    Tests that fallback processors are selected by their own predicate and
+    run after the keyed ones, and that unknown values only reach fallbacks.
+    """
+    # 1. Arrange
+    router = RouterHandler(key="source")
+    router.register("newcall", FunctionalProcessor(
+        can_handle=lambda data: False,
+        process=lambda data: {**data, "steps": data["steps"] + ["keyed"]},
+    ))
+    router.register_fallback(FunctionalProcessor(
+        can_handle=lambda data: "steps" in data,
+        process=lambda data: {**data, "steps": data["steps"] + ["fallback"]},
+    ))
+
+    # 2. Act
+    routed = router.handle({"source": "newcall", "steps": []})
+    unrouted = router.handle({"source": "unknown", "steps": []})
+
+    # 3. Assert
+    assert routed["steps"] == ["keyed", "fallback"]
+    assert unrouted["steps"] == ["fallback"]
+
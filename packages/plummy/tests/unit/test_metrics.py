@@ -0,0 +1,154 @@
+"""Unit tests for the step metrics and their Prometheus export."""
+import threading
+
+import pytest
+
+from plummy.adapters import FunctionalProcessor
+from plummy.handlers import StepHandler
+from plummy.metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_uses_inclusive_upper_bounds():
+    """
+    Tests that observations land in the first bucket whose bound is >= value.
+    """
+    histogram = Histogram(bounds=(0.1, 1.0))
+
+    for value in (0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 1, 1]
+    assert histogram.count == 3
+    assert histogram.sum == pytest.approx(2.6)
+
+
+def test_step_handler_records_executed_skipped_and_errors():
+    """
+    Tests that a StepHandler with a registry counts executed, skipped and
+    failing events under its name.
+    """
+    # 1. Arrange
+    def process(data):
+        if data == "boom":
+            raise RuntimeError("boom")
+        return data
+
+    registry = MetricsRegistry()
+    handler = StepHandler(
+        processor=FunctionalProcessor(can_handle=lambda data: data != "skip", process=process),
+        name="classify",
+        metrics=registry,
+    )
+
+    # 2. Act
+    handler.handle("ok")
+    handler.handle("skip")
+    with pytest.raises(RuntimeError):
+        handler.handle("boom")
+
+    # 3. Assert
+    metrics = registry.step("classify")
+    assert (metrics.executed, metrics.skipped, metrics.process_errors) == (1, 1, 1)
+    assert metrics.can_handle_latency.count == 3
+    assert metrics.process_latency.count == 2
+
+
+def _classify(data):
+    return data
+
+
+def test_step_handler_names_functional_steps_after_their_function():
+    """
+    Tests that unnamed functional steps get distinct metric labels from
+    their `process` functions rather than sharing the adapter's class name.
+    """
+    # 1. Arrange
+    registry = MetricsRegistry()
+
+    # 2. Act
+    handler = StepHandler(
+        processor=FunctionalProcessor(can_handle=lambda data: True, process=_classify), metrics=registry
+    )
+    handler.handle("ok")
+
+    # 3. Assert
+    assert handler.name == "_classify"
+    assert registry.step("_classify").executed == 1
+
+
+def test_step_handler_batch_counts_only_processed_batches():
+    """
+    Tests that a failing batch records a process error and its latency
+    instead of counting its items as executed.
+    """
+    # 1. Arrange
+    def process_many(batch):
+        if "boom" in batch:
+            raise RuntimeError("boom")
+        return batch
+
+    registry = MetricsRegistry()
+    handler = StepHandler(
+        processor=FunctionalProcessor(
+            can_handle=lambda data: data != "skip", process=lambda data: data, process_many=process_many
+        ),
+        name="classify",
+        metrics=registry,
+    )
+
+    # 2. Act
+    handler.handle_many(["ok", "skip", "ok"])
+    with pytest.raises(RuntimeError):
+        handler.handle_many(["ok", "boom"])
+
+    # 3. Assert
+    metrics = registry.step("classify")
+    assert (metrics.executed, metrics.skipped, metrics.process_errors) == (2, 1, 1)
+    assert metrics.can_handle_latency.count == 2
+    assert metrics.process_latency.count == 2
+
+
+def test_step_metrics_lose_no_increments_across_threads():
+    registry = MetricsRegistry()
+    handler = StepHandler(
+        processor=FunctionalProcessor(can_handle=lambda data: True, process=lambda data: data),
+        name="classify",
+        metrics=registry,
+    )
+
+    def run():
+        for _ in range(2_000):
+            handler.handle_many([1, 2, 3])
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = registry.step("classify")
+    assert metrics.executed == 8 * 2_000 * 3
+    assert metrics.process_latency.count == 8 * 2_000
+
+
+def test_render_prometheus_exposes_counters_and_histograms():
+    """
+    Tests the Prometheus text exposition rendering of a registry.
+    """
+    # 1. Arrange
+    registry = MetricsRegistry(buckets=(0.5,))
+    metrics = registry.step("classify")
+    metrics.executed = 2
+    metrics.process_latency.observe(0.2)
+    metrics.process_latency.observe(1.0)
+
+    # 2. Act
+    text = registry.render_prometheus()
+
+    # 3. Assert
+    assert "# TYPE plummy_step_executed_total counter" in text
+    assert 'plummy_step_executed_total{processor="classify"} 2' in text
+    assert 'plummy_step_errors_total{processor="classify",stage="process"} 0' in text
+    assert 'plummy_step_process_seconds_bucket{processor="classify",le="0.5"} 1' in text
+    assert 'plummy_step_process_seconds_bucket{processor="classify",le="+Inf"} 2' in text
+    assert 'plummy_step_process_seconds_count{processor="classify"} 2' in text
@@ -0,0 +1,108 @@
+"""Unit tests for the compiled Pipeline executor."""
+import pytest
+
+from plummy.adapters import FunctionalProcessor
+from plummy.handlers import StepHandler
+from plummy.metrics import MetricsRegistry
+from plummy.pipelines import Pipeline
+
+
+def _add(value):
+    return FunctionalProcessor(
+        can_handle=lambda data: isinstance(data, int),
+        process=lambda data: data + value,
+    )
+
+
+def test_compiled_pipeline_matches_linked_chain():
+    """
+    Tests that a pipeline compiled from a set_next chain produces the same
+    result as the chain itself, including skipped steps.
+    """
+    # 1. Arrange
+    skipped = FunctionalProcessor(can_handle=lambda data: False, process=lambda data: 0)
+    chain = StepHandler(processor=_add(1))
+    chain.set_next(StepHandler(processor=skipped)).set_next(StepHandler(processor=_add(10)))
+
+    # 2. Act
+    compiled = Pipeline.from_handler(chain).compile()
+
+    # 3. Assert
+    assert len(compiled) == 3
+    assert compiled.handle(5) == chain.handle(5) == 16
+    assert compiled.handle_many([1, 2]) == [12, 13]
+
+
+def test_compiled_pipeline_runs_chains_longer_than_the_recursion_limit():
+    """
+    Tests that the flat executor doesn't grow the stack with the chain length.
+    """
+    # 1. Arrange
+    builder = Pipeline()
+    for _ in range(5000):
+        builder.add(_add(1))
+
+    # 2. Act
+    result = builder.compile().handle(0)
+
+    # 3. Assert
+    assert result == 5000
+
+
+def test_pipeline_from_handler_rejects_non_step_handlers(handler):
+    """
+    Tests that links whose logic can't be flattened are rejected.
+    """
+    chain = StepHandler(processor=_add(1))
+    chain.set_next(handler)
+
+    with pytest.raises(TypeError):
+        Pipeline.from_handler(chain)
+
+
+def test_compiled_pipeline_keeps_handler_metrics():
+    """
+    Tests that steps compiled from measured handlers record the same
+    metrics as the chain would.
+    """
+    # 1. Arrange
+    registry = MetricsRegistry()
+    skipped = FunctionalProcessor(can_handle=lambda data: False, process=lambda data: 0)
+    chain = StepHandler(processor=_add(1), name="add", metrics=registry)
+    chain.set_next(StepHandler(processor=skipped, name="skip", metrics=registry))
+
+    # 2. Act
+    compiled = Pipeline.from_handler(chain).compile()
+    result = compiled.handle(5)
+    compiled.handle_many([1, 2])
+
+    # 3. Assert
+    assert result == 6
+    assert (registry.step("add").executed, registry.step("add").skipped) == (3, 0)
+    assert (registry.step("skip").executed, registry.step("skip").skipped) == (0, 3)
+
+
+def test_compiled_pipeline_handle_many_uses_batch_protocol():
+    """
+    Tests that handle_many hands a BatchProcessable step the matching part
+    of the batch in one call.
+    """
+    # 1. Arrange
+    batches = []
+
+    def process_many(items):
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    processor = FunctionalProcessor(
+        can_handle=lambda data: data % 2 == 0,
+        process=lambda data: data * 10,
+        process_many=process_many,
+    )
+
+    # 2. Act
+    result = Pipeline([processor, _add(1)]).compile().handle_many([1, 2, 3, 4])
+
+    # 3. Assert
+    assert batches == [[2, 4]]
+    assert result == [2, 21, 4, 41]
@@ -0,0 +1,85 @@
+"""Unit tests for the default methods of the shared framework's protocols."""
+from plummy.protocols import CRUDRepository, classify_many, create_many, delete_many, get_many
+
+
+class DictRepository(CRUDRepository[dict, int, str]):
+    """A repository that only implements the single-entity methods."""
+
+    def __init__(self):
+        self.items: dict[int, dict] = {}
+        self.calls: list[str] = []
+
+    def get_by_id(self, id: int) -> dict:
+        self.calls.append("get_by_id")
+        return self.items[id]
+
+    def create(self, data: str) -> dict:
+        self.calls.append("create")
+        item = {"id": len(self.items) + 1, "name": data}
+        self.items[item["id"]] = item
+        return item
+
+    def update(self, entity: dict) -> dict:
+        self.items[entity["id"]] = entity
+        return entity
+
+    def delete(self, id: int) -> None:
+        self.calls.append("delete")
+        del self.items[id]
+
+
+def test_crud_repository_bulk_methods_default_to_single_entity_calls():
+    """
+    Tests that a repository implementing only the single-entity methods gets
+    working bulk methods, which loop over them in input order.
+    """
+    # 1. Arrange
+    repo = DictRepository()
+
+    # 2. Act
+    created = repo.create_many(["a", "b", "c"])
+    fetched = repo.get_many([3, 1])
+    repo.delete_many([1, 2])
+
+    # 3. Assert
+    assert [item["name"] for item in created] == ["a", "b", "c"]
+    assert [item["name"] for item in fetched] == ["c", "a"]
+    assert list(repo.items) == [3]
+    assert repo.calls == ["create"] * 3 + ["get_by_id"] * 2 + ["delete"] * 2
+
+
+def test_bulk_helpers_fall_back_for_structurally_typed_adapters():
+    """
+    Tests that the module-level helpers loop over the single-entity methods
+    of adapters that don't subclass the protocols.
+    """
+    # 1. Arrange
+    class PlainRepository:
+        def __init__(self):
+            self.items: dict[int, str] = {}
+
+        def get_by_id(self, id: int) -> str:
+            return self.items[id]
+
+        def create(self, data: str) -> str:
+            self.items[len(self.items) + 1] = data
+            return data
+
+        def delete(self, id: int) -> None:
+            del self.items[id]
+
+    class UpperClassifier:
+        def classify(self, data: str) -> str:
+            return data.upper()
+
+    repo = PlainRepository()
+
+    # 2. Act
+    create_many(repo, ["a", "b", "c"])
+    fetched = get_many(repo, [3, 1])
+    delete_many(repo, [1, 2])
+
+    # 3. Assert
+    assert fetched == ["c", "a"]
+    assert list(repo.items) == [3]
+    assert classify_many(UpperClassifier(), ["a", "b"]) == ["A", "B"]